@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 import os
+import json
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -99,6 +100,14 @@ DATABASES = {
         "PORT": os.getenv("DB_PORT"),
     }
 }
+# Local runs and benchmarks without PostgreSQL: DB_ENGINE=sqlite (DB_NAME is the file)
+if os.getenv("DB_ENGINE") == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_NAME") or BASE_DIR / "db.sqlite3",
+        }
+    }
 
 
 # Password validation
@@ -154,6 +163,203 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ],
+    "DEFAULT_PAGINATION_CLASS": "web.pagination.StandardPagination",
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", 50)),
+}
+
+
+# Per-process cache of API key -> (user, account) used by the translate
+# endpoints. Entries are invalidated by signals and expire after TTL seconds
+API_KEY_CACHE = {
+    "TTL": float(os.getenv("API_KEY_CACHE_TTL", 60)),
+    "MAX_ENTRIES": int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", 10000)),
+}
+
+# Per-process LRU of compiled artifact `translate` callables
+COMPILED_ARTIFACT_CACHE = {
+    "MAX_ENTRIES": int(os.getenv("COMPILED_ARTIFACT_CACHE_MAX_ENTRIES", 256)),
+    "MAX_BYTES": int(os.getenv("COMPILED_ARTIFACT_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+}
+
+# How compiled artifacts are executed: "inline" in the request thread or
+# "process_pool" on a pool of worker processes that keep artifacts loaded
+COMPILED_ARTIFACT_EXECUTION = {
+    "MODE": os.getenv("COMPILED_ARTIFACT_EXECUTION_MODE", "inline"),
+    "POOL_SIZE": int(os.getenv("COMPILED_ARTIFACT_POOL_SIZE", 0)) or None,
+    "TIMEOUT": float(os.getenv("COMPILED_ARTIFACT_TIMEOUT", 10)),
+    "MAX_CALLS_PER_WORKER": int(os.getenv("COMPILED_ARTIFACT_MAX_CALLS_PER_WORKER", 1000)),
+    "START_METHOD": os.getenv("COMPILED_ARTIFACT_START_METHOD", "spawn"),
+}
+
+# Endpoint -> active spec -> artifact routes used by /api/translate. Entries are
+# invalidated by signals in-process and expire after TTL seconds across workers
+TRANSLATION_ROUTING_CACHE = {
+    "TTL": float(os.getenv("TRANSLATION_ROUTING_CACHE_TTL", 30)),
+}
+
+# How request/translated bodies are stored in TranslationEvents, overridable per
+# endpoint with definition.payload_capture. MODE is one of "full", "none",
+# "hash", "truncate" (first TRUNCATE_BYTES), "sample" (full body for 1 in
+# SAMPLE_RATE events, hash otherwise) or "blob" (compressed TranslationPayload)
+TRANSLATION_PAYLOAD_CAPTURE = {
+    "MODE": os.getenv("TRANSLATION_PAYLOAD_CAPTURE_MODE", "truncate"),
+    "TRUNCATE_BYTES": int(os.getenv("TRANSLATION_PAYLOAD_CAPTURE_TRUNCATE_BYTES", 4096)),
+    "SAMPLE_RATE": int(os.getenv("TRANSLATION_PAYLOAD_CAPTURE_SAMPLE_RATE", 100)),
+}
+
+# TranslationEvents are buffered in-process and written in batches off the
+# request path. MODE is "background" or "sync"; OVERFLOW_POLICY applies when the
+# queue is full and is one of "block", "drop" or "inline"
+TRANSLATION_EVENT_SINK = {
+    "MODE": os.getenv("TRANSLATION_EVENT_SINK_MODE", "background"),
+    "BATCH_SIZE": int(os.getenv("TRANSLATION_EVENT_SINK_BATCH_SIZE", 500)),
+    "FLUSH_INTERVAL": float(os.getenv("TRANSLATION_EVENT_SINK_FLUSH_INTERVAL", 1.0)),
+    "MAX_QUEUE_SIZE": int(os.getenv("TRANSLATION_EVENT_SINK_MAX_QUEUE_SIZE", 10000)),
+    "OVERFLOW_POLICY": os.getenv("TRANSLATION_EVENT_SINK_OVERFLOW_POLICY", "block"),
+    "BLOCK_TIMEOUT": 0.5,
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Optional shared tier for TRANSLATION_RESULT_CACHE
+    "translations": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv(
+            "TRANSLATION_RESULT_CACHE_LOCATION", os.path.join(BASE_DIR, ".cache", "translations")
+        ),
+    },
+}
+
+# Dynamic (LLM) engine results keyed by spec version and input hash. Specs opt out
+# with `cache_results: false` in their definition. BACKEND names a CACHES alias
+# used as a second tier behind the in-process LRU
+TRANSLATION_RESULT_CACHE = {
+    "ENABLED": os.getenv("TRANSLATION_RESULT_CACHE_ENABLED", "true").lower() == "true",
+    "TTL": int(os.getenv("TRANSLATION_RESULT_CACHE_TTL", 3600)),
+    "MAX_ENTRIES": int(os.getenv("TRANSLATION_RESULT_CACHE_MAX_ENTRIES", 10000)),
+    "MAX_BYTES": int(os.getenv("TRANSLATION_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    "BACKEND": os.getenv("TRANSLATION_RESULT_CACHE_BACKEND") or None,
+}
+
+# Concurrent dynamic translations with the same spec and body share one LLM call
+TRANSLATION_COALESCE_REQUESTS = os.getenv("TRANSLATION_COALESCE_REQUESTS", "true").lower() == "true"
+
+# /api/translate/<endpoint_id>/batch limits. MAX_PARALLELISM bounds concurrent
+# LLM calls for dynamic specs; compiled artifacts always run sequentially
+TRANSLATION_BATCH = {
+    "MAX_ITEMS": int(os.getenv("TRANSLATION_BATCH_MAX_ITEMS", 10000)),
+    "MAX_PARALLELISM": int(os.getenv("TRANSLATION_BATCH_MAX_PARALLELISM", 8)),
+}
+
+# TranslationEvent retention. On PostgreSQL events are range-partitioned by
+# created_at per PARTITION_INTERVAL ("month" or "day"); prune_translation_events
+# drops partitions older than DAYS and creates PARTITIONS_AHEAD future ones
+TRANSLATION_EVENT_RETENTION = {
+    "DAYS": int(os.getenv("TRANSLATION_EVENT_RETENTION_DAYS", 90)),
+    "PARTITION_INTERVAL": os.getenv("TRANSLATION_EVENT_PARTITION_INTERVAL", "month"),
+    "PARTITIONS_AHEAD": int(os.getenv("TRANSLATION_EVENT_PARTITIONS_AHEAD", 3)),
+}
+
+# Endpoint traffic charts read per-minute rollups; when no `since` is given
+# the last DEFAULT_WINDOW_HOURS are returned
+TRANSLATION_TRAFFIC = {
+    "DEFAULT_WINDOW_HOURS": int(os.getenv("TRANSLATION_TRAFFIC_DEFAULT_WINDOW_HOURS", 24)),
+}
+
+# Spec test case runs: concurrent cases and per-case timeout in seconds
+SPEC_TEST_CASES = {
+    "PARALLELISM": int(os.getenv("SPEC_TEST_CASES_PARALLELISM", 8)),
+    "TIMEOUT": float(os.getenv("SPEC_TEST_CASES_TIMEOUT", 10)),
+}
+
+# Language model used by the dynamic engine and artifact generation. BACKEND is
+# "openai" (any OpenAI-compatible server at API_BASE; RECORD_TO appends every
+# completion to a JSONL file) or "stub", which answers offline from STUB
+# RECORDINGS (see web.llm.stub.StubResponses) with LATENCY +/- JITTER seconds.
+# BACKENDS adds servers to the pool as a JSON list of objects with NAME, MODEL,
+# API_BASE, API_KEY and optionally MAX_CONCURRENCY/TIMEOUT; calls go to the least
+# loaded one, are retried RETRIES times with exponential BACKOFF, wait at most
+# QUEUE_TIMEOUT for a free slot, and a backend is skipped for RESET_TIMEOUT
+# seconds after FAILURES consecutive errors
+LLM_PROVIDER = {
+    "BACKEND": os.getenv("LLM_BACKEND", "openai"),
+    "MODEL": os.getenv("LLM_MODEL", "openai/local-model"),
+    "API_BASE": os.getenv("LLM_API_BASE", "http://host.docker.internal:8080/v1"),
+    "API_KEY": os.getenv("LLM_API_KEY", "local"),
+    "MAX_CONCURRENCY": int(os.getenv("LLM_MAX_CONCURRENCY", 8)),
+    "TIMEOUT": float(os.getenv("LLM_TIMEOUT", 120)),
+    "BACKENDS": json.loads(os.getenv("LLM_BACKENDS", "[]")),
+    "RETRIES": int(os.getenv("LLM_RETRIES", 2)),
+    "BACKOFF": float(os.getenv("LLM_BACKOFF", 0.5)),
+    "QUEUE_TIMEOUT": float(os.getenv("LLM_QUEUE_TIMEOUT", 30)),
+    "CIRCUIT_BREAKER": {
+        "FAILURES": int(os.getenv("LLM_CIRCUIT_BREAKER_FAILURES", 5)),
+        "RESET_TIMEOUT": float(os.getenv("LLM_CIRCUIT_BREAKER_RESET_TIMEOUT", 30)),
+    },
+    "RECORD_TO": os.getenv("LLM_RECORD_TO") or None,
+    "STUB": {
+        "RECORDINGS": os.getenv("LLM_STUB_RECORDINGS") or None,
+        "LATENCY": float(os.getenv("LLM_STUB_LATENCY", 0)),
+        "JITTER": float(os.getenv("LLM_STUB_JITTER", 0)),
+        "DEFAULT_OUTPUT": os.getenv("LLM_STUB_DEFAULT_OUTPUT", "<stub/>"),
+    },
+}
+
+# Artifact generation: CANDIDATES implementations (at most MAX_CANDIDATES per
+# request) are generated concurrently with temperatures spread from 0 to
+# MAX_TEMPERATURE, each is run against the spec's test cases in a throwaway
+# process killed after CANDIDATE_TIMEOUT seconds, and the best one is kept.
+# Artifacts failing test cases are then repaired by sending the LM the failing
+# cases (at most MAX_FAILURES, bodies cut to MAX_BODY_CHARS, prompts under
+# MAX_PROMPT_TOKENS) for up to MAX_ITERATIONS rounds within TOKEN_BUDGET tokens.
+# The generation prompt shows at most MAX_SAMPLES test cases of distinct shapes
+# within SAMPLES TOKEN_BUDGET tokens, with bodies cut to MAX_BODY_TOKENS.
+# With CACHE ENABLED, implementations passing their test cases are stored by a
+# hash of the generation inputs and reused by any spec with the same inputs
+ARTIFACT_GENERATION = {
+    "CANDIDATES": int(os.getenv("ARTIFACT_GENERATION_CANDIDATES", 1)),
+    "MAX_CANDIDATES": int(os.getenv("ARTIFACT_GENERATION_MAX_CANDIDATES", 8)),
+    "MAX_TEMPERATURE": float(os.getenv("ARTIFACT_GENERATION_MAX_TEMPERATURE", 1.0)),
+    "CANDIDATE_TIMEOUT": float(os.getenv("ARTIFACT_GENERATION_CANDIDATE_TIMEOUT", 30)),
+    "START_METHOD": os.getenv("ARTIFACT_GENERATION_START_METHOD", "spawn"),
+    "SAMPLES": {
+        "TOKEN_BUDGET": int(os.getenv("ARTIFACT_GENERATION_SAMPLES_TOKEN_BUDGET", 4000)),
+        "MAX_BODY_TOKENS": int(os.getenv("ARTIFACT_GENERATION_SAMPLES_MAX_BODY_TOKENS", 1000)),
+        "MAX_SAMPLES": int(os.getenv("ARTIFACT_GENERATION_MAX_SAMPLES", 0)) or None,
+    },
+    "CACHE": {
+        "ENABLED": os.getenv("ARTIFACT_GENERATION_CACHE_ENABLED", "true").lower() == "true",
+    },
+    "REPAIR": {
+        "MAX_ITERATIONS": int(os.getenv("ARTIFACT_REPAIR_MAX_ITERATIONS", 3)),
+        "TOKEN_BUDGET": int(os.getenv("ARTIFACT_REPAIR_TOKEN_BUDGET", 20000)),
+        "MAX_PROMPT_TOKENS": int(os.getenv("ARTIFACT_REPAIR_MAX_PROMPT_TOKENS", 6000)),
+        "MAX_FAILURES": int(os.getenv("ARTIFACT_REPAIR_MAX_FAILURES", 5)),
+        "MAX_BODY_CHARS": int(os.getenv("ARTIFACT_REPAIR_MAX_BODY_CHARS", 2000)),
+    },
+}
+
+# Artifact generation and test runs are queued as TranslationJobs and run by
+# `manage.py run_job_worker`. MODE "sync" runs them in the request instead.
+# Workers poll every POLL_INTERVAL seconds and send a heartbeat every
+# HEARTBEAT_INTERVAL; jobs without one for STALE_AFTER seconds are requeued
+# up to MAX_ATTEMPTS times
+TRANSLATION_JOBS = {
+    "MODE": os.getenv("TRANSLATION_JOBS_MODE", "worker"),
+    "POLL_INTERVAL": float(os.getenv("TRANSLATION_JOBS_POLL_INTERVAL", 1.0)),
+    "HEARTBEAT_INTERVAL": float(os.getenv("TRANSLATION_JOBS_HEARTBEAT_INTERVAL", 10)),
+    "STALE_AFTER": float(os.getenv("TRANSLATION_JOBS_STALE_AFTER", 120)),
+    "MAX_ATTEMPTS": int(os.getenv("TRANSLATION_JOBS_MAX_ATTEMPTS", 3)),
+    "PROGRESS_INTERVAL": float(os.getenv("TRANSLATION_JOBS_PROGRESS_INTERVAL", 1.0)),
+}
+
+# Per-stage latency histograms and LLM token counters served on /metrics in the
+# Prometheus text format. Values are per process; an optional BUCKETS tuple
+# (seconds) overrides the histogram buckets
+TRANSLATION_METRICS = {
+    "ENABLED": os.getenv("TRANSLATION_METRICS_ENABLED", "true").lower() == "true",
 }
 
 
@@ -174,7 +380,7 @@ LOGGING = {
         "file": {
             "level": "INFO",
             "class": "logging.FileHandler",
-            "filename": os.path.join(BASE_DIR, "logs.log"),
+            "filename": os.getenv("LOG_FILE", os.path.join(BASE_DIR, "logs.log")),
             "formatter": "verbose",
         },
         "console": {
@@ -204,4 +410,15 @@ if 'pytest' in sys.modules:
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': ':memory:',
         }
-    }
\ No newline at end of file
+    }
+    # The in-memory database is not shared with the sink's worker thread
+    TRANSLATION_EVENT_SINK["MODE"] = "sync"
+    # Tests never reach a model server
+    LLM_PROVIDER["BACKEND"] = "stub"
+    # Jobs run in the request, no worker process in tests
+    TRANSLATION_JOBS["MODE"] = "sync"
+    # Keep test runs from writing to the project's log file
+    import tempfile
+    LOGGING["handlers"]["file"]["filename"] = os.path.join(
+        tempfile.gettempdir(), "llm_translator-tests.log"
+    )
@@ -1,3 +1,10 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from .models import AccountAPIKey, Account
@@ -5,22 +12,122 @@ from .models import AccountAPIKey, Account
 from django.contrib.auth.backends import BaseBackend
 from django.contrib.auth.models import User
 
+
+class APIKeyCache:
+    """
+    In-process TTL cache of active API key -> (user, account). Keys are
+    resolved with a single select_related query and dropped by signals when a
+    key, its account or its user changes; the TTL bounds staleness across
+    processes.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[User, Account, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple[User, Account]]:
+        """Returns the cached identity of `key` without touching the database."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            user, account, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user, account
+
+    def resolve(self, key: str) -> Optional[tuple[User, Account]]:
+        identity = self.get(key)
+        if identity:
+            return identity
+
+        api_key = (
+            AccountAPIKey.objects.select_related("account__user")
+            .filter(key=key, is_active=True)
+            .first()
+        )
+        if not api_key:
+            return None
+        identity = (api_key.account.user, api_key.account)
+        with self._lock:
+            self._entries[key] = (*identity, time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return identity
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_account(self, account_id) -> None:
+        with self._lock:
+            for key in [k for k, (_, account, _) in self._entries.items() if account.pk == account_id]:
+                del self._entries[key]
+
+    def invalidate_user(self, user_id) -> None:
+        with self._lock:
+            for key in [k for k, (user, _, _) in self._entries.items() if user.pk == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+api_key_cache = APIKeyCache(
+    ttl=getattr(settings, "API_KEY_CACHE", {}).get("TTL", 60),
+    max_entries=getattr(settings, "API_KEY_CACHE", {}).get("MAX_ENTRIES", 10000),
+)
+
+
 class CustomTokenAuthentication(BaseAuthentication):
-    
+
     def authenticate(self, request):
-        bearer_token = request.META.get('HTTP_AUTHORIZATION')
-        if not bearer_token:
+        token = self.__get_token(request)
+        if not token:
             return None
 
         try:
-            token = bearer_token.split(' ')[1]
-            active_api_key = AccountAPIKey.objects.filter(key=token, is_active=True).first()
+            identity = api_key_cache.resolve(token)
+        except Exception as e:
+            raise AuthenticationFailed(f'Error during authentication: {e}')
+        return self.__authenticated(identity)
+
+    def authenticate_header(self, request):
+        # Makes DRF answer failed authentication with 401 instead of 403
+        return 'Bearer'
+
+    async def aauthenticate(self, request):
+        """Async variant that only leaves the event loop on a cache miss."""
+        token = self.__get_token(request)
+        if not token:
+            return None
 
-            if not active_api_key:
-                raise AuthenticationFailed('Invalid token or token is inactive')
-            
-            user = active_api_key.account.user
+        try:
+            identity = api_key_cache.get(token) or await sync_to_async(
+                api_key_cache.resolve
+            )(token)
         except Exception as e:
             raise AuthenticationFailed(f'Error during authentication: {e}')
-        
+        return self.__authenticated(identity)
+
+    def __get_token(self, request) -> Optional[str]:
+        bearer_token = request.META.get('HTTP_AUTHORIZATION')
+        if not bearer_token:
+            return None
+        parts = bearer_token.split(' ')
+        if len(parts) < 2:
+            raise AuthenticationFailed('Error during authentication: malformed Authorization header')
+        return parts[1]
+
+    def __authenticated(self, identity):
+        if not identity:
+            raise AuthenticationFailed('Invalid token or token is inactive')
+        user, _ = identity
         return (user, None)
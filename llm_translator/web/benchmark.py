@@ -0,0 +1,303 @@
+import json
+import itertools
+import time
+import uuid
+import logging
+import platform
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import dspy
+import django
+import requests
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import Client
+from .constants import EngineOptions
+from .events import event_sink
+from .llm.stub import StubLM, StubResponses
+from .models import Account, AccountAPIKey, TranslationArtifact, TranslationEndpoint, TranslationSpec
+
+# JSON -> XML translator used by the compiled engine scenarios
+COMPILED_TRANSLATOR = b'''
+import json
+from xml.sax.saxutils import escape
+
+def _to_xml(tag, value):
+    if isinstance(value, dict):
+        return f"<{tag}>" + "".join(_to_xml(k, v) for k, v in value.items()) + f"</{tag}>"
+    if isinstance(value, list):
+        return "".join(_to_xml(tag, v) for v in value)
+    return f"<{tag}>{escape(str(value))}</{tag}>"
+
+def translate(data):
+    return _to_xml("document", json.loads(data)).encode()
+'''
+
+
+@dataclass
+class BenchmarkScenario:
+    engine: EngineOptions
+    concurrency: int
+    payload_bytes: int
+    requests: int
+    warmup: int = 0
+
+    @property
+    def name(self) -> str:
+        return f"{EngineOptions(self.engine).value}-c{self.concurrency}-{self.payload_bytes}b"
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    engine: str
+    concurrency: int
+    payload_bytes: int
+    requests: int
+    errors: int
+    duration: float
+    throughput: float
+    latency: dict
+
+
+def make_payload(size: int, seq: int) -> bytes:
+    """
+    A JSON order of roughly `size` bytes. `seq` makes every body unique so the
+    dynamic engine's result cache and request coalescing are not measured.
+    """
+    items = []
+    body = {"seq": seq, "order_id": f"ORD-{seq:08d}", "items": items}
+    length = len(json.dumps(body))
+    while length < size:
+        n = len(items)
+        item = {"sku": f"SKU-{n:05d}", "name": f"Item {n}", "quantity": n % 7 + 1, "price": n * 1.25}
+        items.append(item)
+        length += len(json.dumps(item)) + 2
+    return json.dumps(body).encode()
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Linear-interpolated percentile (0-100) of an already sorted list."""
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_latencies(latencies: list[float]) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+        "max": ordered[-1] if ordered else 0.0,
+    }
+
+
+def compare_results(results: list[dict], baseline: list[dict], max_regression: float) -> list[str]:
+    """
+    Returns a message per scenario whose p95 latency grew, or throughput
+    dropped, by more than `max_regression` (a fraction) against `baseline`.
+    """
+    previous = {r["scenario"]: r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["scenario"])
+        if not before:
+            continue
+        p95, before_p95 = result["latency"]["p95"], before["latency"]["p95"]
+        if before_p95 and p95 > before_p95 * (1 + max_regression):
+            regressions.append(
+                f"{result['scenario']}: p95 {before_p95 * 1000:.2f}ms -> {p95 * 1000:.2f}ms"
+            )
+        if before["throughput"] and result["throughput"] < before["throughput"] * (1 - max_regression):
+            regressions.append(
+                f"{result['scenario']}: throughput {before['throughput']:.1f}/s -> {result['throughput']:.1f}/s"
+            )
+    return regressions
+
+
+class TranslateBenchmark:
+    """
+    Measures /api/translate throughput and latency for the compiled and
+    dynamic engines. Requests go through the whole Django stack, in-process
+    with the test client or against a running server when `url` is given.
+
+    `setup` creates a throwaway account, API key and one endpoint per engine in
+    the configured database; the dynamic engine answers from a StubLM with
+    `lm_latency` seconds of latency, so results do not depend on a model
+    server. `teardown` removes everything that was created, events included.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(self, url: Optional[str] = None, lm_latency: float = 0.0, lm_jitter: float = 0.0):
+        self.url = url.rstrip("/") if url else None
+        self.lm_latency = lm_latency
+        self.lm_jitter = lm_jitter
+        self.prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        self.api_key = None
+        self.user = None
+        self.endpoints: dict[EngineOptions, TranslationEndpoint] = {}
+        self.started_at = None
+        # Request numbers are unique across scenarios, so a later scenario never
+        # hits results cached by an earlier one
+        self.sequence = itertools.count()
+
+    def setup(self) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        if not self.url:
+            dspy.configure(
+                lm=StubLM(
+                    StubResponses(default_output="<document/>"),
+                    latency=self.lm_latency,
+                    jitter=self.lm_jitter,
+                )
+            )
+        self.user = User.objects.create(username=self.prefix)
+        account = Account.objects.create(name=self.prefix, user=self.user)
+        self.api_key = AccountAPIKey.objects.create(account=account, key=self.prefix).key
+        for engine in (EngineOptions.COMPILED_ARTIFACT, EngineOptions.DYNAMIC):
+            endpoint = TranslationEndpoint.objects.create(
+                key=f"{self.prefix}-{engine.value}", name=f"{self.prefix} {engine.value}", definition={}, owner=account
+            )
+            spec = TranslationSpec.objects.create(
+                name=f"{self.prefix} {engine.value}",
+                endpoint=endpoint,
+                version="1",
+                is_active=True,
+                definition={
+                    "engine": engine,
+                    "input_rule": {"content_type": "json"},
+                    "output_rule": {"content_type": "xml"},
+                    "extra_context": "",
+                },
+            )
+            if engine == EngineOptions.COMPILED_ARTIFACT:
+                TranslationArtifact.objects.create(spec=spec, implementation=COMPILED_TRANSLATOR)
+            self.endpoints[engine] = endpoint
+
+    def teardown(self) -> None:
+        # Stops the sink's worker too, so no batch is written after the delete
+        event_sink.shutdown()
+        if self.user:
+            # Cascades to the account, key, endpoints, specs, artifacts and events
+            self.user.delete()
+
+    def run(self, scenario: BenchmarkScenario) -> BenchmarkResult:
+        endpoint = self.endpoints[EngineOptions(scenario.engine)]
+        send = self.__sender(f"/api/translate/{endpoint.key}")
+        template = make_payload(scenario.payload_bytes, 0)
+
+        def payload(seq: int) -> bytes:
+            # Same size and shape as the template, unique per request
+            return template.replace(b'"seq": 0,', f'"seq": {seq},'.encode(), 1)
+
+        for _ in range(scenario.warmup):
+            send(payload(next(self.sequence)))
+
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+        remaining = scenario.requests
+
+        def worker():
+            nonlocal errors, remaining
+            worker_send = self.__sender(f"/api/translate/{endpoint.key}")
+            try:
+                while True:
+                    with lock:
+                        if not remaining:
+                            return
+                        remaining -= 1
+                        seq = next(self.sequence)
+                    body = payload(seq)
+                    started = time.perf_counter()
+                    ok = worker_send(body)
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        latencies.append(elapsed)
+                        errors += not ok
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=scenario.concurrency) as pool:
+            for future in [pool.submit(worker) for _ in range(scenario.concurrency)]:
+                future.result()
+        duration = time.perf_counter() - started
+
+        result = BenchmarkResult(
+            scenario=scenario.name,
+            engine=EngineOptions(scenario.engine).value,
+            concurrency=scenario.concurrency,
+            payload_bytes=scenario.payload_bytes,
+            requests=scenario.requests,
+            errors=errors,
+            duration=duration,
+            throughput=scenario.requests / duration if duration else 0.0,
+            latency=summarize_latencies(latencies),
+        )
+        self.logger.info(
+            f"{result.scenario}: {result.throughput:.1f} req/s, "
+            f"p95 {result.latency['p95'] * 1000:.2f}ms, {result.errors} errors"
+        )
+        return result
+
+    def metadata(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "debug": settings.DEBUG,
+            "target": self.url or "in-process",
+            "lm_latency": self.lm_latency,
+            "lm_jitter": self.lm_jitter,
+            "event_sink": getattr(settings, "TRANSLATION_EVENT_SINK", {}).get("MODE", "background"),
+        }
+
+    def __sender(self, path: str) -> Callable[[bytes], bool]:
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        if self.url:
+            session = requests.Session()
+            session.headers.update(headers)
+
+            def send(body: bytes) -> bool:
+                response = session.post(
+                    f"{self.url}{path}", data=body, headers={"Content-Type": "application/json"}
+                )
+                return response.status_code == 200
+        else:
+            client = Client(raise_request_exception=False, headers=headers)
+
+            def send(body: bytes) -> bool:
+                return client.post(path, data=body, content_type="application/json").status_code == 200
+
+        return send
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def results_document(benchmark: TranslateBenchmark, results: list[BenchmarkResult]) -> dict:
+    return {"meta": benchmark.metadata(), "results": [asdict(r) for r in results]}
@@ -18,4 +18,28 @@ class TranslationTestCaseStatus(str, Enum):
     NOT_EXECUTED = "NOT_EXECUTED"
 
 class TranslationArtifcatImplType(str, Enum):
-    PYTHON = "python"
\ No newline at end of file
+    PYTHON = "python"
+
+class TranslationCacheStatus(str, Enum):
+    HIT = "hit"
+    MISS = "miss"
+    BYPASS = "bypass"
+    COALESCED = "coalesced"
+
+class PayloadCaptureMode(str, Enum):
+    FULL = "full"
+    NONE = "none"
+    HASH = "hash"
+    TRUNCATE = "truncate"
+    SAMPLE = "sample"
+    BLOB = "blob"
+
+class JobKind(str, Enum):
+    GENERATE_ARTIFACT = "generate_artifact"
+    RUN_TEST_CASES = "run_test_cases"
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
@@ -0,0 +1,203 @@
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from enum import Enum
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, transaction
+from .models import TranslationEvent, TranslationPayload
+from .traffic import record_events
+from .metrics import event_write_seconds, events_written
+
+
+class EventSinkMode(str, Enum):
+    BACKGROUND = "background"
+    SYNC = "sync"
+
+
+class OverflowPolicy(str, Enum):
+    BLOCK = "block"
+    DROP = "drop"
+    INLINE = "inline"
+
+
+class TranslationEventSink:
+    """
+    Buffers TranslationEvents in-process and writes them with bulk_create from
+    a background thread, flushing every `batch_size` events or `flush_interval`
+    seconds, whichever comes first.
+
+    When the queue is full the overflow policy applies: `block` waits up to
+    `block_timeout` seconds per emit call for room and then writes inline, `drop` discards
+    the event and `inline` writes it on the caller's thread. Pending events are
+    flushed at interpreter shutdown.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(
+        self,
+        mode: EventSinkMode = EventSinkMode.BACKGROUND,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        block_timeout: float = 0.5,
+    ):
+        self.mode = EventSinkMode(mode)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._worker = None
+        self._stopping = threading.Event()
+
+    def emit(self, event: TranslationEvent) -> None:
+        self.emit_many([event])
+
+    def emit_many(self, events: list[TranslationEvent]) -> None:
+        if self.mode == EventSinkMode.SYNC:
+            self.write(events)
+            return
+
+        self.__ensure_worker()
+        # One wait for the whole call: once the queue stays full, the rest of
+        # the events overflow together instead of each waiting in turn
+        deadline = time.monotonic() + self.block_timeout
+        overflow = []
+        for index, event in enumerate(events):
+            try:
+                if self.overflow_policy == OverflowPolicy.BLOCK:
+                    self._queue.put(event, timeout=max(0.0, deadline - time.monotonic()))
+                else:
+                    self._queue.put_nowait(event)
+            except queue.Full:
+                overflow = events[index:]
+                break
+
+        if not overflow:
+            return
+        if self.overflow_policy == OverflowPolicy.DROP:
+            self.dropped += len(overflow)
+            self.logger.warning(
+                f"Event queue full, dropped {len(overflow)} events ({self.dropped} total)"
+            )
+        else:
+            self.write(overflow)
+
+    async def aemit(self, event: TranslationEvent) -> None:
+        # Enqueueing never touches the database; anything that may (sync mode,
+        # a full queue) is handed off to a thread
+        if self.mode == EventSinkMode.BACKGROUND:
+            self.__ensure_worker()
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                pass
+        await sync_to_async(self.emit)(event)
+
+    def write(self, events: list[TranslationEvent]) -> None:
+        if events:
+            with event_write_seconds.time(), transaction.atomic():
+                TranslationEvent.objects.bulk_create(events, batch_size=self.batch_size)
+                # Bodies captured in `blob` mode, see web.payloads
+                TranslationPayload.objects.bulk_create(
+                    [p for event in events for p in getattr(event, "payloads", ())],
+                    batch_size=self.batch_size,
+                )
+                record_events(events)
+            events_written.inc(len(events))
+
+    def flush(self) -> None:
+        """Write everything currently queued on the calling thread."""
+        if not self._queue:
+            return
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self.__write_batch(batch)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._worker and self._worker.is_alive():
+            self._worker.join(timeout)
+        self.flush()
+
+    def __ensure_worker(self) -> None:
+        # The worker is started lazily and restarted after a fork, since
+        # threads do not survive into pre-forked server workers
+        if self._pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._worker.is_alive():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.max_queue_size)
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._worker = threading.Thread(
+                target=self.__run, name="translation-event-sink", daemon=True
+            )
+            self._worker.start()
+
+    def __run(self) -> None:
+        try:
+            while not self._stopping.is_set():
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                self.__write_batch(batch)
+        finally:
+            connection.close()
+
+    def __write_batch(self, batch: list[TranslationEvent]) -> None:
+        if not batch:
+            return
+        for attempt in range(2):
+            try:
+                self.write(batch)
+                return
+            except Exception as e:
+                # Drop the (possibly broken) connection so the retry reconnects
+                connection.close()
+                if attempt:
+                    self.logger.error(
+                        f"Failed to write {len(batch)} translation events: {e}",
+                        exc_info=True,
+                    )
+
+
+def _build_event_sink() -> TranslationEventSink:
+    config = getattr(settings, "TRANSLATION_EVENT_SINK", {})
+    sink = TranslationEventSink(
+        mode=config.get("MODE", EventSinkMode.BACKGROUND),
+        batch_size=config.get("BATCH_SIZE", 500),
+        flush_interval=config.get("FLUSH_INTERVAL", 1.0),
+        max_queue_size=config.get("MAX_QUEUE_SIZE", 10000),
+        overflow_policy=config.get("OVERFLOW_POLICY", OverflowPolicy.BLOCK),
+        block_timeout=config.get("BLOCK_TIMEOUT", 0.5),
+    )
+    atexit.register(sink.shutdown)
+    return sink
+
+
+event_sink = _build_event_sink()
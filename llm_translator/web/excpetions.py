@@ -9,4 +9,8 @@ class TranslationException(Exception):
 
 class ArtifcatGenerationException(Exception):
     def __init__(self, message):
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class LMProviderUnavailable(Exception):
+    def __init__(self, message):
+        super().__init__(message)
@@ -0,0 +1,311 @@
+import os
+import time
+import socket
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Callable, Optional
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from .constants import JobKind, JobStatus, TranslationTestCaseStatus
+from .models import TranslationJob, TranslationSpec
+from .manager import (
+    ArtifactGenerationRequest,
+    ArtifactGenerationResponse,
+    ArtifactGeneratorManager,
+    SpecTestCaseExecutor,
+)
+from .serializers import (
+    ArtifactGenerationSerializer,
+    SpecTestCaseListSerializer,
+    TranslationSpecArtifactSerializer,
+)
+
+logger = logging.getLogger(f"llm_translator.{__name__}")
+
+ACTIVE_STATUSES = [JobStatus.QUEUED.value, JobStatus.RUNNING.value]
+
+
+def _setting(name: str, default):
+    return getattr(settings, "TRANSLATION_JOBS", {}).get(name, default)
+
+
+class JobProgress:
+    """
+    Progress callback handed to job handlers. Progress is saved on the job
+    when the stage changes, when a stage completes, and otherwise at most
+    every `interval` seconds.
+    """
+
+    def __init__(self, job: TranslationJob, interval: float):
+        self.job = job
+        self.interval = interval
+        self.saved_at = 0.0
+
+    def __call__(self, stage: str, done: int = 0, total: int = 0) -> None:
+        changed = self.job.progress.get("stage") != stage
+        self.job.progress = {"stage": stage, "done": done, "total": total}
+        now = time.monotonic()
+        if changed or done == total or now - self.saved_at >= self.interval:
+            self.saved_at = now
+            TranslationJob.objects.filter(pk=self.job.pk).update(
+                progress=self.job.progress, heartbeat_at=timezone.now()
+            )
+
+
+def artifact_generation_result(response: ArtifactGenerationResponse) -> dict:
+    result = {
+        "success": response.success,
+        "it_generated_artifact": response.it_generated_artifact,
+        "it_passed_all_tests": response.it_passed_all_test_cases,
+        "message": response.message,
+        "stacktrace": response.stacktrace,
+        "failed_test_cases": SpecTestCaseListSerializer(
+            response.failed_test_cases, many=True
+        ).data,
+        "artifact": TranslationSpecArtifactSerializer(response.artifact).data,
+    }
+    if response.candidates:
+        result["candidates"] = [
+            {
+                "temperature": c.temperature,
+                "passed": c.passed,
+                "total": c.total,
+                "runtime": c.runtime,
+                "error": c.error,
+            }
+            for c in response.candidates
+        ]
+    if response.repairs:
+        result["repairs"] = [asdict(attempt) for attempt in response.repairs]
+    return ArtifactGenerationSerializer(result).data
+
+
+def _generate_artifact(job: TranslationJob, progress: JobProgress) -> dict:
+    response = ArtifactGeneratorManager().handle(
+        ArtifactGenerationRequest(
+            spec_id=str(job.spec_id), candidates=job.params.get("candidates")
+        ),
+        progress=progress,
+    )
+    return artifact_generation_result(response)
+
+
+def _run_test_cases(job: TranslationJob, progress: JobProgress) -> dict:
+    response = SpecTestCaseExecutor(job.spec).run_all(
+        progress=lambda done, total: progress("testing", done, total)
+    )
+    failed_test_cases = [
+        execution.test_case
+        for execution in response.executions
+        if execution.status == TranslationTestCaseStatus.FAILURE
+    ]
+    return {
+        "success": response.success,
+        "failed_test_cases": SpecTestCaseListSerializer(failed_test_cases, many=True).data,
+    }
+
+
+# Handlers return the job result; a result with `"success": False` fails the job
+JOB_HANDLERS: dict[str, Callable[[TranslationJob, JobProgress], dict]] = {
+    JobKind.GENERATE_ARTIFACT.value: _generate_artifact,
+    JobKind.RUN_TEST_CASES.value: _run_test_cases,
+}
+
+
+def enqueue_job(
+    kind: JobKind, spec: TranslationSpec, params: Optional[dict] = None
+) -> tuple[TranslationJob, bool]:
+    """
+    Queues a job unless one of the same kind is already queued or running
+    for the spec, in which case that job is returned. Returns the job and
+    whether it was created. With `TRANSLATION_JOBS["MODE"] == "sync"` the
+    new job runs before returning.
+    """
+    active = TranslationJob.objects.filter(
+        spec=spec, kind=kind.value, status__in=ACTIVE_STATUSES
+    ).first()
+    if active:
+        return active, False
+    try:
+        with transaction.atomic():
+            job = TranslationJob.objects.create(
+                spec=spec, kind=kind.value, params=params or {}
+            )
+    except IntegrityError:
+        # Another request queued the same job concurrently
+        active = TranslationJob.objects.filter(
+            spec=spec, kind=kind.value, status__in=ACTIVE_STATUSES
+        ).first()
+        if not active:
+            raise
+        return active, False
+
+    logger.info(f"Queued {kind.value} job {job.pk} for spec {spec.name}")
+    if _setting("MODE", "worker") == "sync":
+        claimed = claim_job("sync", job_id=job.pk)
+        if claimed:
+            job = run_job(claimed)
+    return job, True
+
+
+def claim_job(worker: str, job_id=None) -> Optional[TranslationJob]:
+    """
+    Marks the oldest queued job (or `job_id`) as running for `worker`. The
+    conditional update makes sure concurrent workers never claim the same job.
+    """
+    queued = TranslationJob.objects.filter(status=JobStatus.QUEUED.value)
+    if job_id is not None:
+        queued = queued.filter(pk=job_id)
+    for pk in queued.order_by("created_at").values_list("pk", flat=True)[:10]:
+        now = timezone.now()
+        claimed = TranslationJob.objects.filter(
+            pk=pk, status=JobStatus.QUEUED.value
+        ).update(
+            status=JobStatus.RUNNING.value,
+            worker=worker,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return TranslationJob.objects.select_related("spec").get(pk=pk)
+    return None
+
+
+def run_job(job: TranslationJob) -> TranslationJob:
+    progress = JobProgress(job, _setting("PROGRESS_INTERVAL", 1.0))
+    started = time.perf_counter()
+    try:
+        job.result = JOB_HANDLERS[job.kind](job, progress)
+        failed = job.result.get("success") is False
+        job.status = JobStatus.FAILED.value if failed else JobStatus.SUCCEEDED.value
+        job.error = job.result.get("message") if failed else None
+    except Exception as e:
+        logger.error(f"Job {job.pk} ({job.kind}) failed: {e}", exc_info=True)
+        job.status = JobStatus.FAILED.value
+        job.error = str(e)
+    job.finished_at = timezone.now()
+    # Only the claim this run started from may finish the job; if it was
+    # requeued and claimed again meanwhile, the newer run owns the outcome
+    saved = TranslationJob.objects.filter(
+        pk=job.pk, worker=job.worker, attempts=job.attempts
+    ).update(
+        status=job.status,
+        result=job.result,
+        error=job.error,
+        finished_at=job.finished_at,
+        progress=job.progress,
+        updated_at=job.finished_at,
+    )
+    if not saved:
+        logger.warning(
+            f"Job {job.pk} ({job.kind}) was taken over by another worker, "
+            f"discarding the {job.status} outcome of attempt {job.attempts}"
+        )
+        job.refresh_from_db()
+        return job
+    logger.info(
+        f"Job {job.pk} ({job.kind}) {job.status} in {time.perf_counter() - started:.2f}s"
+    )
+    return job
+
+
+def requeue_stale_jobs(stale_after: float, max_attempts: int) -> int:
+    """
+    Running jobs whose worker stopped sending heartbeats are queued again, or
+    failed once they used up `max_attempts`.
+    """
+    stale = TranslationJob.objects.filter(
+        status=JobStatus.RUNNING.value,
+        heartbeat_at__lt=timezone.now() - timedelta(seconds=stale_after),
+    )
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status=JobStatus.FAILED.value,
+        error="The worker running the job stopped responding",
+        finished_at=timezone.now(),
+    )
+    requeued = stale.update(status=JobStatus.QUEUED.value, worker=None)
+    if failed or requeued:
+        logger.warning(f"Requeued {requeued} and failed {failed} stale jobs")
+    return requeued + failed
+
+
+class JobWorker:
+    """
+    Runs queued jobs one at a time in the current process. Any number of
+    workers can share the database; each running job gets a heartbeat so
+    jobs of a crashed worker are picked up again.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        stale_after: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval or _setting("POLL_INTERVAL", 1.0)
+        self.heartbeat_interval = heartbeat_interval or _setting("HEARTBEAT_INTERVAL", 10.0)
+        self.stale_after = stale_after or _setting("STALE_AFTER", 120.0)
+        self.max_attempts = max_attempts or _setting("MAX_ATTEMPTS", 3)
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        """Stops after the current job."""
+        self._stopped.set()
+
+    def run(self, max_jobs: Optional[int] = None, once: bool = False) -> int:
+        """
+        Processes jobs until stopped, until `max_jobs` ran, or with `once`
+        until the queue is empty. Returns the number of jobs run.
+        """
+        processed = 0
+        while not self._stopped.is_set():
+            close_old_connections()
+            requeue_stale_jobs(self.stale_after, self.max_attempts)
+            job = claim_job(self.name)
+            if job is None:
+                if once:
+                    break
+                self._stopped.wait(self.poll_interval)
+                continue
+
+            logger.info(f"Worker {self.name} running job {job.pk} ({job.kind})")
+            with self.__heartbeat(job):
+                run_job(job)
+            processed += 1
+            if max_jobs and processed >= max_jobs:
+                break
+        return processed
+
+    @contextmanager
+    def __heartbeat(self, job: TranslationJob):
+        done = threading.Event()
+
+        def beat():
+            try:
+                while not done.wait(self.heartbeat_interval):
+                    try:
+                        TranslationJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now())
+                    except Exception as e:
+                        # A missed beat is retried on a fresh connection; giving
+                        # up would get the job requeued while it still runs
+                        logger.error(f"Heartbeat of job {job.pk} failed: {e}")
+                        connection.close()
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=beat, name=f"job-heartbeat-{job.pk}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
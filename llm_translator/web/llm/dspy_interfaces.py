@@ -2,6 +2,8 @@ import dspy
 import requests
 import logging
 import re
+from dspy.utils.usage_tracker import track_usage
+from .usage import track_async_usage
 
 
 class TranslationSignature(dspy.Signature):
@@ -27,15 +29,19 @@ class TranslationPromptModule(dspy.Module):
         super().__init__()
         self.predict = dspy.Predict(TranslationSignature)
         self.logger = logging.getLogger(f"{__name__}.TranslationPromptModule")
+        # lm -> token usage of the last call, empty on LM cache hits
+        self.last_usage = {}
 
     def forward(self, input_type, output_type, input_data, extra_instructions=None):
         try:
-            result = self.predict(
-                input_type=input_type,
-                output_type=output_type,
-                input_data=input_data,
-                extra_instructions=extra_instructions or "",
-            )
+            with track_usage() as usage:
+                result = self.predict(
+                    input_type=input_type,
+                    output_type=output_type,
+                    input_data=input_data,
+                    extra_instructions=extra_instructions or "",
+                )
+            self.last_usage = usage.get_total_tokens()
             self.logger.info(f"Predict result: {result}")
             self.logger.info(f"Predict result type: {type(result)}")
             self.logger.info(f"Predict result attributes: {dir(result)}")
@@ -50,6 +56,25 @@ class TranslationPromptModule(dspy.Module):
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             raise
 
+    async def aforward(self, input_type, output_type, input_data, extra_instructions=None):
+        """Async counterpart of `forward`, awaiting the LM instead of blocking a thread."""
+        try:
+            with track_async_usage() as usage:
+                result = await self.predict.acall(
+                    input_type=input_type,
+                    output_type=output_type,
+                    input_data=input_data,
+                    extra_instructions=extra_instructions or "",
+                )
+            self.last_usage = usage.get_total_tokens()
+            output = result.output
+            self.logger.info(f"Extracted output: {repr(output)}")
+
+            return output
+        except Exception as e:
+            self.logger.error(f"Error in async predict: {e}", exc_info=True)
+            raise
+
 
 class ArtifactGenerationSignature(dspy.Signature):
     """You are an expert data translator specializing in Python. Generate a
@@ -155,13 +180,15 @@ class ArtifactGenerationPromptModule(dspy.Module):
         
         return cleaned_code
 
-    def forward(self, input_type, output_type, input_samples, extra_instructions=None):
+    def forward(self, input_type, output_type, input_samples, extra_instructions=None, config=None):
+        """`config` overrides LM settings for this call, e.g. temperature."""
         try:
             result = self.predict(
                 input_type=input_type,
                 output_type=output_type,
                 input_samples=input_samples,
                 extra_instructions=extra_instructions or "",
+                config=config or {},
             )
             
             raw_output = result.output
@@ -181,3 +208,62 @@ class ArtifactGenerationPromptModule(dspy.Module):
             import traceback
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             raise
+
+
+class ArtifactRepairSignature(dspy.Signature):
+    """You are an expert data translator specializing in Python. The Python
+    function below translates data from {input_type} to {output_type} but fails
+    some test cases. Fix it so that every failing case produces its expected
+    output, without breaking the cases that already pass.
+
+    CRITICAL REQUIREMENTS:
+    1. Return ONLY the complete fixed Python function code, no explanations, no markdown
+    2. Keep the function name `translate` and its single `data` bytes parameter
+    3. The function must return a `bytes` object
+    4. Make targeted changes for the reported failures instead of rewriting unrelated logic
+    5. Do not include ```python or ``` markers
+    """
+
+    input_type: str = dspy.InputField(
+        desc="The type of the input data (e.g., JSON, XML, etc.)"
+    )
+    output_type: str = dspy.InputField(
+        desc="The type to convert the data to (e.g., XML, JSON, etc.)"
+    )
+    implementation: str = dspy.InputField(
+        desc="The current Python implementation of `translate`."
+    )
+    failures: str = dspy.InputField(
+        desc="Failing test cases with their input, expected output, actual output or error, and a diff."
+    )
+    extra_instructions: str = dspy.InputField(
+        desc="Any extra instructions or requirements for the implementation."
+    )
+    output: str = dspy.OutputField(
+        desc="The fixed Python function code as a string, with no extra text, markdown, or explanations."
+    )
+
+
+class ArtifactRepairPromptModule(ArtifactGenerationPromptModule):
+    def __init__(self):
+        super().__init__()
+        self.predict = dspy.Predict(ArtifactRepairSignature)
+        self.logger = logging.getLogger(f"{__name__}.ArtifactRepairPromptModule")
+        # lm -> token usage of the last call, empty on LM cache hits
+        self.last_usage = {}
+
+    def forward(self, input_type, output_type, implementation, failures, extra_instructions=None):
+        with track_usage() as usage:
+            result = self.predict(
+                input_type=input_type,
+                output_type=output_type,
+                implementation=implementation,
+                failures=failures,
+                extra_instructions=extra_instructions or "",
+            )
+        self.last_usage = usage.get_total_tokens()
+
+        cleaned_output = self._clean_python_code(result.output)
+        if not cleaned_output:
+            raise ValueError("Failed to extract valid Python function from LLM output")
+        return cleaned_output
@@ -1,11 +1,77 @@
 import dspy
+import httpx
+import litellm
+from django.conf import settings
+from .pool import CircuitBreaker, LMBackend, LMProviderPool
+from .stub import RecordingLM, StubLM, StubResponses
 
 
-def configure_dspy_lm():
-    lm = dspy.LM(
-        "openai/local-model",
-        api_base="http://host.docker.internal:8080/v1",
-        api_key="local",
-        temperature=0,
+def build_lm() -> dspy.BaseLM:
+    """Builds the LM selected by `LLM_PROVIDER["BACKEND"]` ("openai" or "stub")."""
+    config = getattr(settings, "LLM_PROVIDER", {})
+    if config.get("BACKEND", "openai") == "stub":
+        stub = config.get("STUB", {})
+        default_output = stub.get("DEFAULT_OUTPUT", "<stub/>")
+        responses = (
+            StubResponses.load(stub["RECORDINGS"], default_output)
+            if stub.get("RECORDINGS")
+            else StubResponses(default_output=default_output)
+        )
+        return StubLM(responses, latency=stub.get("LATENCY", 0.0), jitter=stub.get("JITTER", 0.0))
+
+    primary = {
+        "NAME": "primary",
+        "MODEL": config.get("MODEL", "openai/local-model"),
+        "API_BASE": config.get("API_BASE", "http://host.docker.internal:8080/v1"),
+        "API_KEY": config.get("API_KEY", "local"),
+    }
+    breaker = config.get("CIRCUIT_BREAKER", {})
+    backends = []
+    for index, backend in enumerate([primary, *config.get("BACKENDS", [])]):
+        options = dict(
+            api_base=backend.get("API_BASE"),
+            api_key=backend.get("API_KEY"),
+            temperature=0,
+            timeout=backend.get("TIMEOUT", config.get("TIMEOUT", 120)),
+            # Retries and failover are handled by the pool
+            num_retries=0,
+        )
+        lm = (
+            RecordingLM(backend["MODEL"], record_to=config["RECORD_TO"], **options)
+            if config.get("RECORD_TO")
+            else dspy.LM(backend["MODEL"], **options)
+        )
+        backends.append(
+            LMBackend(
+                name=backend.get("NAME") or f"backend-{index}",
+                lm=lm,
+                max_concurrency=backend.get("MAX_CONCURRENCY", config.get("MAX_CONCURRENCY", 8)),
+                breaker=CircuitBreaker(
+                    failure_threshold=breaker.get("FAILURES", 5),
+                    reset_timeout=breaker.get("RESET_TIMEOUT", 30),
+                ),
+            )
+        )
+
+    _share_connections(sum(b.max_concurrency for b in backends))
+    return LMProviderPool(
+        backends,
+        retries=config.get("RETRIES", 2),
+        backoff=config.get("BACKOFF", 0.5),
+        queue_timeout=config.get("QUEUE_TIMEOUT", 30),
     )
-    dspy.configure(lm=lm)
+
+
+def _share_connections(max_connections: int) -> None:
+    # One keep-alive HTTP pool for every backend, sized to the calls the pool
+    # can have in flight. Async calls keep litellm's per-event-loop clients,
+    # since async views may run on a new loop per request under WSGI
+    litellm.client_session = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+    )
+
+
+def configure_dspy_lm():
+    dspy.configure(lm=build_lm())
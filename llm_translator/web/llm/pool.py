@@ -0,0 +1,284 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Optional
+import httpx
+import litellm
+from dspy.clients.base_lm import BaseLM
+from ..excpetions import LMProviderUnavailable
+from ..metrics import llm_backend_requests, llm_backend_seconds
+from .usage import record_usage
+
+
+def _is_backend_failure(error: Exception) -> bool:
+    """
+    Whether `error` means the backend is unreachable or unhealthy: transport
+    errors, timeouts, 429 and 5xx responses. Anything else (bad request,
+    context window exceeded, authentication...) would fail on every backend.
+    """
+    if isinstance(
+        error,
+        (ConnectionError, TimeoutError, httpx.TransportError, litellm.APIConnectionError, litellm.Timeout),
+    ):
+        return True
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status in (408, 429) or status >= 500)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and stays open for
+    `reset_timeout` seconds; then a single trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                return time.monotonic() - self.opened_at >= self.reset_timeout
+            return not self._trial_in_flight
+
+    def allow(self) -> bool:
+        """Claims a call; in the half-open state only one call is allowed."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def cancel(self) -> None:
+        """Gives back a claimed call that was never made."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class LMBackend:
+    """One model server of the pool, with its concurrency limit and health."""
+
+    # Weight of the newest call in the latency moving average
+    LATENCY_SMOOTHING = 0.2
+
+    def __init__(self, name: str, lm: BaseLM, max_concurrency: int, breaker: CircuitBreaker):
+        self.name = name
+        self.lm = lm
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self._slots = threading.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        if not self._slots.acquire(timeout=timeout):
+            return False
+        self.__track(1)
+        return True
+
+    async def aacquire(self, timeout: float) -> bool:
+        # Polls instead of blocking the event loop on the thread semaphore
+        deadline = time.monotonic() + timeout
+        while not self._slots.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.005)
+        self.__track(1)
+        return True
+
+    def release(self) -> None:
+        self.__track(-1)
+        self._slots.release()
+
+    def record_success(self, seconds: float) -> None:
+        with self._lock:
+            self.latency = (
+                seconds
+                if self.latency is None
+                else self.latency + self.LATENCY_SMOOTHING * (seconds - self.latency)
+            )
+        self.breaker.record_success()
+
+    def record_failure(self) -> None:
+        self.breaker.record_failure()
+
+    def expected_wait(self, default_latency: float) -> float:
+        return (self.in_flight + 1) * (self.latency or default_latency) / self.max_concurrency
+
+    def __track(self, delta: int) -> None:
+        with self._lock:
+            self.in_flight += delta
+
+
+class LMProviderPool(BaseLM):
+    """
+    DSPy LM spreading calls over several OpenAI-compatible backends.
+
+    Each call goes to the available backend with the lowest expected wait
+    (calls in flight x average latency / max concurrency); backends without
+    a latency yet count as the fastest known one, so they get tried. Calls
+    failing on the backend side (see `_is_backend_failure`) are retried with
+    exponential backoff on another backend when there is one, and backends
+    failing repeatedly are skipped until their circuit breaker lets a trial
+    call through again. Other errors are raised right away.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(
+        self,
+        backends: list[LMBackend],
+        retries: int = 2,
+        backoff: float = 0.5,
+        queue_timeout: float = 30.0,
+    ):
+        super().__init__("pool", cache=False)
+        self.backends = backends
+        self.retries = retries
+        self.backoff = backoff
+        self.queue_timeout = queue_timeout
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        tried: set[str] = set()
+        error = None
+        for attempt in range(self.retries + 1):
+            backend = self.__pick(tried)
+            if not backend:
+                break
+            try:
+                if attempt:
+                    time.sleep(self.__backoff(attempt))
+                if not backend.acquire(self.queue_timeout):
+                    error = self.__busy(backend, tried)
+                    continue
+                started = time.perf_counter()
+                try:
+                    response = backend.lm.forward(prompt=prompt, messages=messages, **kwargs)
+                except Exception as e:
+                    if not _is_backend_failure(e):
+                        self.__rejected(backend, e)
+                        raise
+                    error = self.__failed(backend, tried, e)
+                    continue
+                finally:
+                    backend.release()
+            except BaseException:
+                # Rejected, cancelled or interrupted before an outcome was
+                # recorded: give back the claim, or a half-open circuit would
+                # wait for this trial forever
+                backend.breaker.cancel()
+                raise
+            self.__succeeded(backend, time.perf_counter() - started)
+            return response
+        raise LMProviderUnavailable(f"No LM backend could answer: {error}")
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        tried: set[str] = set()
+        error = None
+        for attempt in range(self.retries + 1):
+            backend = self.__pick(tried)
+            if not backend:
+                break
+            try:
+                if attempt:
+                    await asyncio.sleep(self.__backoff(attempt))
+                if not await backend.aacquire(self.queue_timeout):
+                    error = self.__busy(backend, tried)
+                    continue
+                started = time.perf_counter()
+                try:
+                    response = await backend.lm.aforward(prompt=prompt, messages=messages, **kwargs)
+                except Exception as e:
+                    if not _is_backend_failure(e):
+                        self.__rejected(backend, e)
+                        raise
+                    error = self.__failed(backend, tried, e)
+                    continue
+                finally:
+                    backend.release()
+            except BaseException:
+                # Rejected, cancelled or interrupted before an outcome was
+                # recorded: give back the claim, or a half-open circuit would
+                # wait for this trial forever
+                backend.breaker.cancel()
+                raise
+            self.__succeeded(backend, time.perf_counter() - started)
+            record_usage(backend.lm.model, response)
+            return response
+        raise LMProviderUnavailable(f"No LM backend could answer: {error}")
+
+    def __pick(self, tried: set[str]) -> Optional[LMBackend]:
+        available = [b for b in self.backends if b.breaker.is_available()]
+        # Prefer backends not tried yet for this call, fall back to retrying one
+        candidates = [b for b in available if b.name not in tried] or available
+        known = [b.latency for b in self.backends if b.latency is not None]
+        default_latency = min(known) if known else 1.0
+        for backend in sorted(candidates, key=lambda b: b.expected_wait(default_latency)):
+            if backend.breaker.allow():
+                return backend
+        return None
+
+    def __backoff(self, attempt: int) -> float:
+        delay = self.backoff * 2 ** (attempt - 1)
+        return delay + random.uniform(0, delay / 2)
+
+    def __busy(self, backend: LMBackend, tried: set[str]) -> Exception:
+        tried.add(backend.name)
+        backend.breaker.cancel()
+        llm_backend_requests.inc(backend=backend.name, outcome="busy")
+        self.logger.warning(f"LM backend {backend.name} had no free slot in {self.queue_timeout}s")
+        return TimeoutError(f"LM backend {backend.name} is saturated")
+
+    def __failed(self, backend: LMBackend, tried: set[str], error: Exception) -> Exception:
+        tried.add(backend.name)
+        backend.record_failure()
+        llm_backend_requests.inc(backend=backend.name, outcome="failure")
+        self.logger.warning(
+            f"LM backend {backend.name} failed ({backend.breaker.state}): {error}"
+        )
+        return error
+
+    def __rejected(self, backend: LMBackend, error: Exception) -> None:
+        # The backend answered, the request itself is at fault
+        llm_backend_requests.inc(backend=backend.name, outcome="rejected")
+        self.logger.warning(f"LM backend {backend.name} rejected the request: {error}")
+
+    def __succeeded(self, backend: LMBackend, seconds: float) -> None:
+        backend.record_success(seconds)
+        llm_backend_requests.inc(backend=backend.name, outcome="success")
+        llm_backend_seconds.observe(seconds, backend=backend.name)
@@ -0,0 +1,226 @@
+import json
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+import dspy
+from litellm import ModelResponse
+from .tokens import estimate_tokens
+from .usage import record_usage
+
+
+def messages_key(messages) -> str:
+    """Stable hash of a chat request, used to match recorded responses."""
+    normalized = [
+        {"role": m.get("role"), "content": m.get("content")} for m in messages or ()
+    ]
+    return hashlib.sha256(
+        json.dumps(normalized, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class StubResponses:
+    """
+    Canned completions for the stub LM, loaded from a JSONL file with one entry
+    per line (blank lines and lines starting with `#` are skipped):
+
+    - `{"key": ..., "response": ...}`: a recorded raw completion, replayed when
+      the request's `messages_key` matches (see `RecordingLM`)
+    - `{"contains": ..., "output": ...}`: answers any request whose messages
+      contain the text (or every text of a list) with `output` as the
+      signature's `output` field; the first matching rule wins
+
+    Requests matching nothing get `default_output`.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(self, entries: list[dict] = (), default_output: str = "<stub/>"):
+        self.recorded = {e["key"]: e["response"] for e in entries if "key" in e}
+        self.rules = [
+            ([e["contains"]] if isinstance(e["contains"], str) else e["contains"], e["output"])
+            for e in entries
+            if "contains" in e
+        ]
+        self.default_output = default_output
+
+    @classmethod
+    def load(cls, path, default_output: str = "<stub/>") -> "StubResponses":
+        entries = []
+        for number, line in enumerate(Path(path).read_text().splitlines(), 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid stub entry: {e}")
+        cls.logger.info(f"Loaded {len(entries)} stub LM responses from {path}")
+        return cls(entries, default_output)
+
+    def respond(self, messages) -> str:
+        recorded = self.recorded.get(messages_key(messages))
+        if recorded is not None:
+            return recorded
+        text = "\n".join(str(m.get("content", "")) for m in messages or ())
+        output = next(
+            (output for contains, output in self.rules if all(c in text for c in contains)),
+            self.default_output,
+        )
+        # DSPy's chat adapter reads the fields from these markers
+        return f"[[ ## output ## ]]\n{output}\n\n[[ ## completed ## ]]"
+
+
+class StubLM(dspy.LM):
+    """
+    Offline stand-in for the model server: answers DSPy calls from
+    `responses` after `latency` seconds (+/- up to `jitter`), so the dynamic
+    engine and artifact generation run deterministically without a model.
+    """
+
+    def __init__(
+        self,
+        responses: Optional[StubResponses] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+    ):
+        super().__init__("openai/stub", cache=False)
+        self.responses = responses or StubResponses()
+        self.latency = latency
+        self.jitter = jitter
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        time.sleep(stub_delay(self.latency, self.jitter))
+        return self.__response(messages)
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        await asyncio.sleep(stub_delay(self.latency, self.jitter))
+        response = self.__response(messages)
+        record_usage(self.model, response)
+        return response
+
+    def __response(self, messages) -> ModelResponse:
+        content = self.responses.respond(messages)
+        prompt_tokens = estimate_tokens("".join(str(m.get("content", "")) for m in messages or ()))
+        completion_tokens = estimate_tokens(content)
+        return ModelResponse(
+            choices=[{"message": {"role": "assistant", "content": content}}],
+            usage={
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+            model=self.model,
+        )
+
+
+class RecordingLM(dspy.LM):
+    """
+    A regular LM that appends every completion to `record_to` in the
+    `StubResponses` format, to be replayed later by the stub.
+    """
+
+    def __init__(self, model: str, record_to, **kwargs):
+        super().__init__(model, **kwargs)
+        self.record_to = Path(record_to)
+        self._lock = threading.Lock()
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        response = super().forward(prompt=prompt, messages=messages, **kwargs)
+        self.__record(messages, response)
+        return response
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        response = await super().aforward(prompt=prompt, messages=messages, **kwargs)
+        self.__record(messages, response)
+        return response
+
+    def __record(self, messages, response) -> None:
+        entry = {
+            "key": messages_key(messages),
+            "response": response.choices[0].message.content,
+        }
+        with self._lock, self.record_to.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def stub_delay(latency: float, jitter: float) -> float:
+    return max(0.0, latency + random.uniform(-jitter, jitter))
+
+
+class StubLMServer(ThreadingHTTPServer):
+    """
+    OpenAI-compatible `/v1/chat/completions` server answering from
+    `responses`, for running the app (or other services) against a local,
+    deterministic model.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, responses: StubResponses, latency: float = 0.0, jitter: float = 0.0):
+        super().__init__(address, _StubLMHandler)
+        self.responses = responses
+        self.latency = latency
+        self.jitter = jitter
+
+
+class _StubLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            return self.__send(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+        self.__send(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self.__send(404, {"error": {"message": f"Unknown path {self.path}"}})
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError as e:
+            return self.__send(400, {"error": {"message": f"Invalid JSON: {e}"}})
+
+        time.sleep(stub_delay(self.server.latency, self.server.jitter))
+        messages = request.get("messages", [])
+        content = self.server.responses.respond(messages)
+        prompt_tokens = estimate_tokens("".join(str(m.get("content", "")) for m in messages))
+        completion_tokens = estimate_tokens(content)
+        self.__send(
+            200,
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+    def log_message(self, format, *args):
+        self.logger.debug(format % args)
+
+    def __send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
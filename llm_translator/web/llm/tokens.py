@@ -0,0 +1,3 @@
+def estimate_tokens(text: str) -> int:
+    """Rough token count of `text` (~4 characters per token), used for budgets."""
+    return len(text) // 4
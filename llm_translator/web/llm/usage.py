@@ -0,0 +1,30 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from dspy.utils.usage_tracker import UsageTracker
+
+# DSPy keeps its usage tracker in thread-local settings, which every coroutine
+# on an event loop shares. A context variable is copied per asyncio task, so
+# concurrent async calls each count only their own LM responses.
+_tracker: ContextVar[Optional[UsageTracker]] = ContextVar("lm_usage_tracker", default=None)
+
+
+@contextmanager
+def track_async_usage():
+    """Tracks the usage of the LM responses recorded in this context."""
+    tracker = UsageTracker()
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+def record_usage(model: str, response) -> None:
+    """Adds the usage of an LM response to the tracker of the current context, if any."""
+    tracker = _tracker.get()
+    if tracker is None or getattr(response, "cache_hit", False):
+        return
+    usage = getattr(response, "usage", None)
+    if usage:
+        tracker.add_usage(model, dict(usage))
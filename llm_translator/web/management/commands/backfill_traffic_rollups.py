@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from web.traffic import minute_of, rebuild_rollups, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild per-minute traffic rollups from the translation events and "
+        "reconcile the endpoints' success/failure counters"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="ISO datetime of the first minute to rebuild")
+        parser.add_argument(
+            "--until",
+            help="ISO datetime the rebuild stops at (exclusive), defaults to the current minute",
+        )
+        parser.add_argument("--endpoint", help="Only rebuild this endpoint's rollups")
+
+    def handle(self, *args, **options):
+        since = self.__parse(options["since"], "since")
+        # The current minute is still being written to by the event sink
+        until = self.__parse(options["until"], "until") or minute_of(timezone.now())
+
+        written = rebuild_rollups(since=since, until=until, endpoint_id=options["endpoint"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} traffic rollup buckets"))
+        reconcile_counters(endpoint_id=options["endpoint"])
+        self.stdout.write(self.style.SUCCESS("Reconciled endpoint counters"))
+
+    def __parse(self, value, name):
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if not parsed:
+            raise CommandError(f"--{name} must be an ISO 8601 datetime")
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
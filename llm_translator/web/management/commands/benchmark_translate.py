@@ -0,0 +1,101 @@
+import json
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from web.benchmark import (
+    BenchmarkScenario,
+    TranslateBenchmark,
+    compare_results,
+    results_document,
+)
+from web.constants import EngineOptions
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark /api/translate for the compiled and dynamic engines at the given "
+        "concurrency levels and payload sizes, and write the results as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--engines",
+            default=f"{EngineOptions.COMPILED_ARTIFACT.value},{EngineOptions.DYNAMIC.value}",
+            help="Comma separated engines to benchmark",
+        )
+        parser.add_argument("--concurrency", type=_int_list, default=[1, 8], help="e.g. 1,8,32")
+        parser.add_argument("--payload-bytes", type=_int_list, default=[1024, 65536], help="e.g. 1024,65536")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario")
+        parser.add_argument(
+            "--lm-latency", type=float, default=0.05, help="Stub LM latency in seconds (dynamic engine)"
+        )
+        parser.add_argument("--lm-jitter", type=float, default=0.0, help="Stub LM latency jitter in seconds")
+        parser.add_argument(
+            "--url",
+            help="Benchmark a running server (e.g. http://localhost:8000) instead of in-process. "
+            "It must share this database; its dynamic engine uses its own LM",
+        )
+        parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results")
+        parser.add_argument("--baseline", help="Results JSON of a previous run to compare against")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.2,
+            help="Fail when p95 grows or throughput drops by more than this fraction of the baseline",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            engines = [EngineOptions(e) for e in options["engines"].split(",") if e]
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        scenarios = [
+            BenchmarkScenario(
+                engine=engine,
+                concurrency=concurrency,
+                payload_bytes=payload_bytes,
+                requests=options["requests"],
+                warmup=options["warmup"],
+            )
+            for engine in engines
+            for concurrency in options["concurrency"]
+            for payload_bytes in options["payload_bytes"]
+        ]
+
+        benchmark = TranslateBenchmark(
+            url=options["url"], lm_latency=options["lm_latency"], lm_jitter=options["lm_jitter"]
+        )
+        benchmark.setup()
+        results = []
+        try:
+            for scenario in scenarios:
+                result = benchmark.run(scenario)
+                results.append(result)
+                self.stdout.write(
+                    f"{result.scenario:<32} {result.throughput:>9.1f} req/s  "
+                    f"p50 {result.latency['p50'] * 1000:>8.2f}ms  "
+                    f"p95 {result.latency['p95'] * 1000:>8.2f}ms  "
+                    f"p99 {result.latency['p99'] * 1000:>8.2f}ms  "
+                    f"{result.errors} errors"
+                )
+        finally:
+            benchmark.teardown()
+
+        document = results_document(benchmark, results)
+        Path(options["output"]).write_text(json.dumps(document, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}"))
+
+        if any(r.errors for r in results):
+            raise CommandError("Some benchmark requests failed, see the errors column")
+
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())["results"]
+            regressions = compare_results(document["results"], baseline, options["max_regression"])
+            if regressions:
+                raise CommandError("Regressions against baseline:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
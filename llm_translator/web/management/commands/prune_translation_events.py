@@ -0,0 +1,43 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from web.partitions import ensure_partitions, is_partitioned, prune_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Drop translation events older than the retention period and, on "
+        "PostgreSQL, create the upcoming event partitions. Run it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=getattr(settings, "TRANSLATION_EVENT_RETENTION", {}).get("DAYS", 90),
+            help="Keep events from the last N days",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be removed without removing it",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["retention_days"])
+
+        if is_partitioned() and not options["dry_run"]:
+            created = ensure_partitions()
+            self.stdout.write(self.style.SUCCESS(f"Created {len(created)} event partitions"))
+
+        result = prune_events(cutoff, dry_run=options["dry_run"])
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} events before {cutoff.isoformat()}: "
+                f"{len(result['dropped_partitions'])} partitions "
+                f"({', '.join(result['dropped_partitions']) or 'none'}), "
+                f"{result['deleted_rows']} rows, {result['deleted_payloads']} payloads"
+            )
+        )
@@ -0,0 +1,31 @@
+import signal
+from django.core.management.base import BaseCommand
+from web.jobs import JobWorker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued artifact generation and test run jobs. Start as many workers "
+        "as needed; SIGTERM stops a worker after its current job"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+        parser.add_argument("--max-jobs", type=int, help="Exit after running this many jobs")
+        parser.add_argument("--poll-interval", type=float, help="Seconds between queue polls")
+        parser.add_argument("--name", help="Worker name recorded on its jobs, defaults to host:pid")
+
+    def handle(self, *args, **options):
+        worker = JobWorker(name=options["name"], poll_interval=options["poll_interval"])
+        signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+        self.stdout.write(self.style.SUCCESS(f"Job worker {worker.name} started"))
+        try:
+            processed = worker.run(max_jobs=options["max_jobs"], once=options["once"])
+        except KeyboardInterrupt:
+            processed = None
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Job worker {worker.name} stopped"
+                + (f" after {processed} jobs" if processed is not None else "")
+            )
+        )
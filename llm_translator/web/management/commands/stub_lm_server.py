@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from web.llm.stub import StubLMServer, StubResponses
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve an OpenAI-compatible stub model on /v1/chat/completions that replays "
+        "recorded responses, for offline and load testing"
+    )
+
+    def add_arguments(self, parser):
+        stub = getattr(settings, "LLM_PROVIDER", {}).get("STUB", {})
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8080)
+        parser.add_argument(
+            "--recordings",
+            default=stub.get("RECORDINGS"),
+            help="JSONL file of recorded responses and rules, see web.llm.stub.StubResponses",
+        )
+        parser.add_argument("--latency", type=float, default=stub.get("LATENCY", 0.0), help="Seconds per response")
+        parser.add_argument("--jitter", type=float, default=stub.get("JITTER", 0.0), help="+/- seconds of latency")
+        parser.add_argument("--default-output", default=stub.get("DEFAULT_OUTPUT", "<stub/>"))
+
+    def handle(self, *args, **options):
+        responses = (
+            StubResponses.load(options["recordings"], options["default_output"])
+            if options["recordings"]
+            else StubResponses(default_output=options["default_output"])
+        )
+        server = StubLMServer(
+            (options["host"], options["port"]),
+            responses,
+            latency=options["latency"],
+            jitter=options["jitter"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stub LM listening on http://{options['host']}:{options['port']}/v1 "
+                f"({len(responses.recorded)} recorded responses, {len(responses.rules)} rules)"
+            )
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
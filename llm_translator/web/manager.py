@@ -1,12 +1,15 @@
+import time
 import traceback
-import uuid
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 import logging
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
 from .constants import TranslationTestCaseStatus, EngineOptions
 from .models import (
-    TranslationEndpoint,
     TranslationEvent,
     TranslationEventStatus,
     TranslationArtifact,
@@ -14,12 +17,17 @@ from .models import (
     SpecTestCase,
     SpecTestCaseExecution,
 )
+from .events import event_sink
+from .metrics import observe_stage, request_seconds, route_labels
 from .translator.service import TranslatorService
-from .translator.models import TranslationContext
+from .translator.routing import ResolvedRoute, routing_table
+from .translator.models import TranslationContext, TranslatedContext
 from .translator.executors import CompiledArtifactTranslatorExecutor
-from .translator.artifact import TranslationArtifactGenerator
+from .translator.artifact import ArtifactCandidate, TranslationArtifactGenerator, save_artifact
+from .translator.generation_cache import artifact_generation_cache, generation_key
+from .translator.repair import ArtifactRepairer, RepairAttempt
 from .schemas import SpecTestCaseDefinitionSchema, TranslationSpecDefinitionSchema
-from .excpetions import ArtifcatGenerationException
+from .excpetions import ArtifcatGenerationException, TranslationException
 
 
 @dataclass
@@ -38,6 +46,35 @@ class TranslationResponse:
     duration: float
 
 
+@dataclass
+class BatchTranslationRequest:
+    endpoint_id: str
+    content_type: Optional[str]
+    items: list[bytes]
+
+
+@dataclass
+class StreamTranslationRequest:
+    endpoint_id: str
+    content_type: Optional[str]
+    records: Iterable[bytes]
+
+
+@dataclass
+class StreamTranslationResponse:
+    success: bool
+    message: str
+    results: Iterator[TranslationResponse] = field(default_factory=lambda: iter(()))
+
+
+@dataclass
+class BatchTranslationResponse:
+    success: bool
+    message: str
+    duration: float
+    results: list[TranslationResponse] = field(default_factory=list)
+
+
 class TranslationManager:
 
     logger = logging.getLogger(f"llm_translator.{__name__}")
@@ -45,92 +82,320 @@ class TranslationManager:
     def handle(self, request: TranslationRequest) -> TranslationResponse:
         self.logger.info(f"Handling request for endpoint {request.endpoint_id}")
         start_at = datetime.now()
-        time_taken = 0
-        status = TranslationEventStatus.SUCCESS
-        endpoint = self.__find_endpoint(request.endpoint_id)
-        translated = None
+        started = time.perf_counter()
+        route = routing_table.resolve(request.endpoint_id)
+        labels = route_labels(route)
+        observe_stage("resolve", started, **labels)
+        if not route:
+            return self.__not_found(request)
 
-        if not endpoint:
-            msg = f"Endpoint {request.endpoint_id} not found"
-            self.logger.error(msg)
-            status = TranslationEventStatus.FAILURE
-            return TranslationResponse(
-                success=False,
-                message=msg,
-                content_type=None,
-                body=bytes(),
-                duration=time_taken,
+        translated = None
+        try:
+            context = TranslationContext(
+                endpoint=route.endpoint,
+                content_type=request.content_type,
+                body=request.body,
             )
+            translated = TranslatorService(context, route).translate()
+            response = self.__success(translated, start_at)
+        except Exception as e:
+            response = self.__failure(e, start_at)
+
+        emit_started = time.perf_counter()
+        event_sink.emit(self.__event(request, route, response, translated))
+        observe_stage("event_emit", emit_started, **labels)
+        self.__observe_request(response, started, labels)
+        return response
 
+    async def ahandle(self, request: TranslationRequest) -> TranslationResponse:
+        self.logger.info(f"Handling async request for endpoint {request.endpoint_id}")
+        start_at = datetime.now()
+        started = time.perf_counter()
+        route = await routing_table.aresolve(request.endpoint_id)
+        labels = route_labels(route)
+        observe_stage("resolve", started, **labels)
+        if not route:
+            return self.__not_found(request)
+
+        translated = None
         try:
             context = TranslationContext(
-                endpoint=endpoint, content_type=request.content_type, body=request.body
+                endpoint=route.endpoint,
+                content_type=request.content_type,
+                body=request.body,
             )
-            translated = TranslatorService(context).translate()
+            translated = await TranslatorService(context, route).atranslate()
+            response = self.__success(translated, start_at)
+        except Exception as e:
+            response = self.__failure(e, start_at)
 
-            time_taken = (datetime.now() - start_at).total_seconds()
-            status = TranslationEventStatus.SUCCESS
+        emit_started = time.perf_counter()
+        await event_sink.aemit(
+            self.__event(request, route, response, translated)
+        )
+        observe_stage("event_emit", emit_started, **labels)
+        self.__observe_request(response, started, labels)
+        return response
+
+    def handle_batch(self, request: BatchTranslationRequest) -> BatchTranslationResponse:
+        """
+        Translates every item of a batch with the endpoint's active spec. The
+        route is resolved once; compiled artifacts run in a plain loop and the
+        dynamic engine fans out to at most `TRANSLATION_BATCH["MAX_PARALLELISM"]`
+        concurrent LLM calls. Results keep the input order and all events are
+        recorded with a single sink call.
+        """
+        self.logger.info(
+            f"Handling batch of {len(request.items)} items for endpoint {request.endpoint_id}"
+        )
+        start_at = datetime.now()
+        route = routing_table.resolve(request.endpoint_id)
+        if not route:
+            not_found = self.__not_found(request)
+            return BatchTranslationResponse(
+                success=False, message=not_found.message, duration=0
+            )
 
-            response = TranslationResponse(
-                content_type=translated.content_type,
-                body=translated.body,
-                duration=time_taken,
-                success=True,
-                message="Success",
+        try:
+            engine = route.spec_definition.engine
+            content_type = request.content_type or route.spec_definition.input_rule.content_type
+        except Exception:
+            # Missing/invalid active spec: every item fails with the service error
+            engine = None
+            content_type = request.content_type
+
+        item_requests = [
+            TranslationRequest(
+                endpoint_id=request.endpoint_id, content_type=content_type, body=body
             )
+            for body in request.items
+        ]
+
+        def translate_item(item: TranslationRequest):
+            item_start_at = datetime.now()
+            try:
+                context = TranslationContext(
+                    endpoint=route.endpoint,
+                    content_type=item.content_type,
+                    body=item.body,
+                )
+                translated = TranslatorService(context, route).translate()
+                return self.__success(translated, item_start_at, log=False), translated
+            except Exception as e:
+                return self.__failure(e, item_start_at, log=False), None
+
+        def translate_item_in_pool(item: TranslationRequest):
+            try:
+                return translate_item(item)
+            finally:
+                connections.close_all()
+
+        parallelism = getattr(settings, "TRANSLATION_BATCH", {}).get("MAX_PARALLELISM", 8)
+        if engine == EngineOptions.DYNAMIC and parallelism > 1 and len(item_requests) > 1:
+            with ThreadPoolExecutor(max_workers=parallelism) as pool:
+                outcomes = list(pool.map(translate_item_in_pool, item_requests))
+        else:
+            outcomes = [translate_item(item) for item in item_requests]
+
+        event_sink.emit_many(
+            [
+                self.__event(item, route, response, translated)
+                for item, (response, translated) in zip(item_requests, outcomes)
+            ]
+        )
+
+        results = [response for response, _ in outcomes]
+        failed = sum(1 for r in results if not r.success)
+        time_taken = (datetime.now() - start_at).total_seconds()
+        self.logger.info(
+            f"Batch of {len(results)} items handled in {time_taken} seconds, {failed} failed"
+        )
+        return BatchTranslationResponse(
+            success=failed == 0,
+            message="Success" if not failed else f"{failed} of {len(results)} items failed",
+            duration=time_taken,
+            results=results,
+        )
+
+    def handle_stream(self, request: StreamTranslationRequest) -> StreamTranslationResponse:
+        """
+        Translates records as they are read from `request.records` with the
+        active spec's compiled artifact. Results are produced lazily, so memory
+        stays flat regardless of payload size; a single summary event (without
+        payloads) is recorded once the stream is consumed.
+        """
+        self.logger.info(f"Handling stream for endpoint {request.endpoint_id}")
+        route = routing_table.resolve(request.endpoint_id)
+        if not route:
+            not_found = self.__not_found(request)
+            return StreamTranslationResponse(success=False, message=not_found.message)
+
+        try:
+            if route.spec_definition.engine != EngineOptions.COMPILED_ARTIFACT:
+                raise TranslationException(
+                    "Streaming is only supported for specs with compiled artifacts"
+                )
+            output_content_type = route.spec_definition.output_rule.content_type
+            translate = CompiledArtifactTranslatorExecutor(
+                TranslationContext(
+                    endpoint=route.endpoint,
+                    content_type=request.content_type,
+                    body=bytes(),
+                ),
+                route.spec,
+                route.spec_definition,
+                artifact=route.artifact,
+            ).load_translate()
         except Exception as e:
-            time_taken = (datetime.now() - start_at).total_seconds()
             msg = f"Error handling translation request: {e}"
             self.logger.error(msg)
-            status = TranslationEventStatus.FAILURE
-            response = TranslationResponse(
-                success=False,
-                message=msg,
-                content_type=None,
-                body=bytes(),
-                duration=time_taken,
-            )
-        finally:
+            return StreamTranslationResponse(success=False, message=msg)
+
+        def results() -> Iterator[TranslationResponse]:
+            start_at = datetime.now()
+            total = failed = 0
+            error = None
+            try:
+                for record in request.records:
+                    total += 1
+                    record_start_at = datetime.now()
+                    try:
+                        translated = TranslatedContext(
+                            content_type=output_content_type,
+                            body=translate(record),
+                            provider=EngineOptions.COMPILED_ARTIFACT,
+                        )
+                        yield self.__success(translated, record_start_at, log=False)
+                    except Exception as e:
+                        failed += 1
+                        yield self.__failure(e, record_start_at, log=False)
+            except Exception as e:
+                # Malformed input: stop here and report it as the last result
+                error = e
+                yield self.__failure(e, start_at, log=False)
+            finally:
+                time_taken = (datetime.now() - start_at).total_seconds()
+                self.logger.info(
+                    f"Stream of {total} records handled in {time_taken} seconds, {failed} failed"
+                )
+                success = not failed and not error
+                event_sink.emit(
+                    TranslationEvent(
+                        status=(
+                            TranslationEventStatus.SUCCESS
+                            if success
+                            else TranslationEventStatus.FAILURE
+                        ),
+                        context={
+                            "duration": time_taken,
+                            "request": {
+                                "content_type": request.content_type,
+                                "mode": "stream",
+                                "records": total,
+                                "failed": failed,
+                                "error": str(error) if error else None,
+                            },
+                        },
+                        endpoint=route.endpoint,
+                    )
+                )
+
+        return StreamTranslationResponse(
+            success=True, message="Success", results=results()
+        )
+
+    def __observe_request(
+        self, response: TranslationResponse, started: float, labels: dict
+    ) -> None:
+        request_seconds.observe(
+            time.perf_counter() - started,
+            status="success" if response.success else "failure",
+            **labels,
+        )
+
+    def __not_found(self, request: TranslationRequest) -> TranslationResponse:
+        msg = f"Endpoint {request.endpoint_id} not found"
+        self.logger.error(msg)
+        return TranslationResponse(
+            success=False,
+            message=msg,
+            content_type=None,
+            body=bytes(),
+            duration=0,
+        )
+
+    def __success(
+        self, translated: TranslatedContext, start_at: datetime, log: bool = True
+    ) -> TranslationResponse:
+        time_taken = (datetime.now() - start_at).total_seconds()
+        if log:
             self.logger.info(f"Request handled in {time_taken} seconds")
+        return TranslationResponse(
+            content_type=translated.content_type,
+            body=translated.body,
+            duration=time_taken,
+            success=True,
+            message="Success",
+        )
 
-            ctx = {
-                "duration": time_taken,
-                "request": {
-                    "content_type": request.content_type,
-                    "body": request.body.decode(),
-                },
-            }
+    def __failure(
+        self, error: Exception, start_at: datetime, log: bool = True
+    ) -> TranslationResponse:
+        time_taken = (datetime.now() - start_at).total_seconds()
+        msg = f"Error handling translation request: {error}"
+        self.logger.error(msg)
+        if log:
+            self.logger.info(f"Request handled in {time_taken} seconds")
+        return TranslationResponse(
+            success=False,
+            message=msg,
+            content_type=None,
+            body=bytes(),
+            duration=time_taken,
+        )
 
-            if translated:
-                ctx.update(
-                    {
-                        "translated": {
-                            "content_type": translated.content_type,
-                            "body": str(translated.body),
-                            "provider": translated.provider,
-                        }
+    def __event(
+        self,
+        request: TranslationRequest,
+        route: ResolvedRoute,
+        response: TranslationResponse,
+        translated: Optional[TranslatedContext],
+    ) -> TranslationEvent:
+        status = (
+            TranslationEventStatus.SUCCESS
+            if response.success
+            else TranslationEventStatus.FAILURE
+        )
+        event = TranslationEvent(status=status, endpoint=route.endpoint)
+        payloads = {"request": (request.content_type, request.body)}
+        if translated:
+            payloads["translated"] = (translated.content_type, translated.body)
+        captured = route.payload_capture.capture(event, payloads)
+
+        ctx = {
+            "duration": response.duration,
+            "request": captured["request"],
+        }
+
+        if translated:
+            ctx.update(
+                {
+                    "translated": {
+                        **captured["translated"],
+                        "provider": translated.provider,
+                        "cache": translated.cache,
                     }
-                )
-
-            TranslationEvent.objects.create(
-                status=status, context=ctx, endpoint=endpoint
+                }
             )
-            return response
 
-    def __find_endpoint(self, endpoint_id: str) -> TranslationEndpoint:
-        try:
-            uuid.UUID(endpoint_id)
-            return TranslationEndpoint.objects.get(uuid=endpoint_id)
-        except (ValueError, TranslationEndpoint.DoesNotExist):
-            try:
-                return TranslationEndpoint.objects.get(key=endpoint_id)
-            except TranslationEndpoint.DoesNotExist:
-                return None
+        event.context = ctx
+        return event
 
 
 @dataclass
 class ArtifactGenerationRequest:
     spec_id: str
+    candidates: Optional[int] = None
 
 
 @dataclass
@@ -142,17 +407,32 @@ class ArtifactGenerationResponse:
     message: Optional[str] = None
     stacktrace: Optional[str] = None
     artifact: Optional[TranslationArtifact] = None
+    candidates: Optional[list[ArtifactCandidate]] = None
+    repairs: Optional[list[RepairAttempt]] = None
 
 
 class ArtifactGeneratorManager:
 
     logger = logging.getLogger(f"llm_translator.{__name__}")
 
-    def handle(self, request: ArtifactGenerationRequest) -> ArtifactGenerationResponse:
+    def handle(
+        self,
+        request: ArtifactGenerationRequest,
+        progress: Optional[Callable[..., None]] = None,
+    ) -> ArtifactGenerationResponse:
+        """
+        `progress(stage, done=0, total=0)` is called as generation and the test
+        run advance, e.g. to report it on a TranslationJob.
+        """
+        progress = progress or (lambda stage, done=0, total=0: None)
         try:
             spec = TranslationSpec.objects.get(uuid=request.spec_id)
             spec_test_cases = SpecTestCase.objects.filter(spec=spec)
             artifact = TranslationArtifact.objects.filter(spec=spec).first()
+            candidates = None
+            repairs = None
+            # Whether an implementation was generated or repaired by this call
+            produced = False
 
             try:
                 latest_test_case = spec_test_cases.latest("updated_at")
@@ -168,16 +448,33 @@ class ArtifactGeneratorManager:
                 f"Artifact updated at: {artifact.updated_at if artifact else None}"
             )
 
-            artifact_is_outdated = (
-                artifact and latest_test_case.updated_at > artifact.updated_at
+            key = generation_key(
+                TranslationSpecDefinitionSchema(**spec.definition), spec_test_cases
             )
+            if artifact and artifact.generation_key:
+                # Only a change of the generation inputs makes the artifact outdated
+                artifact_is_outdated = artifact.generation_key != key
+            else:
+                artifact_is_outdated = (
+                    artifact and latest_test_case.updated_at > artifact.updated_at
+                )
 
             try:
                 if not artifact or artifact_is_outdated:
-                    self.logger.info(
-                        "No artificat found or outdated, generating new artifact"
-                    )
-                    artifact = TranslationArtifactGenerator(spec).generate()
+                    cached = artifact_generation_cache.get(key)
+                    if cached is not None:
+                        artifact = save_artifact(spec, cached, key)
+                    else:
+                        self.logger.info(
+                            "No artificat found or outdated, generating new artifact"
+                        )
+                        progress("generating")
+                        generator = TranslationArtifactGenerator(
+                            spec, candidates=request.candidates, generation_key=key
+                        )
+                        artifact = generator.generate()
+                        candidates = generator.evaluated
+                        produced = True
             except Exception as e:
                 raise ArtifcatGenerationException(f"Error generating artifact: {e}")
 
@@ -186,7 +483,21 @@ class ArtifactGeneratorManager:
                     f"No artifact found for spec {spec.name}"
                 )
             
-            exec_response = SpecTestCaseExecutor(spec).run_all()
+            exec_response = SpecTestCaseExecutor(spec).run_all(
+                progress=lambda done, total: progress("testing", done, total)
+            )
+            if not exec_response.success:
+                progress("repairing")
+                repairer = ArtifactRepairer(spec)
+                repairs = repairer.attempts
+                if repairer.repair(artifact):
+                    produced = True
+                    # Tested against the current cases, so it answers this key
+                    artifact.generation_key = key
+                    artifact.save(update_fields=["generation_key", "updated_at"])
+                    exec_response = SpecTestCaseExecutor(spec).run_all(
+                        progress=lambda done, total: progress("testing", done, total)
+                    )
             executions = exec_response.executions
             failed_test_cases = [
                 exec.test_case
@@ -194,6 +505,9 @@ class ArtifactGeneratorManager:
                 if exec.status == TranslationTestCaseStatus.FAILURE
             ]
             it_passed_all_test_cases = exec_response.success
+            if it_passed_all_test_cases and produced:
+                # A new or repaired implementation that passes is reusable
+                artifact_generation_cache.put(key, artifact.implementation_str)
 
             return ArtifactGenerationResponse(
                 success=True,
@@ -202,6 +516,8 @@ class ArtifactGeneratorManager:
                 failed_test_cases=failed_test_cases,
                 message=None,
                 artifact=artifact,
+                candidates=candidates,
+                repairs=repairs,
             )
         except ArtifcatGenerationException as e:
             stacktrace = traceback.format_exc()
@@ -239,51 +555,184 @@ class SpecTestCaseExecutor:
 
     logger = logging.getLogger(f"llm_translator.{__name__}")
 
-    def __init__(self, spec: TranslationSpec):
+    def __init__(
+        self,
+        spec: TranslationSpec,
+        parallelism: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
         self.spec = spec
         self.spec_def = TranslationSpecDefinitionSchema(**spec.definition)
+        config = getattr(settings, "SPEC_TEST_CASES", {})
+        self.parallelism = parallelism or config.get("PARALLELISM", 8)
+        self.timeout = timeout or config.get("TIMEOUT", 10)
+        self.artifact = None
 
         if self.spec_def.engine != EngineOptions.COMPILED_ARTIFACT:
             raise ValueError(
                 "SpecTestCaseExecutor only supported for specs with compiled artifacts"
             )
 
-    def run_all(self) -> SpecTestCaseExecutionResponse:
-        self.test_cases = SpecTestCase.objects.filter(spec=self.spec)
-        is_success = True
-        executions = []
-        for tc in self.test_cases:
-            execution = self.__run_test_case(tc)
-            if execution.status != TranslationTestCaseStatus.SUCCESS:
-                is_success = False
-            executions.append(execution)
+    def run_all(
+        self, progress: Optional[Callable[[int, int], None]] = None
+    ) -> SpecTestCaseExecutionResponse:
+        """
+        Runs every test case of the spec. The artifact is loaded and compiled
+        once; cases run concurrently on up to `parallelism` threads, each
+        bounded by `timeout` seconds, and the executions and test case statuses
+        are written with bulk queries. `progress(done, total)` is called from
+        the calling thread as cases finish.
+        """
+        self.test_cases = list(SpecTestCase.objects.filter(spec=self.spec))
+        self.artifact = TranslationArtifact.objects.filter(spec=self.spec).first()
+        # Everything the cases need is loaded here; worker threads (including
+        # ones left behind by a timeout) must not open connections of their own
+        self.translate = self.__load_translate()
+        self.progress = progress or (lambda done, total: None)
+
+        if self.parallelism > 1 and len(self.test_cases) > 1:
+            executions = self.__run_concurrently(self.test_cases)
+        else:
+            executions = []
+            for test_case in self.test_cases:
+                executions.append(self.__run_test_case(test_case))
+                self.progress(len(executions), len(self.test_cases))
+        self.__save_executions(executions)
 
         return SpecTestCaseExecutionResponse(
-            success=is_success,
+            success=all(
+                execution.status == TranslationTestCaseStatus.SUCCESS
+                for execution in executions
+            ),
             executions=executions,
         )
 
     def run(self, test_case: SpecTestCase) -> SpecTestCaseExecutionResponse:
+        self.translate = self.__load_translate()
         execution = self.__run_test_case(test_case)
+        execution.save()
         return SpecTestCaseExecutionResponse(
             success=execution.status == TranslationTestCaseStatus.SUCCESS,
             executions=[test_case],
         )
 
+    def __load_translate(self) -> Callable[[bytes], bytes]:
+        # Loaded on the calling thread, before any fan-out, so the artifact is
+        # compiled once and worker threads never touch the database
+        context = TranslationContext(
+            endpoint=self.spec.endpoint,
+            content_type=self.spec_def.input_rule.content_type,
+            body=b"",
+        )
+        try:
+            return CompiledArtifactTranslatorExecutor(
+                context, self.spec, self.spec_def, artifact=self.artifact
+            ).load_translate()
+        except Exception as e:
+            error = e
+
+            # Every test case fails with the loading error
+            def translate(body: bytes) -> bytes:
+                raise error
+
+            return translate
+
+    def __run_concurrently(
+        self, test_cases: list[SpecTestCase]
+    ) -> list[SpecTestCaseExecution]:
+        pending = list(reversed(test_cases))
+        running = {}
+        executions = {}
+        pool = ThreadPoolExecutor(max_workers=self.parallelism)
+        try:
+            while pending or running:
+                # Only submit what can start right away, so a case's timeout
+                # is measured from when it actually starts running
+                while pending and len(running) < self.parallelism:
+                    test_case = pending.pop()
+                    future = pool.submit(self.__run_test_case_in_pool, test_case)
+                    running[future] = (test_case, time.monotonic())
+
+                next_deadline = min(started for _, started in running.values()) + self.timeout
+                done, _ = wait(
+                    running,
+                    timeout=max(next_deadline - time.monotonic(), 0),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    test_case, _ = running.pop(future)
+                    executions[test_case.pk] = future.result()
+                if done:
+                    self.progress(len(executions), len(test_cases))
+
+                now = time.monotonic()
+                expired = [
+                    future
+                    for future, (_, started) in running.items()
+                    if now - started >= self.timeout
+                ]
+                for future in expired:
+                    test_case, _ = running.pop(future)
+                    executions[test_case.pk] = self.__timed_out(test_case)
+                if expired:
+                    self.progress(len(executions), len(test_cases))
+                    # A thread stuck in an artifact cannot be stopped, leave it
+                    # behind and keep running the remaining cases on a new pool
+                    pool.shutdown(wait=False)
+                    pool = ThreadPoolExecutor(max_workers=self.parallelism)
+        finally:
+            pool.shutdown(wait=False)
+
+        return [executions[tc.pk] for tc in test_cases]
+
+    def __run_test_case_in_pool(self, test_case: SpecTestCase) -> SpecTestCaseExecution:
+        try:
+            return self.__run_test_case(test_case)
+        finally:
+            connections.close_all()
+
+    @transaction.atomic
+    def __save_executions(self, executions: list[SpecTestCaseExecution]) -> None:
+        # Bulk writes skip the post_save signal, so test cases are updated here
+        SpecTestCaseExecution.objects.bulk_create(executions)
+        updated_at = timezone.now()
+        test_cases = []
+        for execution in executions:
+            test_case = execution.test_case
+            test_case.executed_at = execution.executed_at
+            test_case.status = execution.status
+            test_case.updated_at = updated_at
+            test_cases.append(test_case)
+        SpecTestCase.objects.bulk_update(
+            test_cases, ["executed_at", "status", "updated_at"]
+        )
+
+    def __timed_out(self, test_case: SpecTestCase) -> SpecTestCaseExecution:
+        msg = f"Test case timed out after {self.timeout} seconds"
+        self.logger.error(f"Error running test case `{test_case.name}`: {msg}")
+        execution = SpecTestCaseExecution(
+            test_case=test_case,
+            executed_at=timezone.now(),
+            status=TranslationTestCaseStatus.FAILURE,
+            result={"message": msg},
+        )
+        self.__check_expectation(
+            execution, SpecTestCaseDefinitionSchema(**test_case.definition)
+        )
+        return execution
+
     def __run_test_case(self, test_case: SpecTestCase) -> SpecTestCaseExecution:
-        test_spec_def = SpecTestCaseDefinitionSchema(**test_case.definition)
+        tc_definition = SpecTestCaseDefinitionSchema(**test_case.definition)
         execution = SpecTestCaseExecution(
-            test_case=test_case, executed_at=datetime.now().isoformat()
+            test_case=test_case, executed_at=timezone.now()
         )
         try:
             self.logger.info(f"Running test case `{test_case.name}`")
-            tc_definition = SpecTestCaseDefinitionSchema(**test_case.definition)
-            context = TranslationContext(
-                endpoint=self.spec.endpoint,
-                content_type=self.spec_def.input_rule.content_type,
-                body=tc_definition.input.body.encode(),
+            translated = TranslatedContext(
+                content_type=self.spec_def.output_rule.content_type,
+                body=self.translate(tc_definition.input.body.encode()),
+                provider=EngineOptions.COMPILED_ARTIFACT,
             )
-            translated = CompiledArtifactTranslatorExecutor(context, self.spec).run()
 
             # Is translated body equals to test case's expected?
             status = TranslationTestCaseStatus.SUCCESS
@@ -301,7 +750,7 @@ class SpecTestCaseExecutor:
                 "message": message,
                 "translated": {
                     "content_type": translated.content_type,
-                    "body": translated.body.decode(),
+                    "body": translated_body_str,
                 },
                 "expectation": {
                     "body": tc_definition.expectation.body,
@@ -316,17 +765,19 @@ class SpecTestCaseExecutor:
                 "message": msg,
             }
         finally:
+            self.__check_expectation(execution, tc_definition)
 
-            # If the test case is expected to fail, it should be considered a success
-            if test_spec_def.expectation.result != execution.status:
-                msg = f"Test case is expected for `{test_spec_def.expectation.result}` but resulted in `{execution.status}`"
-                self.logger.info(msg)
-                execution.status = TranslationTestCaseStatus.FAILURE
-                execution.result = {
-                    **execution.result,
-                    "message": f"{msg}. Original message was: {execution.result['message']}",
-                }
-
-            execution.save()
-        
         return execution
+
+    def __check_expectation(
+        self, execution: SpecTestCaseExecution, tc_definition: SpecTestCaseDefinitionSchema
+    ) -> None:
+        # If the test case is expected to fail, it should be considered a success
+        if tc_definition.expectation.result != execution.status:
+            msg = f"Test case is expected for `{tc_definition.expectation.result}` but resulted in `{execution.status}`"
+            self.logger.info(msg)
+            execution.status = TranslationTestCaseStatus.FAILURE
+            execution.result = {
+                **execution.result,
+                "message": f"{msg}. Original message was: {execution.result['message']}",
+            }
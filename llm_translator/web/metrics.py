@@ -0,0 +1,265 @@
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from django.conf import settings
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _setting(name: str, default):
+    return getattr(settings, "TRANSLATION_METRICS", {}).get(name, default)
+
+
+def _label_value(value) -> str:
+    # str Enums (EngineOptions, ...) are exported by value
+    value = getattr(value, "value", value)
+    return "" if value is None else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(_label_value(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple, **extra) -> str:
+        pairs = [*zip(self.labelnames, key), *extra.items()]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError("method must be implemented")
+
+    def clear(self) -> None:
+        raise NotImplementedError("method must be implemented")
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not metrics.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._labels(key)} {value}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram of observations in seconds."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> ([count per bucket + overflow], sum)
+        self._series: dict[tuple, tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        if not metrics.enabled:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._series[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observes the wall time of the block, whether or not it raises."""
+        if not metrics.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket{self._labels(key, le=repr(float(bound)))} {cumulative}"
+            cumulative += counts[-1]
+            yield f"{self.name}_bucket{self._labels(key, le='+Inf')} {cumulative}"
+            yield f"{self.name}_sum{self._labels(key)} {total}"
+            yield f"{self.name}_count{self._labels(key)} {cumulative}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    Per-process registry rendered in the Prometheus text exposition format by
+    the /metrics view. Each server worker keeps its own values, so scrape every
+    worker (or run a single one) to get complete numbers.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+metrics = MetricsRegistry(enabled=_setting("ENABLED", True))
+
+_buckets = tuple(_setting("BUCKETS", DEFAULT_BUCKETS))
+
+request_seconds = metrics.register(
+    Histogram(
+        "translation_request_seconds",
+        "Time to handle a translation request, from route resolution to response.",
+        ("endpoint", "engine", "status"),
+        _buckets,
+    )
+)
+stage_seconds = metrics.register(
+    Histogram(
+        "translation_stage_seconds",
+        "Time spent per translation stage.",
+        ("stage", "endpoint", "engine"),
+        _buckets,
+    )
+)
+artifact_compile_seconds = metrics.register(
+    Histogram(
+        "translation_artifact_compile_seconds",
+        "Time to compile an artifact's source on a compiled artifact cache miss.",
+        buckets=_buckets,
+    )
+)
+event_write_seconds = metrics.register(
+    Histogram(
+        "translation_event_write_seconds",
+        "Time to write a batch of translation events, payloads and rollups.",
+        buckets=_buckets,
+    )
+)
+events_written = metrics.register(
+    Counter("translation_events_written_total", "Translation events written.")
+)
+llm_tokens = metrics.register(
+    Counter(
+        "translation_llm_tokens_total",
+        "LLM tokens used by the dynamic engine, as reported by the provider.",
+        ("endpoint", "lm", "kind"),
+    )
+)
+llm_backend_requests = metrics.register(
+    Counter(
+        "translation_llm_backend_requests_total",
+        "LM calls per pool backend and outcome (success, failure, rejected, busy).",
+        ("backend", "outcome"),
+    )
+)
+llm_backend_seconds = metrics.register(
+    Histogram(
+        "translation_llm_backend_seconds",
+        "Latency of successful LM calls per pool backend.",
+        ("backend",),
+        _buckets,
+    )
+)
+artifact_generation_cache_requests = metrics.register(
+    Counter(
+        "translation_artifact_generation_cache_requests_total",
+        "Artifact generation cache lookups by outcome (hit, miss).",
+        ("outcome",),
+    )
+)
+
+
+def route_labels(route) -> dict:
+    """Endpoint/engine labels of a ResolvedRoute (or of no route at all)."""
+    if not route:
+        return {"endpoint": "", "engine": ""}
+    specs = route.active_specs
+    return {
+        "endpoint": route.endpoint.key,
+        "engine": specs[0].definition.get("engine", "") if len(specs) == 1 else "",
+    }
+
+
+def observe_stage(stage: str, started: float, **labels) -> None:
+    """Observes the time since `started` (a perf_counter reading) for `stage`."""
+    stage_seconds.observe(time.perf_counter() - started, stage=stage, **labels)
+
+
+def record_lm_usage(endpoint: str, usage: Optional[dict]) -> None:
+    """Counts the tokens of a DSPy `lm -> usage` mapping."""
+    for lm, entry in (usage or {}).items():
+        for kind in ("prompt", "completion"):
+            tokens = entry.get(f"{kind}_tokens")
+            if tokens:
+                llm_tokens.inc(tokens, endpoint=endpoint, lm=lm, kind=kind)
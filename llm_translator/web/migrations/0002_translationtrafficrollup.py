@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:04
+
+import django.db.models.deletion
+import uuid
+import web.constants
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationTrafficRollup',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('minute', models.DateTimeField()),
+                ('status', models.CharField(choices=[(web.constants.TranslationEventStatus['SUCCESS'], web.constants.TranslationEventStatus['SUCCESS']), (web.constants.TranslationEventStatus['FAILURE'], web.constants.TranslationEventStatus['FAILURE'])], max_length=128)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('latency_sum', models.FloatField(default=0)),
+                ('latency_min', models.FloatField(blank=True, null=True)),
+                ('latency_max', models.FloatField(blank=True, null=True)),
+                ('endpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='web.translationendpoint')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('endpoint', 'minute', 'status'), name='unique_traffic_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_events(apps, schema_editor):
+    TranslationEndpoint = apps.get_model("web", "TranslationEndpoint")
+    TranslationEvent = apps.get_model("web", "TranslationEvent")
+    totals = (
+        TranslationEvent.objects.values("endpoint_id", "status")
+        .annotate(total=Count("uuid"))
+        .order_by()
+    )
+    for row in totals:
+        field = "success_count" if row["status"] == "SUCCESS" else "failure_count"
+        TranslationEndpoint.objects.filter(uuid=row["endpoint_id"]).update(
+            **{field: row["total"]}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0002_translationtrafficrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationendpoint',
+            name='failure_count',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='translationendpoint',
+            name='success_count',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:10
+
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import migrations, models
+
+# The partitioning SQL is inlined rather than imported from web.partitions, so
+# later changes to that module do not change what this migration does. Names
+# and bounds follow the same scheme, so web.partitions keeps managing them.
+TABLE = "web_translationevent"
+LEGACY_TABLE = "web_translationevent_legacy"
+
+
+def _partition_start(moment, interval):
+    moment = moment.astimezone(timezone.utc)
+    if interval == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_partition_start(start, interval):
+    if interval == "day":
+        return start + timedelta(days=1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def partition_events(apps, schema_editor):
+    """
+    Rebuilds web_translationevent as a table range-partitioned by created_at
+    and copies the existing rows into it. Only applies to PostgreSQL; the
+    copy rewrites the whole table, so run it in a maintenance window.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    retention = getattr(settings, "TRANSLATION_EVENT_RETENTION", {})
+    interval = retention.get("PARTITION_INTERVAL", "month")
+    ahead = retention.get("PARTITIONS_AHEAD", 3)
+
+    execute = schema_editor.execute
+    execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY_TABLE}"')
+    execute(f'ALTER TABLE "{LEGACY_TABLE}" RENAME CONSTRAINT "{TABLE}_pkey" TO "{LEGACY_TABLE}_pkey"')
+    execute(
+        f'CREATE TABLE "{TABLE}" (LIKE "{LEGACY_TABLE}" INCLUDING DEFAULTS) '
+        "PARTITION BY RANGE (created_at)"
+    )
+    # The partition key has to be part of the primary key
+    execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_pkey" PRIMARY KEY (uuid, created_at)')
+    execute(
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_endpoint_id_fk" '
+        'FOREIGN KEY (endpoint_id) REFERENCES "web_translationendpoint" (uuid) '
+        "DEFERRABLE INITIALLY DEFERRED"
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN(created_at) FROM "{LEGACY_TABLE}"')
+        oldest = cursor.fetchone()[0]
+    now = datetime.now(timezone.utc)
+    start = _partition_start(oldest or now, interval)
+    last = _partition_start(now, interval)
+    for _ in range(ahead):
+        last = _next_partition_start(last, interval)
+    while start <= last:
+        end = _next_partition_start(start, interval)
+        suffix = start.strftime("%Y%m%d" if interval == "day" else "%Y%m")
+        execute(
+            f'CREATE TABLE "{TABLE}_p{suffix}" PARTITION OF "{TABLE}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+    execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+    execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{LEGACY_TABLE}"')
+    execute(f'DROP TABLE "{LEGACY_TABLE}"')
+
+
+def unpartition_events(apps, schema_editor):
+    """Copies the events back into a plain table keyed by uuid."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    execute = schema_editor.execute
+    execute(f'CREATE TABLE "{LEGACY_TABLE}" (LIKE "{TABLE}" INCLUDING DEFAULTS)')
+    execute(f'INSERT INTO "{LEGACY_TABLE}" SELECT * FROM "{TABLE}"')
+    # Drops the partitions with it
+    execute(f'DROP TABLE "{TABLE}"')
+    execute(f'ALTER TABLE "{LEGACY_TABLE}" RENAME TO "{TABLE}"')
+    execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_pkey" PRIMARY KEY (uuid)')
+    execute(
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_endpoint_id_fk" '
+        'FOREIGN KEY (endpoint_id) REFERENCES "web_translationendpoint" (uuid) '
+        "DEFERRABLE INITIALLY DEFERRED"
+    )
+    execute(f'CREATE INDEX "{TABLE}_endpoint_id_idx" ON "{TABLE}" (endpoint_id)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0003_endpoint_event_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_events, unpartition_events),
+        migrations.AddIndex(
+            model_name='translationevent',
+            index=models.Index(fields=['endpoint', 'created_at', 'status'], name='web_event_endpoint_time_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:12
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0004_partition_translation_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationPayload',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event_id', models.UUIDField(db_index=True)),
+                ('kind', models.CharField(max_length=64)),
+                ('content_type', models.CharField(blank=True, max_length=256, null=True)),
+                ('encoding', models.CharField(default='zlib', max_length=32)),
+                ('size', models.PositiveIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('data', models.BinaryField()),
+                ('endpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='web.translationendpoint')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
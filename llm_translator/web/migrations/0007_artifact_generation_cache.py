@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:35
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0006_translationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtifactGenerationCacheEntry',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('implementation', models.BinaryField()),
+                ('model', models.CharField(max_length=256)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('last_hit_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='translationartifact',
+            name='generation_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
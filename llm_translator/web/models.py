@@ -1,8 +1,15 @@
 import uuid
+import zlib
 from django.db import models
 from django.db.models.base import Model
 from django.db.models import JSONField
-from .constants import TranslationEventStatus, TranslationArtifcatImplType, TranslationTestCaseStatus
+from .constants import (
+    JobKind,
+    JobStatus,
+    TranslationEventStatus,
+    TranslationArtifcatImplType,
+    TranslationTestCaseStatus,
+)
 class BaseModel(Model):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -34,17 +41,33 @@ class TranslationEndpoint(BaseModel):
     is_active = models.BooleanField(default=True)
     definition = JSONField()
     owner = models.ForeignKey(Account, on_delete=models.CASCADE)
+    # Maintained with the traffic rollups as events are written
+    success_count = models.PositiveBigIntegerField(default=0, editable=False)
+    failure_count = models.PositiveBigIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("success_count", "failure_count")
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        # The counters only change through F() updates (see web.traffic); an
+        # instance loaded earlier would otherwise write back stale values
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
     
     @property
     def total_success(self):
-        return TranslationEvent.objects.filter(endpoint=self, status=TranslationEventStatus.SUCCESS).count()
+        return self.success_count
     
     @property
     def total_failure(self):
-        return TranslationEvent.objects.filter(endpoint=self, status=TranslationEventStatus.FAILURE).count()
+        return self.failure_count
 
 class TranslationArtifact(BaseModel):
     spec = models.ForeignKey("TranslationSpec", on_delete=models.CASCADE)
@@ -54,10 +77,14 @@ class TranslationArtifact(BaseModel):
             (TranslationArtifcatImplType.PYTHON, TranslationArtifcatImplType.PYTHON), 
         ]
     )
+    # Hash of the generation inputs (see translator.generation_cache), null
+    # for artifacts generated before it was recorded
+    generation_key = models.CharField(max_length=64, null=True, blank=True)
 
     @property
     def implementation_str(self):
-        return self.implementation.tobytes().decode("utf-8")
+        # BinaryField is a memoryview on PostgreSQL and bytes on SQLite
+        return bytes(self.implementation).decode("utf-8")
     
     def __str__(self):
         return f"{self.spec.name} - {self.implementation_str}"
@@ -105,10 +132,122 @@ class TranslationEvent(BaseModel):
     context = JSONField()
     endpoint = models.ForeignKey(TranslationEndpoint, on_delete=models.CASCADE)
 
+    class Meta:
+        # On PostgreSQL the table is range-partitioned by created_at, see
+        # web.partitions and migration 0004
+        indexes = [
+            models.Index(
+                fields=["endpoint", "created_at", "status"],
+                name="web_event_endpoint_time_idx",
+            )
+        ]
+
     def __str__(self):
         return f"{self.endpoint.name} - {self.status} - {self.created_at}"
 
 
+class TranslationPayload(BaseModel):
+    """Compressed request or translated body captured for a TranslationEvent."""
+
+    # Not a ForeignKey: on PostgreSQL events live in a partitioned table
+    event_id = models.UUIDField(db_index=True)
+    endpoint = models.ForeignKey(TranslationEndpoint, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=64)
+    content_type = models.CharField(max_length=256, null=True, blank=True)
+    encoding = models.CharField(max_length=32, default="zlib")
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    data = models.BinaryField()
+
+    @property
+    def body(self) -> bytes:
+        return zlib.decompress(bytes(self.data))
+
+    def __str__(self):
+        return f"{self.event_id} - {self.kind} - {self.size} bytes"
+
+
+class TranslationTrafficRollup(BaseModel):
+    """Per-minute aggregate of an endpoint's TranslationEvents by status."""
+
+    endpoint = models.ForeignKey(TranslationEndpoint, on_delete=models.CASCADE)
+    minute = models.DateTimeField()
+    status = models.CharField(max_length=128, choices=[
+        (TranslationEventStatus.SUCCESS, TranslationEventStatus.SUCCESS),
+        (TranslationEventStatus.FAILURE, TranslationEventStatus.FAILURE)]
+    )
+    count = models.PositiveIntegerField(default=0)
+    latency_sum = models.FloatField(default=0)
+    latency_min = models.FloatField(null=True, blank=True)
+    latency_max = models.FloatField(null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["endpoint", "minute", "status"],
+                name="unique_traffic_rollup_bucket",
+            )
+        ]
 
+    def __str__(self):
+        return f"{self.endpoint_id} - {self.status} - {self.minute}: {self.count}"
 
+
+class TranslationJob(BaseModel):
+    """
+    Queued artifact generation or test run for a spec, executed by the
+    `run_job_worker` command. At most one job per spec and kind is queued or
+    running at a time.
+    """
+
+    kind = models.CharField(max_length=64, choices=[(k.value, k.value) for k in JobKind])
+    spec = models.ForeignKey(TranslationSpec, on_delete=models.CASCADE)
+    status = models.CharField(
+        max_length=32,
+        choices=[(s.value, s.value) for s in JobStatus],
+        default=JobStatus.QUEUED.value,
+    )
+    params = JSONField(default=dict, blank=True)
+    progress = JSONField(default=dict, blank=True)
+    result = JSONField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=256, null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["spec", "kind"],
+                condition=models.Q(status__in=[JobStatus.QUEUED.value, JobStatus.RUNNING.value]),
+                name="unique_active_job_per_spec",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="web_job_status_time_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} - {self.spec_id} - {self.status}"
+
+
+class ArtifactGenerationCacheEntry(BaseModel):
+    """
+    Implementation generated for a set of generation inputs, reused by any
+    spec whose inputs hash to the same `key`.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    implementation = models.BinaryField()
+    model = models.CharField(max_length=256)
+    hits = models.PositiveIntegerField(default=0)
+    last_hit_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def implementation_str(self):
+        return bytes(self.implementation).decode("utf-8")
+
+    def __str__(self):
+        return f"{self.key} - {self.model} - {self.hits} hits"
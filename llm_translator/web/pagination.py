@@ -0,0 +1,8 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardPagination(PageNumberPagination):
+    """Page number pagination whose size clients can lower or raise up to a cap."""
+
+    page_size_query_param = "page_size"
+    max_page_size = 500
@@ -0,0 +1,174 @@
+import re
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Optional
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import TranslationEvent, TranslationPayload
+
+logger = logging.getLogger(f"llm_translator.{__name__}")
+
+EVENT_TABLE = TranslationEvent._meta.db_table
+DEFAULT_PARTITION = f"{EVENT_TABLE}_default"
+
+_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def _setting(name: str, default):
+    return getattr(settings, "TRANSLATION_EVENT_RETENTION", {}).get(name, default)
+
+
+def partition_start(moment: datetime, interval: str) -> datetime:
+    moment = moment.astimezone(dt_timezone.utc)
+    if interval == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_partition_start(start: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return start + timedelta(days=1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(start: datetime, interval: str) -> str:
+    return f"{EVENT_TABLE}_p{start.strftime('%Y%m%d' if interval == 'day' else '%Y%m')}"
+
+
+def is_partitioned() -> bool:
+    """Whether the events table is a PostgreSQL range-partitioned table."""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s",
+            [EVENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> list[tuple[str, Optional[datetime], Optional[datetime]]]:
+    """Returns (name, start, end) per partition; the default partition has no bounds."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s",
+            [EVENT_TABLE],
+        )
+        rows = cursor.fetchall()
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND.search(bound or "")
+        if not match:
+            partitions.append((name, None, None))
+            continue
+        # PostgreSQL renders offsets as "+00", which older Pythons cannot parse
+        start, end = (
+            datetime.fromisoformat(re.sub(r"([+-]\d\d)$", r"\1:00", value))
+            for value in match.groups()
+        )
+        partitions.append((name, start, end))
+    return sorted(partitions, key=lambda p: p[1] or datetime.max.replace(tzinfo=dt_timezone.utc))
+
+
+def ensure_partitions(
+    since: Optional[datetime] = None,
+    ahead: Optional[int] = None,
+    interval: Optional[str] = None,
+) -> list[str]:
+    """
+    Creates the partitions from `since` (default: now) up to `ahead` intervals
+    in the future, plus the default partition, and returns the names created.
+    """
+    interval = interval or _setting("PARTITION_INTERVAL", "month")
+    ahead = _setting("PARTITIONS_AHEAD", 3) if ahead is None else ahead
+    existing = {name for name, _, _ in list_partitions()}
+    created = []
+
+    start = partition_start(since or timezone.now(), interval)
+    last = partition_start(timezone.now(), interval)
+    for _ in range(ahead):
+        last = next_partition_start(last, interval)
+
+    with connection.cursor() as cursor:
+        while start <= last:
+            end = next_partition_start(start, interval)
+            name = partition_name(start, interval)
+            if name not in existing:
+                # Bounds are generated here, not user input
+                cursor.execute(
+                    f'CREATE TABLE "{name}" PARTITION OF "{EVENT_TABLE}" '
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+                created.append(name)
+            start = end
+        if DEFAULT_PARTITION not in existing:
+            cursor.execute(
+                f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{EVENT_TABLE}" DEFAULT'
+            )
+            created.append(DEFAULT_PARTITION)
+
+    if created:
+        logger.info(f"Created event partitions: {', '.join(created)}")
+    return created
+
+
+def prune_events(cutoff: datetime, batch_size: int = 10000, dry_run: bool = False) -> dict:
+    """
+    Removes events created before `cutoff`. On a partitioned table whole
+    partitions ending before the cutoff are detached and dropped, and only the
+    default partition is cleaned with DELETE; otherwise rows are deleted in
+    batches. Captured payload blobs of the same period are deleted as well;
+    traffic rollups and endpoint counters are kept.
+    """
+    payloads = _delete_before(TranslationPayload, cutoff, batch_size, dry_run)
+    if not is_partitioned():
+        return {
+            "dropped_partitions": [],
+            "deleted_rows": _delete_before(TranslationEvent, cutoff, batch_size, dry_run),
+            "deleted_payloads": payloads,
+        }
+
+    partitions = list_partitions()
+    dropped = []
+    for name, _, end in partitions:
+        if end is None or end > cutoff:
+            continue
+        dropped.append(name)
+        if dry_run:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE "{EVENT_TABLE}" DETACH PARTITION "{name}"')
+            cursor.execute(f'DROP TABLE "{name}"')
+        logger.info(f"Dropped event partition {name}")
+
+    deleted = 0
+    if DEFAULT_PARTITION not in {name for name, _, _ in partitions}:
+        return {"dropped_partitions": dropped, "deleted_rows": deleted, "deleted_payloads": payloads}
+    with connection.cursor() as cursor:
+        if dry_run:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM "{DEFAULT_PARTITION}" WHERE created_at < %s', [cutoff]
+            )
+            deleted = cursor.fetchone()[0]
+        else:
+            cursor.execute(
+                f'DELETE FROM "{DEFAULT_PARTITION}" WHERE created_at < %s', [cutoff]
+            )
+            deleted = cursor.rowcount
+    return {"dropped_partitions": dropped, "deleted_rows": deleted, "deleted_payloads": payloads}
+
+
+def _delete_before(model, cutoff: datetime, batch_size: int, dry_run: bool) -> int:
+    expired = model.objects.filter(created_at__lt=cutoff)
+    if dry_run:
+        return expired.count()
+    deleted = 0
+    while True:
+        batch = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return deleted
+        deleted += model.objects.filter(pk__in=batch).delete()[0]
@@ -0,0 +1,106 @@
+import zlib
+import random
+import hashlib
+import logging
+import pydantic
+from typing import Optional, Union
+from django.conf import settings
+from .constants import PayloadCaptureMode
+from .models import TranslationEndpoint, TranslationEvent, TranslationPayload
+from .schemas import PayloadCaptureSchema, TranslationEndpointDefinitionSchema
+
+
+class PayloadCapturePolicy:
+    """
+    Decides what an event keeps of the request and translated bodies:
+
+    - `full`: the decoded body, as-is
+    - `none`: only content type and size
+    - `hash`: size and sha256
+    - `truncate`: size, sha256 and the first `truncate_bytes` bytes
+    - `sample`: the full body for 1 in `sample_rate` events, hash otherwise
+    - `blob`: size and sha256 in the event, the zlib-compressed body in a
+      TranslationPayload row written next to the event
+
+    Bodies are decoded as UTF-8 with replacement characters, so binary or
+    mis-encoded payloads never fail the event.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(
+        self,
+        mode: PayloadCaptureMode,
+        truncate_bytes: int,
+        sample_rate: int,
+    ):
+        self.mode = PayloadCaptureMode(mode)
+        self.truncate_bytes = truncate_bytes
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def for_endpoint(cls, endpoint: TranslationEndpoint) -> "PayloadCapturePolicy":
+        defaults = getattr(settings, "TRANSLATION_PAYLOAD_CAPTURE", {})
+        try:
+            capture = TranslationEndpointDefinitionSchema(
+                **(endpoint.definition or {})
+            ).payload_capture
+        except pydantic.ValidationError as e:
+            # A bad policy must not fail translations, fall back to the defaults
+            cls.logger.warning(f"Invalid payload capture for endpoint {endpoint.uuid}: {e}")
+            capture = PayloadCaptureSchema()
+        return cls(
+            mode=capture.mode or defaults.get("MODE", PayloadCaptureMode.TRUNCATE),
+            truncate_bytes=capture.truncate_bytes or defaults.get("TRUNCATE_BYTES", 4096),
+            sample_rate=capture.sample_rate or defaults.get("SAMPLE_RATE", 100),
+        )
+
+    def capture(
+        self,
+        event: TranslationEvent,
+        payloads: dict[str, tuple[Optional[str], Union[bytes, str, None]]],
+    ) -> dict[str, dict]:
+        """
+        Returns the context entry of each `kind -> (content_type, body)`
+        payload. Blobs are attached to `event.payloads` for the event sink.
+        """
+        mode = self.mode
+        if mode == PayloadCaptureMode.SAMPLE:
+            # Sample per event, so request and translated body stay together
+            sampled = random.randrange(self.sample_rate) == 0
+            mode = PayloadCaptureMode.FULL if sampled else PayloadCaptureMode.HASH
+
+        captured = {}
+        for kind, (content_type, body) in payloads.items():
+            data = body.encode() if isinstance(body, str) else bytes(body or b"")
+            entry = {"content_type": content_type}
+            if mode == PayloadCaptureMode.FULL:
+                entry["body"] = data.decode(errors="replace")
+                if self.mode == PayloadCaptureMode.SAMPLE:
+                    entry["sampled"] = True
+                captured[kind] = entry
+                continue
+
+            entry["size"] = len(data)
+            if mode == PayloadCaptureMode.NONE:
+                captured[kind] = entry
+                continue
+
+            entry["sha256"] = hashlib.sha256(data).hexdigest()
+            if mode == PayloadCaptureMode.TRUNCATE:
+                entry["body"] = data[: self.truncate_bytes].decode(errors="ignore")
+                entry["truncated"] = len(data) > self.truncate_bytes
+            elif mode == PayloadCaptureMode.BLOB:
+                payload = TranslationPayload(
+                    event_id=event.uuid,
+                    endpoint_id=event.endpoint_id,
+                    kind=kind,
+                    content_type=content_type,
+                    size=len(data),
+                    sha256=entry["sha256"],
+                    data=zlib.compress(data),
+                )
+                event.payloads = [*getattr(event, "payloads", []), payload]
+                entry["payload"] = str(payload.uuid)
+            captured[kind] = entry
+        return captured
@@ -1,6 +1,6 @@
 from typing import Optional
 from pydantic import BaseModel, Field
-from .constants import EngineOptions, ExpectationResult
+from .constants import EngineOptions, ExpectationResult, PayloadCaptureMode
 class InputSpecRule(BaseModel):
     content_type: str
     schema_: Optional[str] = None
@@ -14,6 +14,16 @@ class TranslationSpecDefinitionSchema(BaseModel):
     input_rule: Optional[InputSpecRule]
     output_rule: Optional[OutputSpecRule]
     extra_context: Optional[str]
+    cache_results: bool = Field(default=True, description="Whether dynamic engine results may be served from the translation result cache")
+    cache_ttl: Optional[int] = Field(default=None, description="Seconds a cached result stays valid, overriding TRANSLATION_RESULT_CACHE TTL")
+
+class PayloadCaptureSchema(BaseModel):
+    mode: Optional[PayloadCaptureMode] = Field(default=None, description="How request/translated bodies are stored in events, defaults to TRANSLATION_PAYLOAD_CAPTURE MODE")
+    truncate_bytes: Optional[int] = Field(default=None, gt=0, description="Bytes of the body kept by the `truncate` mode")
+    sample_rate: Optional[int] = Field(default=None, gt=0, description="The `sample` mode stores full bodies for 1 in `sample_rate` events")
+
+class TranslationEndpointDefinitionSchema(BaseModel):
+    payload_capture: PayloadCaptureSchema = Field(default_factory=PayloadCaptureSchema)
 
 class SpecTestCaseInputDefinitionSchema(BaseModel):
     body: str
@@ -3,13 +3,14 @@ from rest_framework import serializers
 from .models import (
     TranslationEndpoint,
     TranslationSpec,
-    TranslationEvent,
     AccountAPIKey,
     SpecTestCase,
     TranslationArtifact,
+    TranslationJob,
     SpecTestCaseExecution
 )
-from .schemas import SpecTestCaseDefinitionSchema
+from .schemas import SpecTestCaseDefinitionSchema, TranslationEndpointDefinitionSchema
+from .traffic import get_traffic, parse_traffic_range, summarize_traffic
 
 
 class TranslationEndpointAnalyticsSerializer(serializers.ModelSerializer):
@@ -29,44 +30,36 @@ class TranslationEndpointAnalyticsSerializer(serializers.ModelSerializer):
         return obj.total_failure
 
     def get_traffic(self, obj) -> dict:
-
-        # Group events by minute
-        events = TranslationEvent.objects.filter(endpoint=obj)
-        traffic_dict = {}
-        for event in events:
-
-            # Get unix timestamp for the minute
-            minute = event.created_at.replace(second=0, microsecond=0).timestamp()
-            status_group = event.status
-
-            if status_group not in traffic_dict:
-                traffic_dict[status_group] = {}
-
-            if minute not in traffic_dict[status_group]:
-                traffic_dict[status_group][minute] = 0
-            traffic_dict[status_group][minute] += 1
-
-        traffic = {}
-        for status, v in traffic_dict.items():
-            for minute, count in v.items():
-                if status not in traffic:
-                    traffic[status] = []
-                traffic[status].append((minute, count))
-
-        return traffic
+        # The endpoint viewset prefetches the rollups of the requested range
+        rollups = getattr(obj, "traffic_rollups", None)
+        if rollups is not None:
+            return summarize_traffic(rollups)
+        request = self.context.get("request")
+        try:
+            since, until = parse_traffic_range(request.query_params if request else {})
+        except ValueError as e:
+            raise serializers.ValidationError({str(e): "Must be an ISO 8601 datetime"})
+        return get_traffic(obj.uuid, since, until)
 
 
 class TranslationEndpointListSerializer(TranslationEndpointAnalyticsSerializer):
 
     class Meta:
         model = TranslationEndpoint
-        exclude = ["definition"]
+        exclude = ["definition", "success_count", "failure_count"]
 
 
 class TranslationEndpointDetailSerializer(TranslationEndpointAnalyticsSerializer):
     class Meta:
         model = TranslationEndpoint
-        exclude = ["owner"]
+        exclude = ["owner", "success_count", "failure_count"]
+
+    def validate_definition(self, value):
+        try:
+            TranslationEndpointDefinitionSchema(**(value or {}))
+        except pydantic.ValidationError as e:
+            raise serializers.ValidationError(detail=e.errors(), code="invalid")
+        return value
 
 
 class TranslationSpecListSerializer(serializers.ModelSerializer):
@@ -108,6 +101,15 @@ class SpecTestCaseDetailSerializer(serializers.ModelSerializer):
         return super().to_internal_value(data)
     
     def get_last_execution(self, obj) -> dict:
+        # The test case viewset annotates the latest execution via Subquery
+        if hasattr(obj, "last_execution_status"):
+            if obj.last_execution_status is None:
+                return None
+            return {
+                "executed_at": obj.last_execution_executed_at.isoformat(),
+                "status": obj.last_execution_status,
+                "result": obj.last_execution_result,
+            }
         last_exec = SpecTestCaseExecution.objects.filter(test_case=obj).order_by("-created_at").first()
         if not last_exec:
             return None
@@ -137,7 +139,9 @@ class AccountSerializer(serializers.Serializer):
     api_keys = serializers.SerializerMethodField()
 
     def get_api_keys(self, obj) -> list:
-        api_keys = AccountAPIKey.objects.filter(account=obj, is_active=True)
+        api_keys = getattr(obj, "active_api_keys", None)
+        if api_keys is None:
+            api_keys = AccountAPIKey.objects.filter(account=obj, is_active=True)
         return [api_key.key for api_key in api_keys]
 
 class ArtifactGenerationSerializer(serializers.Serializer):
@@ -147,4 +151,25 @@ class ArtifactGenerationSerializer(serializers.Serializer):
     message = serializers.CharField()
     stacktrace = serializers.CharField(allow_blank=True, required=False)
     failed_test_cases = SpecTestCaseListSerializer(many=True)
-    artifact = TranslationSpecArtifactSerializer()
\ No newline at end of file
+    artifact = TranslationSpecArtifactSerializer()
+    candidates = serializers.ListField(child=serializers.DictField(), required=False)
+    repairs = serializers.ListField(child=serializers.DictField(), required=False)
+
+
+class TranslationJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TranslationJob
+        fields = [
+            "uuid",
+            "kind",
+            "spec",
+            "status",
+            "params",
+            "progress",
+            "result",
+            "error",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
@@ -1,8 +1,19 @@
 # Django Signals
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import SpecTestCaseExecution
+from django.contrib.auth.models import User
+from .models import (
+    Account,
+    AccountAPIKey,
+    SpecTestCaseExecution,
+    TranslationEndpoint,
+    TranslationSpec,
+    TranslationArtifact,
+)
+from .translator.routing import routing_table
+from .translator.artifact_cache import compiled_artifact_cache
+from .auth import api_key_cache
 
 @receiver(post_save, sender=SpecTestCaseExecution)
 def create_translation_endpoint(sender, instance, created, **kwargs):
@@ -10,4 +21,44 @@ def create_translation_endpoint(sender, instance, created, **kwargs):
     test_case = instance.test_case
     test_case.executed_at = instance.executed_at
     test_case.status = instance.status
-    test_case.save()
\ No newline at end of file
+    test_case.save()
+
+
+@receiver(post_save, sender=TranslationEndpoint)
+@receiver(post_delete, sender=TranslationEndpoint)
+def invalidate_endpoint_route(sender, instance, **kwargs):
+    routing_table.invalidate_endpoint(instance.uuid)
+
+
+@receiver(post_save, sender=TranslationSpec)
+@receiver(post_delete, sender=TranslationSpec)
+def invalidate_spec_route(sender, instance, **kwargs):
+    routing_table.invalidate_endpoint(instance.endpoint_id)
+    routing_table.invalidate_spec(instance.uuid)
+
+
+@receiver(post_save, sender=TranslationArtifact)
+@receiver(post_delete, sender=TranslationArtifact)
+def invalidate_artifact_route(sender, instance, **kwargs):
+    routing_table.invalidate_spec(instance.spec_id)
+    compiled_artifact_cache.invalidate(instance.uuid)
+
+
+@receiver(post_save, sender=AccountAPIKey)
+@receiver(post_delete, sender=AccountAPIKey)
+def invalidate_api_key(sender, instance, **kwargs):
+    api_key_cache.invalidate(instance.key)
+    # The key string itself may have been edited
+    api_key_cache.invalidate_account(instance.account_id)
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def invalidate_account_api_keys(sender, instance, **kwargs):
+    api_key_cache.invalidate_account(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_api_keys(sender, instance, **kwargs):
+    api_key_cache.invalidate_user(instance.pk)
@@ -0,0 +1,65 @@
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from web import models
+from web.auth import api_key_cache
+from web.constants import EngineOptions
+from web.metrics import metrics
+from web.translator.artifact_cache import compiled_artifact_cache
+from web.translator.result_cache import translation_result_cache
+from web.translator.routing import routing_table
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    # Test transactions are rolled back without firing invalidation signals
+    yield
+    for cache in (
+        api_key_cache, compiled_artifact_cache, translation_result_cache, routing_table, metrics
+    ):
+        cache.clear()
+
+
+@pytest.fixture
+def account(db):
+    user = User.objects.create(username="tester")
+    account = models.Account.objects.create(name="Test Account", user=user)
+    models.AccountAPIKey.objects.create(account=account, key="test_key")
+    return account
+
+
+@pytest.fixture
+def api_client(account):
+    client = APIClient()
+    token = Token.objects.create(user=account.user)
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+@pytest.fixture
+def make_endpoint(account):
+    def make(key: str) -> models.TranslationEndpoint:
+        return models.TranslationEndpoint.objects.create(
+            key=key, name=key, definition={}, owner=account
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_spec():
+    def make(endpoint: models.TranslationEndpoint, name: str) -> models.TranslationSpec:
+        return models.TranslationSpec.objects.create(
+            name=name,
+            endpoint=endpoint,
+            version="1",
+            definition={
+                "engine": EngineOptions.COMPILED_ARTIFACT,
+                "input_rule": {"content_type": "json"},
+                "output_rule": {"content_type": "xml"},
+                "extra_context": "",
+            },
+        )
+
+    return make
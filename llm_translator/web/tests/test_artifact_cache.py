@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from web import models
+from web.excpetions import TranslationException
+from web.translator.artifact_cache import CompiledArtifactCache, compiled_artifact_cache
+
+UPDATED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def artifact(output: str, updated_at: datetime = UPDATED_AT, **kwargs) -> models.TranslationArtifact:
+    source = f"def translate(body):\n    return b'{output}'\n"
+    return models.TranslationArtifact(
+        uuid=kwargs.get("uuid") or uuid.uuid4(),
+        implementation=kwargs.get("source", source).encode(),
+        updated_at=updated_at,
+    )
+
+
+def test_least_recently_used_artifacts_are_evicted_by_size():
+    first, second, third = artifact("<1/>"), artifact("<2/>"), artifact("<3/>")
+    size = len(first.implementation)
+    cache = CompiledArtifactCache(max_entries=10, max_bytes=2 * size)
+    cache.get(first)
+    cache.get(second)
+    cache.get(first)
+    cache.get(third)
+
+    assert [key[0] for key in cache._entries] == [str(first.uuid), str(third.uuid)]
+    assert cache._size == 2 * size
+
+
+def test_artifacts_larger_than_the_cache_are_not_kept():
+    large = artifact("<" + "x" * 100 + "/>")
+    cache = CompiledArtifactCache(max_entries=10, max_bytes=10)
+
+    assert cache.get(large)(b"") == b"<" + b"x" * 100 + b"/>"
+    assert not cache._entries
+
+
+def test_updated_artifact_is_compiled_again():
+    cache = CompiledArtifactCache(max_entries=10, max_bytes=1024)
+    original = artifact("<old/>")
+    updated = artifact("<new/>", UPDATED_AT + timedelta(seconds=1), uuid=original.uuid)
+
+    assert cache.get(original)(b"") == b"<old/>"
+    assert cache.get(updated)(b"") == b"<new/>"
+
+
+def test_artifact_without_translate_is_rejected():
+    cache = CompiledArtifactCache(max_entries=10, max_bytes=1024)
+
+    with pytest.raises(TranslationException, match="did not find `translate`"):
+        cache.get(artifact("", source="def convert(body):\n    return body\n"))
+    assert not cache._entries
+
+
+@pytest.mark.django_db
+def test_saving_an_artifact_drops_its_compiled_versions(make_endpoint, make_spec):
+    spec = make_spec(make_endpoint("endpoint"), "spec")
+    saved = models.TranslationArtifact.objects.create(
+        spec=spec, implementation=b"def translate(body):\n    return b'<ok/>'\n"
+    )
+    compiled_artifact_cache.get(saved)
+    assert CompiledArtifactCache.key_for(saved) in compiled_artifact_cache._entries
+
+    saved.save()
+
+    assert not any(key[0] == str(saved.uuid) for key in compiled_artifact_cache._entries)
@@ -0,0 +1,77 @@
+import pytest
+from web import models
+from web.translator import artifact as artifact_module
+from web.translator.artifact import TranslationArtifactGenerator
+
+CANDIDATES = {
+    0.0: "def translate(body):\n    return b'<wrong/>'\n",
+    0.5: "def translate(body:\n",
+    1.0: "def translate(body):\n    return b'<ok/>'\n",
+}
+
+
+@pytest.fixture
+def spec_with_case(make_endpoint, make_spec):
+    spec = make_spec(make_endpoint("endpoint"), "spec")
+    models.SpecTestCase.objects.create(
+        name="case",
+        spec=spec,
+        definition={"input": {"body": "{}"}, "expectation": {"body": "<ok/>"}},
+    )
+    return spec
+
+
+@pytest.fixture
+def fake_generation(monkeypatch):
+    configs = []
+
+    def forward(self, input_type, output_type, input_samples, extra_instructions=None, config=None):
+        configs.append(config)
+        return CANDIDATES[config["temperature"]]
+
+    monkeypatch.setattr(artifact_module.ArtifactGenerationPromptModule, "forward", forward)
+    return configs
+
+
+@pytest.mark.django_db
+def test_best_candidate_is_saved(spec_with_case, fake_generation):
+    generator = TranslationArtifactGenerator(spec_with_case, candidates=3)
+
+    artifact = generator.generate()
+
+    assert sorted(c["seed"] for c in fake_generation) == [0, 1, 2]
+    assert bytes(artifact.implementation) == CANDIDATES[1.0].encode()
+    assert [(c.temperature, c.passed) for c in generator.evaluated] == [(0.0, 0), (0.5, 0), (1.0, 1)]
+    assert "SyntaxError" in generator.evaluated[1].error
+
+
+@pytest.mark.django_db
+def test_generate_artifact_rejects_too_many_candidates(api_client, spec_with_case):
+    response = api_client.post(
+        f"/api/specs/{spec_with_case.uuid}/generate_artifact",
+        data={"candidates": 100},
+        format="json",
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_candidate_that_runs_beats_one_that_does_not_load(monkeypatch, spec_with_case, fake_generation):
+    monkeypatch.setitem(CANDIDATES, 0.0, CANDIDATES[0.5])
+    monkeypatch.setitem(CANDIDATES, 1.0, "def translate(body):\n    return b'<wrong/>'\n")
+    generator = TranslationArtifactGenerator(spec_with_case, candidates=2)
+
+    artifact = generator.generate()
+
+    assert [c.passed for c in generator.evaluated] == [0, 0]
+    assert bytes(artifact.implementation) == CANDIDATES[1.0].encode()
+
+
+@pytest.mark.django_db
+def test_generate_artifact_rejects_a_non_object_body(api_client, spec_with_case):
+    response = api_client.post(
+        f"/api/specs/{spec_with_case.uuid}/generate_artifact", data=[3], format="json"
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,30 @@
+import dspy
+import pytest
+from web import models
+from web.llm.stub import StubLM, StubResponses
+from web.manager import ArtifactGenerationRequest, ArtifactGeneratorManager
+
+BROKEN = b"def translate(body):\n    return b'<okay/>'\n"
+FIXED = "def translate(data: bytes) -> bytes:\n    return b'<ok/>'"
+
+
+@pytest.mark.django_db
+def test_failing_artifact_is_repaired_from_test_diffs(make_endpoint, make_spec):
+    spec = make_spec(make_endpoint("endpoint"), "spec")
+    models.SpecTestCase.objects.create(
+        name="case",
+        spec=spec,
+        definition={"input": {"body": "{}"}, "expectation": {"body": "<ok/>"}},
+    )
+    models.TranslationArtifact.objects.create(spec=spec, implementation=BROKEN)
+    lm = StubLM(
+        StubResponses([{"contains": ["[[ ## failures ## ]]", "-<ok/>", "+<okay/>"], "output": FIXED}])
+    )
+
+    with dspy.context(lm=lm):
+        response = ArtifactGeneratorManager().handle(ArtifactGenerationRequest(spec_id=str(spec.uuid)))
+
+    assert response.it_passed_all_test_cases, response.message
+    assert [(r.iteration, r.failures_sent, r.accepted) for r in response.repairs] == [(1, 1, True)]
+    assert response.repairs[0].tokens > 0
+    assert models.TranslationArtifact.objects.get(spec=spec).implementation_str == FIXED
@@ -0,0 +1,25 @@
+import json
+from web.benchmark import compare_results, make_payload, percentile
+
+
+def test_percentile_interpolates():
+    ordered = [1.0, 2.0, 3.0, 4.0]
+
+    assert percentile(ordered, 50) == 2.5
+    assert percentile(ordered, 100) == 4.0
+    assert percentile([], 95) == 0.0
+
+
+def test_make_payload_reaches_size():
+    body = make_payload(4096, 7)
+
+    assert 4096 <= len(body) < 4096 + 100
+    assert json.loads(body)["seq"] == 7
+
+
+def test_compare_results_reports_regressions():
+    def result(p95, throughput):
+        return {"scenario": "compiled_artifact-c1-1024b", "latency": {"p95": p95}, "throughput": throughput}
+
+    assert compare_results([result(0.011, 95)], [result(0.010, 100)], 0.2) == []
+    assert len(compare_results([result(0.020, 50)], [result(0.010, 100)], 0.2)) == 2
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from web.translator.coalescing import SingleFlight
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flights = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def scenario():
+        leader = asyncio.create_task(flights.ado("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.ado("key", call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == ("result", True)
+    assert calls == [1]
+    assert not flights._async_flights
+
+
+def test_errors_are_shared_with_followers():
+    flights = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        return await asyncio.gather(
+            flights.ado("key", call), flights.ado("key", call), return_exceptions=True
+        )
+
+    assert [str(e) for e in asyncio.run(scenario())] == ["boom", "boom"]
@@ -0,0 +1,36 @@
+import time
+import queue
+from web.events import EventSinkMode, OverflowPolicy, TranslationEventSink
+
+
+def full_sink(monkeypatch, policy: OverflowPolicy, block_timeout: float = 0.1):
+    sink = TranslationEventSink(
+        mode=EventSinkMode.BACKGROUND,
+        overflow_policy=policy,
+        block_timeout=block_timeout,
+    )
+    # No worker drains the queue, so it stays full after one event
+    monkeypatch.setattr(sink, "_TranslationEventSink__ensure_worker", lambda: None)
+    sink._queue = queue.Queue(maxsize=1)
+    written = []
+    monkeypatch.setattr(sink, "write", written.extend)
+    return sink, written
+
+
+def test_blocking_emit_waits_once_for_the_whole_batch(monkeypatch):
+    sink, written = full_sink(monkeypatch, OverflowPolicy.BLOCK)
+
+    started = time.monotonic()
+    sink.emit_many(list(range(10)))
+
+    assert time.monotonic() - started < 0.5
+    assert sink._queue.get_nowait() == 0
+    assert written == list(range(1, 10))
+
+
+def test_dropped_events_are_counted(monkeypatch):
+    sink, written = full_sink(monkeypatch, OverflowPolicy.DROP)
+
+    sink.emit_many(list(range(10)))
+
+    assert (sink.dropped, written) == (9, [])
@@ -0,0 +1,50 @@
+import dspy
+import pytest
+from web import models
+from web.llm.stub import StubLM, StubResponses
+from web.manager import ArtifactGenerationRequest, ArtifactGeneratorManager
+
+IMPLEMENTATION = "def translate(data: bytes) -> bytes:\n    return b'<ok/>'"
+
+
+class FailingLM(StubLM):
+    def forward(self, prompt=None, messages=None, **kwargs):
+        raise AssertionError("The LM should not be called")
+
+
+@pytest.fixture
+def make_spec_with_case(make_endpoint, make_spec):
+    def make(key: str) -> models.TranslationSpec:
+        spec = make_spec(make_endpoint(key), "spec")
+        models.SpecTestCase.objects.create(
+            name=f"case of {key}",
+            spec=spec,
+            definition={"input": {"body": "{}"}, "expectation": {"body": "<ok/>"}},
+        )
+        return spec
+
+    return make
+
+
+def generate(spec: models.TranslationSpec):
+    return ArtifactGeneratorManager().handle(ArtifactGenerationRequest(spec_id=str(spec.uuid)))
+
+
+@pytest.mark.django_db
+def test_generated_implementation_is_reused(make_spec_with_case):
+    first = make_spec_with_case("first")
+    with dspy.context(lm=StubLM(StubResponses(default_output=IMPLEMENTATION))):
+        assert generate(first).it_passed_all_test_cases
+
+    second = make_spec_with_case("second")
+    with dspy.context(lm=FailingLM()):
+        # Saving a test case without changing it keeps the artifact fresh
+        models.SpecTestCase.objects.get(spec=first).save()
+        assert generate(first).it_passed_all_test_cases
+        # A spec with the same inputs reuses the implementation
+        response = generate(second)
+
+    assert response.it_passed_all_test_cases, response.message
+    assert response.artifact.implementation_str == IMPLEMENTATION
+    entry = models.ArtifactGenerationCacheEntry.objects.get()
+    assert (entry.key, entry.hits) == (response.artifact.generation_key, 1)
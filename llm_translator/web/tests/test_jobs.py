@@ -0,0 +1,110 @@
+import time
+import pytest
+from django.db import OperationalError
+from django.test import override_settings
+from web import jobs, models
+from web.constants import JobKind, JobStatus
+from web.jobs import JobWorker, claim_job, enqueue_job, requeue_stale_jobs, run_job
+
+IMPLEMENTATION = b"def translate(body):\n    return b'<ok/>'\n"
+
+
+@pytest.fixture
+def spec(make_endpoint, make_spec):
+    spec = make_spec(make_endpoint("endpoint"), "spec")
+    models.SpecTestCase.objects.create(
+        name="case",
+        spec=spec,
+        definition={"input": {"body": "{}"}, "expectation": {"body": "<ok/>"}},
+    )
+    models.TranslationArtifact.objects.create(spec=spec, implementation=IMPLEMENTATION)
+    return spec
+
+
+@pytest.mark.django_db
+@override_settings(TRANSLATION_JOBS={"MODE": "worker"})
+def test_jobs_are_deduplicated_and_run_by_worker(api_client, spec):
+    first = api_client.post(f"/api/specs/{spec.uuid}/testcases/run")
+    second = api_client.post(f"/api/specs/{spec.uuid}/testcases/run")
+
+    assert first.status_code == second.status_code == 202
+    assert first.json()["created"] and not second.json()["created"]
+    job_id = first.json()["job"]["uuid"]
+    assert second.json()["job"]["uuid"] == job_id
+    assert first.json()["job"]["status"] == JobStatus.QUEUED.value
+
+    assert JobWorker(name="test").run(once=True) == 1
+
+    job = api_client.get(f"/api/jobs/{job_id}").json()
+    assert job["status"] == JobStatus.SUCCEEDED.value
+    assert job["progress"] == {"stage": "testing", "done": 1, "total": 1}
+    assert job["result"] == {"success": True, "failed_test_cases": []}
+
+
+@pytest.mark.django_db
+def test_generate_artifact_job_runs_in_sync_mode(api_client, spec):
+    response = api_client.post(f"/api/specs/{spec.uuid}/generate_artifact")
+
+    assert response.status_code == 202
+    job = response.json()["job"]
+    assert job["status"] == JobStatus.SUCCEEDED.value
+    assert job["result"]["it_passed_all_tests"] is True
+
+
+@pytest.mark.django_db
+@override_settings(TRANSLATION_JOBS={"MODE": "worker"})
+def test_stale_jobs_are_requeued_then_failed(spec):
+    job, _ = enqueue_job(JobKind.RUN_TEST_CASES, spec)
+    models.TranslationJob.objects.filter(pk=job.pk).update(
+        status=JobStatus.RUNNING.value, heartbeat_at="2020-01-01T00:00:00Z", attempts=1
+    )
+
+    assert requeue_stale_jobs(stale_after=60, max_attempts=2) == 1
+    job.refresh_from_db()
+    assert job.status == JobStatus.QUEUED.value
+
+    models.TranslationJob.objects.filter(pk=job.pk).update(
+        status=JobStatus.RUNNING.value, heartbeat_at="2020-01-01T00:00:00Z", attempts=2
+    )
+    requeue_stale_jobs(stale_after=60, max_attempts=2)
+    job.refresh_from_db()
+    assert job.status == JobStatus.FAILED.value
+
+
+@pytest.mark.django_db
+@override_settings(TRANSLATION_JOBS={"MODE": "worker"})
+def test_outcome_of_a_taken_over_job_is_discarded(spec):
+    job, _ = enqueue_job(JobKind.RUN_TEST_CASES, spec)
+    claimed = claim_job("first", job_id=job.pk)
+    # The first worker looked dead, and the job was requeued and claimed again
+    models.TranslationJob.objects.filter(pk=job.pk).update(status=JobStatus.QUEUED.value)
+    claim_job("second", job_id=job.pk)
+
+    run_job(claimed)
+
+    job.refresh_from_db()
+    assert (job.status, job.worker, job.attempts) == (JobStatus.RUNNING.value, "second", 2)
+
+
+def test_heartbeat_keeps_going_after_database_errors(monkeypatch):
+    beats = []
+
+    class Jobs:
+        def filter(self, **kwargs):
+            return self
+
+        def update(self, **kwargs):
+            beats.append(kwargs)
+            if len(beats) == 1:
+                raise OperationalError("database is locked")
+
+    class TranslationJob:
+        objects = Jobs()
+
+    monkeypatch.setattr(jobs, "TranslationJob", TranslationJob)
+    worker = JobWorker(name="test", heartbeat_interval=0.01)
+
+    with worker._JobWorker__heartbeat(models.TranslationJob(pk=1)):
+        time.sleep(0.2)
+
+    assert len(beats) > 2
@@ -0,0 +1,106 @@
+import asyncio
+import litellm
+import pytest
+from web.excpetions import LMProviderUnavailable
+from web.llm.pool import CircuitBreaker, LMBackend, LMProviderPool
+from web.llm.stub import StubLM, StubResponses
+
+
+class FailingLM(StubLM):
+    def forward(self, prompt=None, messages=None, **kwargs):
+        self.calls = getattr(self, "calls", 0) + 1
+        raise ConnectionError("connection refused")
+
+
+class RejectingLM(StubLM):
+    def forward(self, prompt=None, messages=None, **kwargs):
+        self.calls = getattr(self, "calls", 0) + 1
+        raise litellm.ContextWindowExceededError("prompt too long", "model", "openai")
+
+
+class HangingLM(StubLM):
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        await asyncio.sleep(60)
+
+
+def backend(name, lm, failures=2):
+    return LMBackend(name, lm, max_concurrency=2, breaker=CircuitBreaker(failures, reset_timeout=60))
+
+
+def content(response):
+    return response.choices[0].message.content
+
+
+def test_fails_over_and_opens_the_circuit():
+    failing = FailingLM()
+    pool = LMProviderPool(
+        [backend("down", failing), backend("up", StubLM(StubResponses(default_output="<up/>")))],
+        backoff=0,
+    )
+
+    for _ in range(4):
+        # Unmeasured backends are tried first, in order, so "down" is hit until it opens
+        assert "<up/>" in content(pool.forward(messages=[{"role": "user", "content": "x"}]))
+
+    assert failing.calls == 2
+    assert pool.backends[0].breaker.state == CircuitBreaker.OPEN
+
+
+def test_raises_when_no_backend_answers():
+    pool = LMProviderPool([backend("down", FailingLM())], retries=1, backoff=0)
+
+    with pytest.raises(LMProviderUnavailable):
+        pool.forward(messages=[{"role": "user", "content": "x"}])
+
+
+def test_prefers_the_backend_with_the_lowest_expected_wait():
+    slow = backend("slow", StubLM(StubResponses(default_output="<slow/>")))
+    fast = backend("fast", StubLM(StubResponses(default_output="<fast/>")))
+    slow.latency, fast.latency = 1.0, 0.1
+    pool = LMProviderPool([slow, fast])
+
+    assert "<fast/>" in content(pool.forward(messages=[{"role": "user", "content": "x"}]))
+
+    fast.in_flight = 40
+    assert "<slow/>" in content(pool.forward(messages=[{"role": "user", "content": "x"}]))
+
+
+def test_half_open_circuit_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_errors_are_raised_without_failing_over():
+    rejecting = RejectingLM()
+    other = RejectingLM()
+    pool = LMProviderPool([backend("first", rejecting, failures=1), backend("second", other)], backoff=0)
+
+    with pytest.raises(litellm.ContextWindowExceededError):
+        pool.forward(messages=[{"role": "user", "content": "x"}])
+
+    assert (rejecting.calls, getattr(other, "calls", 0)) == (1, 0)
+    assert pool.backends[0].breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_trial_call_reopens_the_half_open_circuit():
+    pool = LMProviderPool([backend("hanging", HangingLM(), failures=1)], backoff=0)
+    breaker = pool.backends[0].breaker
+    breaker.reset_timeout = 0
+    breaker.record_failure()
+
+    async def scenario():
+        call = asyncio.create_task(pool.aforward(messages=[{"role": "user", "content": "x"}]))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+    asyncio.run(scenario())
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
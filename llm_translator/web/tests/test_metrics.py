@@ -0,0 +1,37 @@
+import pytest
+from rest_framework.test import APIClient
+from web import models
+from web.metrics import request_seconds, stage_seconds
+
+
+@pytest.mark.django_db
+def test_translate_records_stage_metrics(make_endpoint, make_spec):
+    endpoint = make_endpoint("endpoint")
+    spec = make_spec(endpoint, "spec")
+    spec.is_active = True
+    spec.save()
+    models.TranslationArtifact.objects.create(
+        spec=spec, implementation=b"def translate(data):\n    return data\n"
+    )
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer test_key")
+
+    for _ in range(2):
+        response = client.post("/api/translate/endpoint", data=b"{}", content_type="application/json")
+        assert response.status_code == 200, response.content
+
+    labels = {"endpoint": "endpoint", "engine": "compiled_artifact"}
+    for stage in ("resolve", "spec_lookup", "executor_select", "artifact_load", "translate", "event_emit"):
+        assert stage_seconds.count(stage=stage, **labels) == 2, stage
+    assert request_seconds.count(status="success", **labels) == 2
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    text = response.content.decode()
+    assert "# TYPE translation_stage_seconds histogram" in text
+    assert (
+        'translation_stage_seconds_count{stage="translate",endpoint="endpoint",engine="compiled_artifact"} 2'
+        in text
+    )
+    assert "translation_artifact_compile_seconds_count 1" in text
+    assert "translation_events_written_total 2" in text
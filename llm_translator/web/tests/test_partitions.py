@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone as django_timezone
+from web import models
+from web.constants import TranslationEventStatus
+from web.events import event_sink
+from web.partitions import (
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    next_partition_start,
+    partition_name,
+    partition_start,
+    prune_events,
+)
+
+postgresql_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Event partitioning is PostgreSQL only"
+)
+
+
+def test_partition_bounds_and_names():
+    moment = datetime(2024, 1, 31, 23, 30, tzinfo=timezone.utc)
+
+    month = partition_start(moment, "month")
+    assert (month, next_partition_start(month, "month")) == (
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 2, 1, tzinfo=timezone.utc),
+    )
+    assert partition_name(month, "month") == "web_translationevent_p202401"
+
+    day = partition_start(moment, "day")
+    assert next_partition_start(day, "day") == datetime(2024, 2, 1, tzinfo=timezone.utc)
+    assert partition_name(day, "day") == "web_translationevent_p20240131"
+
+
+@pytest.fixture
+def old_and_new_events(make_endpoint):
+    endpoint = make_endpoint("endpoint")
+    event_sink.write(
+        [
+            models.TranslationEvent(
+                endpoint=endpoint, status=TranslationEventStatus.SUCCESS, context={"duration": 0.1}
+            )
+            for _ in range(3)
+        ]
+    )
+    old = list(models.TranslationEvent.objects.values_list("pk", flat=True)[:2])
+    models.TranslationEvent.objects.filter(pk__in=old).update(
+        created_at=django_timezone.now() - timedelta(days=200)
+    )
+    return endpoint
+
+
+@pytest.mark.django_db
+def test_prune_deletes_old_events_and_keeps_rollups(old_and_new_events):
+    rollups = models.TranslationTrafficRollup.objects.count()
+    cutoff = django_timezone.now() - timedelta(days=90)
+
+    assert prune_events(cutoff, batch_size=1, dry_run=True)["deleted_rows"] == 2
+    assert models.TranslationEvent.objects.count() == 3
+
+    result = prune_events(cutoff, batch_size=1)
+
+    if not is_partitioned():
+        assert result == {"dropped_partitions": [], "deleted_rows": 2, "deleted_payloads": 0}
+    assert models.TranslationEvent.objects.count() == 1
+    assert models.TranslationTrafficRollup.objects.count() == rollups
+    old_and_new_events.refresh_from_db()
+    assert old_and_new_events.success_count == 3
+
+
+@pytest.mark.django_db
+def test_prune_command_reports_what_it_removed(old_and_new_events):
+    out = StringIO()
+
+    call_command("prune_translation_events", "--retention-days", "90", stdout=out)
+
+    assert "Removed events before" in out.getvalue()
+    assert models.TranslationEvent.objects.count() == 1
+
+
+@postgresql_only
+@pytest.mark.django_db
+def test_old_partitions_are_dropped_whole(make_endpoint):
+    since = django_timezone.now() - timedelta(days=400)
+    ensure_partitions(since=since, interval="month")
+    names = [name for name, _, _ in list_partitions()]
+    assert partition_name(partition_start(since, "month"), "month") in names
+    assert "web_translationevent_default" in names
+
+    result = prune_events(django_timezone.now() - timedelta(days=90))
+
+    assert partition_name(partition_start(since, "month"), "month") in result["dropped_partitions"]
+    assert partition_name(partition_start(since, "month"), "month") not in [
+        name for name, _, _ in list_partitions()
+    ]
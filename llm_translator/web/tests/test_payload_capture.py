@@ -0,0 +1,70 @@
+import pytest
+from rest_framework.test import APIClient
+from web import models
+from web.events import event_sink
+
+
+@pytest.fixture
+def translate(account, make_endpoint, make_spec):
+    def translate(capture: dict, body: bytes = b'{"a": 1}'):
+        endpoint = make_endpoint("endpoint")
+        endpoint.definition = {"payload_capture": capture}
+        endpoint.save()
+        spec = make_spec(endpoint, "spec")
+        spec.is_active = True
+        spec.save()
+        models.TranslationArtifact.objects.create(
+            spec=spec,
+            implementation=(
+                b"def translate(data):\n"
+                b"    return ('<r>' + data.decode(errors='replace') + '</r>').encode()\n"
+            ),
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer test_key")
+        response = client.post(
+            "/api/translate/endpoint", data=body, content_type="application/json"
+        )
+        assert response.status_code == 200, response.content
+        event_sink.flush()
+        return models.TranslationEvent.objects.get().context
+
+    return translate
+
+
+@pytest.mark.django_db
+def test_hash_mode_stores_no_body(translate):
+    context = translate({"mode": "hash"})
+
+    assert "body" not in context["request"]
+    assert context["request"]["size"] == 8
+    assert len(context["request"]["sha256"]) == 64
+    assert "body" not in context["translated"]
+
+
+@pytest.mark.django_db
+def test_truncate_mode_keeps_prefix_of_non_utf8_bodies(translate):
+    context = translate({"mode": "truncate", "truncate_bytes": 4}, body=b'\xff{"a": 1}')
+
+    assert context["request"]["truncated"] is True
+    assert context["request"]["body"] == '{"a'
+
+
+@pytest.mark.django_db
+def test_blob_mode_stores_compressed_payloads(translate):
+    context = translate({"mode": "blob"})
+
+    payload = models.TranslationPayload.objects.get(uuid=context["translated"]["payload"])
+    assert payload.body == b'<r>{"a": 1}</r>'
+    assert models.TranslationPayload.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_invalid_capture_policy_is_rejected(api_client):
+    response = api_client.post(
+        "/api/endpoints/",
+        data={"key": "k", "name": "n", "definition": {"payload_capture": {"mode": "all"}}},
+        format="json",
+    )
+
+    assert response.status_code == 400
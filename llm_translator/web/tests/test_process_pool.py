@@ -0,0 +1,66 @@
+import time
+import threading
+import pytest
+from web.translator.process_pool import ArtifactExecutionError, ArtifactProcessPool
+
+COUNTING = """
+calls = []
+
+def translate(body):
+    calls.append(body)
+    return str(len(calls)).encode()
+"""
+
+SLEEPING = """
+import time
+
+def translate(body):
+    time.sleep(60)
+    return body
+"""
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(size: int, timeout: float = 30) -> ArtifactProcessPool:
+        pools.append(ArtifactProcessPool(size=size, timeout=timeout, max_calls_per_worker=100))
+        return pools[-1]
+
+    yield make
+    for pool in pools:
+        pool.restart()
+
+
+def test_workers_keep_loaded_artifacts_by_key(make_pool):
+    pool = make_pool(size=1)
+
+    assert pool.run(("a", "v1"), COUNTING, b"x") == b"1"
+    # The worker already has this version, so the source is not sent again
+    assert pool.run(("a", "v1"), "def translate(body:\n", b"x") == b"2"
+    assert pool.run(("a", "v2"), COUNTING, b"x") == b"1"
+
+
+def test_timeout_restarts_the_pool_and_fails_other_calls(make_pool):
+    pool = make_pool(size=2)
+    pool.run(("warm", "v1"), COUNTING, b"x")
+    other = {}
+
+    def run_other():
+        started = time.monotonic()
+        try:
+            pool.run(("other", "v1"), SLEEPING, b"x", timeout=30)
+        except ArtifactExecutionError as e:
+            other["error"], other["seconds"] = e, time.monotonic() - started
+
+    thread = threading.Thread(target=run_other)
+    thread.start()
+    time.sleep(0.5)
+    with pytest.raises(ArtifactExecutionError, match="timed out"):
+        pool.run(("stuck", "v1"), SLEEPING, b"x", timeout=1)
+    thread.join(5)
+
+    assert "restarted" in str(other["error"])
+    assert other["seconds"] < 5
+    assert pool.run(("a", "v1"), COUNTING, b"x") == b"1"
@@ -0,0 +1,153 @@
+"""
+Regression tests for the management API: the number of queries a request
+issues must not depend on how many rows it returns.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from web import models
+from web.constants import TranslationEventStatus, TranslationTestCaseStatus
+from web.events import event_sink
+
+
+def count_queries(client, url) -> int:
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200, response.content
+    return len(queries)
+
+
+def add_traffic(endpoint):
+    event_sink.write(
+        [
+            models.TranslationEvent(
+                endpoint=endpoint, status=status, context={"duration": 0.1}
+            )
+            for status in (TranslationEventStatus.SUCCESS, TranslationEventStatus.FAILURE)
+        ]
+    )
+
+
+@pytest.mark.django_db
+def test_endpoint_list_queries_do_not_grow_with_endpoints(api_client, make_endpoint):
+    for i in range(2):
+        add_traffic(make_endpoint(f"endpoint-{i}"))
+    few = count_queries(api_client, "/api/endpoints/")
+
+    for i in range(2, 12):
+        add_traffic(make_endpoint(f"endpoint-{i}"))
+    many = count_queries(api_client, "/api/endpoints/")
+
+    assert few == many == 5
+
+
+@pytest.mark.django_db
+def test_endpoint_list_returns_traffic_and_counters(api_client, make_endpoint):
+    add_traffic(make_endpoint("endpoint"))
+
+    data = api_client.get("/api/endpoints/").json()
+
+    assert data["count"] == 1
+    endpoint = data["results"][0]
+    assert endpoint["total_success"] == 1
+    assert endpoint["total_failure"] == 1
+    assert set(endpoint["traffic"]) == {"SUCCESS", "FAILURE"}
+
+
+@pytest.mark.django_db
+def test_endpoint_list_is_paginated(api_client, make_endpoint):
+    for i in range(3):
+        make_endpoint(f"endpoint-{i}")
+
+    data = api_client.get("/api/endpoints/?page_size=2").json()
+
+    assert data["count"] == 3
+    assert len(data["results"]) == 2
+    assert data["next"]
+
+
+@pytest.mark.django_db
+def test_spec_list_queries_do_not_grow_with_specs(api_client, make_endpoint, make_spec):
+    endpoint = make_endpoint("endpoint")
+    make_spec(endpoint, "spec-0")
+    url = f"/api/endpoints/{endpoint.uuid}/specs/"
+    few = count_queries(api_client, url)
+
+    for i in range(1, 10):
+        make_spec(endpoint, f"spec-{i}")
+    many = count_queries(api_client, url)
+
+    assert few == many
+
+
+@pytest.mark.django_db
+def test_test_case_detail_reads_last_execution_in_one_query(
+    api_client, make_endpoint, make_spec
+):
+    spec = make_spec(make_endpoint("endpoint"), "spec")
+    test_case = models.SpecTestCase.objects.create(
+        name="case",
+        spec=spec,
+        definition={"input": {"body": "{}"}, "expectation": {"body": "<r/>"}},
+    )
+    for status in (TranslationTestCaseStatus.FAILURE, TranslationTestCaseStatus.SUCCESS):
+        models.SpecTestCaseExecution.objects.create(
+            test_case=test_case, executed_at="2025-01-01T00:00:00Z", status=status, result={}
+        )
+    url = f"/api/specs/{spec.uuid}/testcases/{test_case.uuid}/"
+
+    with CaptureQueriesContext(connection) as queries:
+        data = api_client.get(url).json()
+
+    assert data["last_execution"]["status"] == TranslationTestCaseStatus.SUCCESS
+    assert len(queries) == 2
+
+
+@pytest.mark.django_db
+def test_account_by_endpoint_queries_do_not_grow_with_keys(
+    api_client, account, make_endpoint
+):
+    endpoint = make_endpoint("endpoint")
+    url = f"/api/accounts/by_endpoint/{endpoint.uuid}"
+    few = count_queries(api_client, url)
+
+    for i in range(10):
+        models.AccountAPIKey.objects.create(account=account, key=f"key-{i}")
+    many = count_queries(api_client, url)
+
+    assert few == many
+
+
+@pytest.mark.django_db
+def test_translate_authentication_is_cached(account, make_endpoint, make_spec):
+    spec = make_spec(make_endpoint("endpoint"), "spec")
+    spec.is_active = True
+    spec.save()
+    models.TranslationArtifact.objects.create(
+        spec=spec,
+        implementation=b"def translate(data):\n    return b'<r/>'\n",
+    )
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer test_key")
+    assert client.post("/api/translate/endpoint", data={}, format="json").status_code == 200
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post("/api/translate/endpoint", data={}, format="json")
+
+    assert response.status_code == 200
+    assert not [q for q in queries if "accountapikey" in q["sql"] or "auth_user" in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_deactivated_api_key_is_rejected(account, make_endpoint):
+    make_endpoint("endpoint")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer test_key")
+    client.post("/api/translate/endpoint", data={}, format="json")
+
+    api_key = models.AccountAPIKey.objects.get(key="test_key")
+    api_key.is_active = False
+    api_key.save()
+
+    assert client.post("/api/translate/endpoint", data={}, format="json").status_code == 401
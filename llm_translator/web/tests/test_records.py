@@ -0,0 +1,105 @@
+import io
+import time
+import json
+import pytest
+from web.translator.records import iter_stream_records
+
+ARRAY = '[{"name": "café ☃", "quote": "a \\"b\\" \\\\ c\\u00e9"}, "<a>ü</a>", 12345, [1, 2]]'
+
+
+def records(payload, content_type=None, chunk_size=64 * 1024):
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return iter_stream_records(io.BytesIO(payload), content_type, chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64 * 1024])
+def test_json_array_elements_survive_any_chunk_boundary(chunk_size):
+    result = list(records(ARRAY, chunk_size=chunk_size))
+
+    # Strings are passed verbatim, other values as written
+    assert result == [
+        '{"name": "café ☃", "quote": "a \\"b\\" \\\\ c\\u00e9"}'.encode(),
+        "<a>ü</a>".encode(),
+        b"12345",
+        b"[1, 2]",
+    ]
+    assert json.loads(result[0])["quote"] == 'a "b" \\ cé'
+
+
+@pytest.mark.parametrize("payload", ["[]", " [ ] ", "[\n]"])
+def test_empty_json_array_has_no_records(payload):
+    assert list(records(payload, chunk_size=1)) == []
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    [
+        ('[{"a": 1}, {"b": }, {"c": 3}]', "Invalid JSON array element"),
+        ('[{"a": 1} {"c": 3}]', "Expected ','"),
+        ('[{"a": 1},, {"c": 3}]', "Unexpected ','"),
+        ('[{"a": 1}, ]', "Unexpected ']'"),
+        ('[{"a": 1}, {"c": 3}', "Unexpected end"),
+    ],
+)
+def test_malformed_json_array_fails_after_the_valid_records(payload, message):
+    stream = records(payload, chunk_size=3)
+
+    assert next(stream) == b'{"a": 1}'
+    with pytest.raises(ValueError, match=message):
+        list(stream)
+
+
+def test_stream_must_be_a_json_array():
+    with pytest.raises(ValueError, match="must be a JSON array"):
+        list(records('{"a": 1}'))
+
+
+def test_ndjson_lines_are_split_and_blank_lines_skipped():
+    payload = '{"a": 1}\n\n  "<b>é</b>"\r\n[1, 2]'
+
+    assert list(records(payload, "application/x-ndjson; charset=utf-8")) == [
+        b'{"a": 1}',
+        "<b>é</b>".encode(),
+        b"[1, 2]",
+    ]
+
+
+def test_malformed_ndjson_line_fails_after_the_valid_records():
+    stream = records('{"a": 1}\n{"b": \n{"c": 3}\n', "application/x-ndjson")
+
+    assert next(stream) == b'{"a": 1}'
+    with pytest.raises(ValueError, match="line 2"):
+        list(stream)
+
+
+def test_csv_rows_keep_the_header():
+    payload = 'id,comment\n1,"multi\nline, quoted"\n\n2,café\n'
+
+    assert list(records(payload, "text/csv")) == [
+        b'id,comment\n1,"multi\nline, quoted"\n',
+        "id,comment\n2,café\n".encode(),
+    ]
+
+
+@pytest.mark.parametrize("payload", ["", "id,comment\n"])
+def test_csv_without_rows_has_no_records(payload):
+    assert list(records(payload, "text/csv")) == []
+
+
+def test_invalid_utf8_fails_after_the_valid_records():
+    stream = records(b'[{"a": 1}, "\xff"]', chunk_size=3)
+
+    assert next(stream) == b'{"a": 1}'
+    with pytest.raises(ValueError):
+        list(stream)
+
+
+def test_many_small_records_in_one_chunk_split_in_linear_time():
+    payload = "[" + ",".join(["1"] * 200_000) + "]"
+
+    started = time.perf_counter()
+    result = list(records(payload, chunk_size=len(payload)))
+
+    assert len(result) == 200_000
+    assert time.perf_counter() - started < 5
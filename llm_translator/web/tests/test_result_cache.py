@@ -0,0 +1,85 @@
+import pytest
+from django.test import override_settings
+from web.constants import EngineOptions, TranslationCacheStatus
+from web.translator.executors import DynamicTranslatorExecutor
+from web.translator.models import TranslatedContext, TranslationContext
+from web.translator.result_cache import TranslationResultCache
+
+
+def translated(body) -> TranslatedContext:
+    return TranslatedContext(content_type="xml", body=body, provider="dspy")
+
+
+def make_cache(**kwargs) -> TranslationResultCache:
+    options = dict(enabled=True, ttl=60, max_entries=10, max_bytes=1024)
+    options.update(kwargs)
+    return TranslationResultCache(**options)
+
+
+def test_entries_expire_after_their_ttl():
+    cache = make_cache()
+    cache.set("fresh", translated("<a/>"), ttl=60)
+    cache.set("expired", translated("<a/>"), ttl=0)
+
+    assert cache.get("fresh").body == "<a/>"
+    assert cache.get("expired") is None
+
+
+def test_least_recently_used_entries_are_evicted_by_count():
+    cache = make_cache(max_entries=2)
+    cache.set("a", translated("<a/>"), ttl=60)
+    cache.set("b", translated("<b/>"), ttl=60)
+    cache.get("a")
+    cache.set("c", translated("<c/>"), ttl=60)
+
+    assert [key for key in "abc" if cache.get(key)] == ["a", "c"]
+
+
+def test_byte_budget_counts_encoded_bodies():
+    cache = make_cache(max_bytes=12)
+    # 4 characters, 12 bytes in UTF-8
+    cache.set("a", translated("☃☃☃☃"), ttl=60)
+    cache.set("b", translated(b"<b/>"), ttl=60)
+    cache.set("too-large", translated("☃" * 5), ttl=60)
+
+    assert cache.get("a") is None
+    assert cache.get("b").body == b"<b/>"
+    assert cache.get("too-large") is None
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "shared"},
+    }
+)
+def test_backend_tier_is_shared_between_processes():
+    writer = make_cache(backend="shared")
+    reader = make_cache(backend="shared")
+    writer.set("key", translated("<a/>"), ttl=60)
+
+    assert reader.get("key").body == "<a/>"
+    # Now also held in the reader's in-process tier
+    reader.backend = None
+    assert reader.get("key").body == "<a/>"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "cache_results, statuses",
+    [
+        (True, [TranslationCacheStatus.MISS, TranslationCacheStatus.HIT]),
+        (False, [TranslationCacheStatus.BYPASS, TranslationCacheStatus.BYPASS]),
+    ],
+)
+def test_dynamic_engine_reports_the_cache_status(make_endpoint, make_spec, cache_results, statuses):
+    endpoint = make_endpoint("endpoint")
+    spec = make_spec(endpoint, "spec")
+    spec.definition.update(engine=EngineOptions.DYNAMIC, cache_results=cache_results)
+    spec.save()
+    context = TranslationContext(endpoint=endpoint, content_type="json", body=b"{}")
+
+    results = [DynamicTranslatorExecutor(context, spec).run() for _ in range(2)]
+
+    assert [r.cache for r in results] == statuses
+    assert results[0].body == results[1].body
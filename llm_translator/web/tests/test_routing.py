@@ -0,0 +1,84 @@
+import time
+import pytest
+from web import models
+from web.translator.routing import TranslationRoutingTable, routing_table
+
+IMPLEMENTATION = b"def translate(body):\n    return b'<ok/>'\n"
+
+
+@pytest.fixture
+def endpoint(make_endpoint, make_spec):
+    endpoint = make_endpoint("endpoint")
+    for name in ("first", "second"):
+        make_spec(endpoint, name)
+    models.TranslationSpec.objects.filter(name="first").update(is_active=True)
+    return endpoint
+
+
+def active_spec_names(endpoint_id, table=routing_table):
+    return [spec.name for spec in table.resolve(endpoint_id).active_specs]
+
+
+@pytest.mark.django_db
+def test_routes_are_cached_by_uuid_and_key(endpoint, django_assert_num_queries):
+    route = routing_table.resolve(str(endpoint.uuid))
+
+    with django_assert_num_queries(0):
+        assert routing_table.resolve(str(endpoint.uuid)) is route
+        assert routing_table.resolve("endpoint") is route
+    assert routing_table.resolve("missing") is None
+
+
+@pytest.mark.django_db
+def test_saving_an_endpoint_invalidates_its_route(endpoint):
+    routing_table.resolve("endpoint")
+
+    endpoint.name = "renamed"
+    endpoint.save()
+
+    assert routing_table.resolve("endpoint").endpoint.name == "renamed"
+
+
+@pytest.mark.django_db
+def test_saving_a_spec_invalidates_its_route(endpoint):
+    assert active_spec_names("endpoint") == ["first"]
+
+    spec = models.TranslationSpec.objects.get(name="first")
+    spec.is_active = False
+    spec.save()
+
+    assert active_spec_names("endpoint") == []
+
+
+@pytest.mark.django_db
+def test_saving_an_artifact_invalidates_its_route(endpoint):
+    assert routing_table.resolve("endpoint").artifact is None
+
+    spec = models.TranslationSpec.objects.get(name="first")
+    artifact = models.TranslationArtifact.objects.create(spec=spec, implementation=IMPLEMENTATION)
+
+    assert routing_table.resolve("endpoint").artifact == artifact
+
+
+@pytest.mark.django_db
+def test_activating_a_spec_invalidates_the_route(api_client, endpoint):
+    assert active_spec_names("endpoint") == ["first"]
+    second = models.TranslationSpec.objects.get(name="second")
+
+    response = api_client.post(f"/api/specs/{second.uuid}/activate")
+
+    assert response.status_code == 200
+    assert active_spec_names("endpoint") == ["second"]
+
+
+@pytest.mark.django_db
+def test_routes_expire_after_the_ttl(endpoint):
+    table = TranslationRoutingTable(ttl=0.05)
+    assert active_spec_names("endpoint", table) == ["first"]
+
+    # Changes made by other processes never reach this process' signals
+    models.TranslationSpec.objects.update(is_active=False)
+    assert active_spec_names("endpoint", table) == ["first"]
+
+    time.sleep(0.1)
+    assert active_spec_names("endpoint", table) == []
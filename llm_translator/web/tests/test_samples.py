@@ -0,0 +1,40 @@
+from web.schemas import SpecTestCaseDefinitionSchema
+from web.translator.samples import SampleSelector, body_shape
+
+
+def case(input_body: str, expected_body: str = "<ok/>") -> SpecTestCaseDefinitionSchema:
+    return SpecTestCaseDefinitionSchema(
+        input={"body": input_body}, expectation={"body": expected_body}
+    )
+
+
+def test_body_shape_ignores_values():
+    assert body_shape('{"a": 1, "b": [{"c": "x"}]}') == body_shape('{"b": [{"c": "y"}], "a": 2}')
+    assert body_shape('<a x="1"><b/></a>') == frozenset({"/a", "/a@x", "/a/b"})
+    assert body_shape('{"a": 1}') != body_shape('{"a": "1"}')
+
+
+def test_selection_deduplicates_shapes_within_budget():
+    small = case('{"name": "a"}')
+    same_shape = case('{"name": "a much longer value with the same shape"}')
+    nested = case('{"name": "b", "tags": ["x"], "owner": {"id": 1}}')
+    large = case('{"blob": "' + "x" * 4000 + '"}')
+
+    selection = SampleSelector(token_budget=60, max_body_tokens=20).select(
+        [same_shape, small, nested, large]
+    )
+
+    # `small` adds no field `nested` lacks, so the budget goes to `large`
+    assert [s.definition for s in selection.selected] == [nested, large]
+    assert selection.held_out == [same_shape, small]
+    assert selection.tokens <= 60
+    assert "[truncated" in selection.input_samples
+
+
+def test_one_case_is_selected_even_over_budget():
+    large = case('{"blob": "' + "x" * 4000 + '"}')
+
+    selection = SampleSelector(token_budget=10, max_body_tokens=20).select([large])
+
+    assert [s.definition for s in selection.selected] == [large]
+    assert "[truncated" in selection.input_samples
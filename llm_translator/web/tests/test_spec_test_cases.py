@@ -0,0 +1,78 @@
+import time
+import pytest
+from web import models
+from web.constants import TranslationTestCaseStatus
+from web.manager import SpecTestCaseExecutor
+from web.translator.artifact_cache import compiled_artifact_cache
+
+IMPLEMENTATION = b"""
+import time
+
+def translate(body):
+    if body == b"slow":
+        time.sleep(1)
+    return b"<ok/>"
+"""
+
+
+@pytest.fixture
+def spec(make_endpoint, make_spec):
+    spec = make_spec(make_endpoint("endpoint"), "spec")
+    models.TranslationArtifact.objects.create(spec=spec, implementation=IMPLEMENTATION)
+    return spec
+
+
+def add_case(spec, name, body):
+    return models.SpecTestCase.objects.create(
+        name=name,
+        spec=spec,
+        definition={"input": {"body": body}, "expectation": {"body": "<ok/>"}},
+    )
+
+
+@pytest.mark.django_db
+def test_cases_run_concurrently_with_one_compile(monkeypatch, spec):
+    for i in range(5):
+        add_case(spec, f"case-{i}", "{}")
+    compiles = []
+    compile_artifact = compiled_artifact_cache.compile
+    monkeypatch.setattr(
+        compiled_artifact_cache,
+        "compile",
+        lambda artifact: compiles.append(artifact) or compile_artifact(artifact),
+    )
+    progress = []
+
+    response = SpecTestCaseExecutor(spec, parallelism=4).run_all(
+        progress=lambda done, total: progress.append((done, total))
+    )
+
+    assert response.success
+    assert len(compiles) == 1
+    assert progress[-1] == (5, 5)
+    assert models.SpecTestCaseExecution.objects.count() == 5
+    assert set(models.SpecTestCase.objects.values_list("status", flat=True)) == {
+        TranslationTestCaseStatus.SUCCESS.value
+    }
+
+
+@pytest.mark.django_db
+def test_a_slow_case_times_out_without_holding_up_the_others(spec):
+    slow = add_case(spec, "slow", "slow")
+    for i in range(3):
+        add_case(spec, f"case-{i}", "{}")
+
+    started = time.monotonic()
+    response = SpecTestCaseExecutor(spec, parallelism=2, timeout=0.2).run_all()
+
+    assert time.monotonic() - started < 1
+    assert not response.success
+    statuses = dict(models.SpecTestCase.objects.values_list("name", "status"))
+    assert statuses == {
+        "slow": TranslationTestCaseStatus.FAILURE.value,
+        "case-0": TranslationTestCaseStatus.SUCCESS.value,
+        "case-1": TranslationTestCaseStatus.SUCCESS.value,
+        "case-2": TranslationTestCaseStatus.SUCCESS.value,
+    }
+    execution = models.SpecTestCaseExecution.objects.get(test_case=slow)
+    assert "timed out" in execution.result["message"]
@@ -0,0 +1,38 @@
+import json
+import pytest
+from rest_framework.test import APIClient
+from web.constants import EngineOptions
+from web.llm.stub import StubResponses, messages_key
+
+
+def test_stub_responses_replay_recordings_before_rules(tmp_path):
+    messages = [{"role": "user", "content": "[[ ## input_type ## ]]\njson"}]
+    recordings = tmp_path / "responses.jsonl"
+    recordings.write_text(
+        "# comment\n"
+        + json.dumps({"key": messages_key(messages), "response": "recorded"})
+        + "\n"
+        + json.dumps({"contains": ["input_type", "json"], "output": "<rule/>"})
+        + "\n"
+    )
+    responses = StubResponses.load(recordings, default_output="<default/>")
+
+    assert responses.respond(messages) == "recorded"
+    assert "<rule/>" in responses.respond([{"role": "user", "content": "input_type: json!"}])
+    assert "<default/>" in responses.respond([{"role": "user", "content": "xml"}])
+
+
+@pytest.mark.django_db
+def test_dynamic_engine_answers_from_stub(make_endpoint, make_spec):
+    endpoint = make_endpoint("endpoint")
+    spec = make_spec(endpoint, "spec")
+    spec.definition["engine"] = EngineOptions.DYNAMIC
+    spec.is_active = True
+    spec.save()
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer test_key")
+
+    response = client.post("/api/translate/endpoint", data=b"{}", content_type="application/json")
+
+    assert response.status_code == 200, response.content
+    assert response.json()["body"] == "<stub/>"
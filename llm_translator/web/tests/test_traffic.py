@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+import pytest
+from web import models
+from web.constants import TranslationEventStatus
+from web.events import event_sink
+from web.traffic import rebuild_rollups
+
+
+@pytest.mark.django_db
+def test_rebuild_without_since_keeps_rollups_of_pruned_events(make_endpoint):
+    endpoint = make_endpoint("endpoint")
+    # Rollup of a minute whose events were pruned by retention
+    models.TranslationTrafficRollup.objects.create(
+        endpoint=endpoint,
+        minute=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        status=TranslationEventStatus.SUCCESS,
+        count=7,
+    )
+    event_sink.write(
+        [
+            models.TranslationEvent(
+                endpoint=endpoint, status=TranslationEventStatus.SUCCESS, context={"duration": 0.1}
+            )
+            for _ in range(2)
+        ]
+    )
+    models.TranslationTrafficRollup.objects.filter(count=2).update(count=5)
+
+    assert rebuild_rollups() == 1
+    assert sorted(
+        models.TranslationTrafficRollup.objects.values_list("count", flat=True)
+    ) == [2, 7]
+
+
+@pytest.mark.django_db
+def test_saving_an_endpoint_keeps_its_counters(make_endpoint):
+    endpoint = make_endpoint("endpoint")
+    event_sink.write(
+        [
+            models.TranslationEvent(
+                endpoint=endpoint, status=TranslationEventStatus.FAILURE, context={"duration": 0.1}
+            )
+        ]
+    )
+
+    endpoint.name = "renamed"
+    endpoint.save()
+
+    endpoint.refresh_from_db()
+    assert (endpoint.name, endpoint.success_count, endpoint.failure_count) == ("renamed", 0, 1)
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from web import models
+from web.llm.dspy_interfaces import TranslationPromptModule
+from web.llm.stub import StubLM
+from web.metrics import llm_tokens
+from web.constants import EngineOptions, TranslationCacheStatus
+
+
+@pytest.fixture
+def dynamic_endpoint(make_endpoint, make_spec):
+    endpoint = make_endpoint("endpoint")
+    spec = make_spec(endpoint, "spec")
+    spec.definition["engine"] = EngineOptions.DYNAMIC
+    spec.is_active = True
+    spec.save()
+    return endpoint
+
+
+def post(path, body=b"{}", **headers):
+    # async_to_sync keeps thread-sensitive work on this thread, so the async
+    # view sees the test transaction
+    return async_to_sync(AsyncClient().post)(
+        path, data=body, content_type="application/json", headers=headers
+    )
+
+
+@pytest.mark.django_db
+def test_async_route_translates_with_the_stub_lm(dynamic_endpoint):
+    responses = [
+        post("/api/translate/endpoint/async", Authorization="Bearer test_key") for _ in range(2)
+    ]
+
+    assert [r.status_code for r in responses] == [200, 200], responses[0].content
+    assert responses[0].json()["success"]
+    assert responses[0].json()["body"] == "<stub/>"
+    events = models.TranslationEvent.objects.filter(endpoint=dynamic_endpoint).order_by("created_at")
+    assert [e.context["translated"]["cache"] for e in events] == [
+        TranslationCacheStatus.MISS.value,
+        TranslationCacheStatus.HIT.value,
+    ]
+    dynamic_endpoint.refresh_from_db()
+    assert dynamic_endpoint.success_count == 2
+    # Tokens of the LM call made for the cache miss
+    assert llm_tokens.value(endpoint="endpoint", lm="openai/stub", kind="prompt") > 0
+    assert llm_tokens.value(endpoint="endpoint", lm="openai/stub", kind="completion") > 0
+
+
+@pytest.mark.django_db
+def test_async_route_requires_an_api_key(dynamic_endpoint):
+    assert post("/api/translate/endpoint/async").status_code == 401
+    assert post("/api/translate/endpoint/async", Authorization="Bearer wrong").status_code == 401
+
+
+def test_concurrent_async_calls_track_their_own_usage():
+    import dspy
+
+    async def translate(module, data):
+        await module.aforward("json", "xml", data)
+        return module.last_usage["openai/stub"]
+
+    async def main():
+        modules = [TranslationPromptModule(), TranslationPromptModule()]
+        return await asyncio.gather(
+            translate(modules[0], "{}"), translate(modules[1], "{" + '"a": 1, ' * 200 + "}")
+        )
+
+    with dspy.context(lm=StubLM(latency=0.05)):
+        short, long = asyncio.run(main())
+
+    assert short["prompt_tokens"] < long["prompt_tokens"]
+    assert short["completion_tokens"] == long["completion_tokens"]
@@ -0,0 +1,20 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "body, content_type",
+    [(b"[]", "application/json"), (b"\n\n", "application/x-ndjson")],
+)
+def test_empty_batch_is_rejected(account, make_endpoint, body, content_type):
+    make_endpoint("endpoint")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer test_key")
+
+    response = client.post(
+        "/api/translate/endpoint/batch", data=body, content_type=content_type
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {"success": False, "message": "Batch has no items"}
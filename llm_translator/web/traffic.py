@@ -0,0 +1,212 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Max, Min, OuterRef, QuerySet, Subquery, Sum, Value
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, Coalesce, Greatest, Least, TruncMinute
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .constants import TranslationEventStatus
+from .models import TranslationEndpoint, TranslationEvent, TranslationTrafficRollup
+
+logger = logging.getLogger(f"llm_translator.{__name__}")
+
+
+def minute_of(moment: datetime) -> datetime:
+    return moment.replace(second=0, microsecond=0)
+
+
+def record_events(events: Iterable[TranslationEvent]) -> None:
+    """
+    Adds freshly written events to the per-minute rollups and the endpoints'
+    success/failure counters. Buckets are created if missing and then
+    incremented with a single UPDATE each, so concurrent writers never lose
+    counts. Rows are updated in key order, so concurrent writers lock them in
+    the same order and cannot deadlock.
+    """
+    buckets = defaultdict(lambda: {"count": 0, "sum": 0.0, "min": None, "max": None})
+    counters = defaultdict(lambda: {"success_count": 0, "failure_count": 0})
+    for event in events:
+        counter = "success_count" if event.status == TranslationEventStatus.SUCCESS else "failure_count"
+        # Ids as strings, so the keys sort whatever type the events hold
+        endpoint_id = str(event.endpoint_id)
+        counters[endpoint_id][counter] += 1
+        bucket = buckets[(endpoint_id, minute_of(event.created_at), event.status)]
+        latency = float((event.context or {}).get("duration") or 0)
+        bucket["count"] += 1
+        bucket["sum"] += latency
+        bucket["min"] = latency if bucket["min"] is None else min(bucket["min"], latency)
+        bucket["max"] = latency if bucket["max"] is None else max(bucket["max"], latency)
+    if not buckets:
+        return
+
+    with transaction.atomic():
+        TranslationTrafficRollup.objects.bulk_create(
+            [
+                TranslationTrafficRollup(endpoint_id=endpoint_id, minute=minute, status=status)
+                for endpoint_id, minute, status in sorted(buckets)
+            ],
+            ignore_conflicts=True,
+        )
+        for (endpoint_id, minute, status), bucket in sorted(buckets.items()):
+            TranslationTrafficRollup.objects.filter(
+                endpoint_id=endpoint_id, minute=minute, status=status
+            ).update(
+                count=F("count") + bucket["count"],
+                latency_sum=F("latency_sum") + bucket["sum"],
+                latency_min=Least(Coalesce("latency_min", Value(bucket["min"])), Value(bucket["min"])),
+                latency_max=Greatest(Coalesce("latency_max", Value(bucket["max"])), Value(bucket["max"])),
+                updated_at=timezone.now(),
+            )
+        for endpoint_id, counts in sorted(counters.items()):
+            TranslationEndpoint.objects.filter(uuid=endpoint_id).update(
+                **{name: F(name) + count for name, count in counts.items() if count}
+            )
+
+
+def rebuild_rollups(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    endpoint_id: Optional[str] = None,
+) -> int:
+    """
+    Recomputes the rollups of the minutes in [since, until) from the events
+    table and returns the number of buckets written. Without `since`, the
+    rebuild starts at the oldest event left, since rollups outlive the events
+    pruned by retention. Rollups of minutes being written concurrently may be
+    off, so `until` should be in the past.
+    """
+    events = TranslationEvent.objects.all()
+    rollups = TranslationTrafficRollup.objects.all()
+    if endpoint_id:
+        events = events.filter(endpoint_id=endpoint_id)
+        rollups = rollups.filter(endpoint_id=endpoint_id)
+    if not since:
+        since = events.aggregate(oldest=Min("created_at"))["oldest"]
+        if since is None:
+            logger.info("No translation events to rebuild traffic rollups from")
+            return 0
+    since = minute_of(since)
+    events = events.filter(created_at__gte=since)
+    rollups = rollups.filter(minute__gte=since)
+    if until:
+        until = minute_of(until)
+        events = events.filter(created_at__lt=until)
+        rollups = rollups.filter(minute__lt=until)
+
+    latency = Cast(KT("context__duration"), FloatField())
+    aggregated = (
+        events.annotate(bucket=TruncMinute("created_at"))
+        .values("endpoint_id", "bucket", "status")
+        .annotate(
+            count=Count("uuid"),
+            latency_sum=Coalesce(Sum(latency), 0.0),
+            latency_min=Min(latency),
+            latency_max=Max(latency),
+        )
+        .order_by()
+    )
+
+    with transaction.atomic():
+        rollups.delete()
+        created = TranslationTrafficRollup.objects.bulk_create(
+            (
+                TranslationTrafficRollup(
+                    endpoint_id=row["endpoint_id"],
+                    minute=row["bucket"],
+                    status=row["status"],
+                    count=row["count"],
+                    latency_sum=row["latency_sum"],
+                    latency_min=row["latency_min"],
+                    latency_max=row["latency_max"],
+                )
+                for row in aggregated.iterator()
+            ),
+            batch_size=1000,
+        )
+    logger.info(f"Rebuilt {len(created)} traffic rollup buckets")
+    return len(created)
+
+
+def reconcile_counters(endpoint_id: Optional[str] = None) -> None:
+    """Resets the endpoints' success/failure counters to the rollup totals."""
+
+    def total(status: TranslationEventStatus):
+        return Coalesce(
+            Subquery(
+                TranslationTrafficRollup.objects.filter(
+                    endpoint=OuterRef("pk"), status=status
+                )
+                .values("endpoint")
+                .annotate(total=Sum("count"))
+                .values("total")
+            ),
+            0,
+        )
+
+    endpoints = TranslationEndpoint.objects.all()
+    if endpoint_id:
+        endpoints = endpoints.filter(uuid=endpoint_id)
+    endpoints.update(
+        success_count=total(TranslationEventStatus.SUCCESS),
+        failure_count=total(TranslationEventStatus.FAILURE),
+    )
+
+
+def parse_traffic_range(params) -> tuple[datetime, Optional[datetime]]:
+    """
+    Reads the `since`/`until` ISO datetimes of a traffic query, defaulting
+    `since` to the last `TRANSLATION_TRAFFIC["DEFAULT_WINDOW_HOURS"]` hours.
+    Raises ValueError naming the invalid parameter.
+    """
+    bounds = []
+    for name in ("since", "until"):
+        value = params.get(name)
+        parsed = parse_datetime(value) if value else None
+        if value and not parsed:
+            raise ValueError(name)
+        if parsed and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        bounds.append(parsed)
+    since, until = bounds
+    if not since:
+        hours = getattr(settings, "TRANSLATION_TRAFFIC", {}).get("DEFAULT_WINDOW_HOURS", 24)
+        since = timezone.now() - timedelta(hours=hours)
+    return since, until
+
+
+def rollups_in_range(
+    since: Optional[datetime] = None, until: Optional[datetime] = None
+) -> QuerySet:
+    rollups = TranslationTrafficRollup.objects.order_by("minute")
+    if since:
+        rollups = rollups.filter(minute__gte=minute_of(since))
+    if until:
+        rollups = rollups.filter(minute__lt=until)
+    return rollups
+
+
+def summarize_traffic(rollups: Iterable[TranslationTrafficRollup]) -> dict:
+    """
+    Returns traffic as `{status: [(minute timestamp, count)]}` in the order of
+    the given rollups.
+    """
+    traffic = {}
+    for rollup in rollups:
+        traffic.setdefault(rollup.status, []).append(
+            (rollup.minute.timestamp(), rollup.count)
+        )
+    return traffic
+
+
+def get_traffic(
+    endpoint_id, since: Optional[datetime] = None, until: Optional[datetime] = None
+) -> dict:
+    return summarize_traffic(
+        rollups_in_range(since, until)
+        .filter(endpoint_id=endpoint_id)
+        .only("status", "minute", "count")
+    )
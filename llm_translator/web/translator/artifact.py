@@ -1,9 +1,101 @@
 import re
 import logging
+from dataclasses import dataclass
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from ..constants import TranslationTestCaseStatus
 from ..models import TranslationSpec, TranslationArtifact, SpecTestCase
 from ..excpetions import ArtifcatGenerationException
 from ..schemas import TranslationSpecDefinitionSchema, SpecTestCaseDefinitionSchema
 from ..llm.dspy_interfaces import ArtifactGenerationPromptModule
+from .process_pool import run_isolated
+from .samples import SampleSelector
+
+
+@dataclass
+class ArtifactCandidate:
+    temperature: float
+    implementation: Optional[str] = None
+    passed: int = 0
+    total: int = 0
+    runtime: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def score(self) -> tuple:
+        # Candidates that load and run first, then most passing test cases,
+        # then the fastest
+        return (
+            self.implementation is not None,
+            self.error is None,
+            self.passed,
+            -self.runtime,
+        )
+
+
+@dataclass
+class CaseOutcome:
+    definition: SpecTestCaseDefinitionSchema
+    passed: bool
+    seconds: float
+    actual: Optional[str] = None
+    error: Optional[str] = None
+
+
+def evaluate_implementation(
+    implementation: str,
+    definitions: list[SpecTestCaseDefinitionSchema],
+    timeout: float,
+    start_method: str = "spawn",
+) -> list[CaseOutcome]:
+    """
+    Runs `implementation` on every test case input in a throwaway process
+    (see `run_isolated`) and checks the outputs with the same rules as
+    SpecTestCaseExecutor: a case passes when the outcome matches its expected
+    result. Raises ArtifactExecutionError when the artifact cannot run at all.
+    """
+    runs = run_isolated(
+        implementation,
+        [d.input.body.encode() for d in definitions],
+        timeout=timeout,
+        start_method=start_method,
+    )
+    outcomes = []
+    for definition, (ok, output, seconds) in zip(definitions, runs):
+        actual = output.decode(errors="replace") if ok else None
+        status = (
+            TranslationTestCaseStatus.SUCCESS
+            if ok and actual == definition.expectation.body
+            else TranslationTestCaseStatus.FAILURE
+        )
+        outcomes.append(
+            CaseOutcome(
+                definition=definition,
+                passed=status.value == definition.expectation.result.value,
+                seconds=seconds,
+                actual=actual,
+                error=None if ok else output,
+            )
+        )
+    return outcomes
+
+
+def save_artifact(
+    spec: TranslationSpec, implementation: str, generation_key: Optional[str] = None
+) -> TranslationArtifact:
+    """Creates or replaces the spec's artifact."""
+    artifact = TranslationArtifact.objects.filter(spec=spec).first()
+    if not artifact:
+        return TranslationArtifact.objects.create(
+            spec=spec,
+            implementation=implementation.encode("utf-8"),
+            generation_key=generation_key,
+        )
+    artifact.implementation = implementation.encode("utf-8")
+    artifact.generation_key = generation_key
+    artifact.save()
+    return artifact
 
 
 class AbstractArtifactGenerator:
@@ -15,9 +107,41 @@ class AbstractArtifactGenerator:
 
 
 class TranslationArtifactGenerator(AbstractArtifactGenerator):
+    """
+    Generates the spec's compiled artifact from its test cases. The prompt's
+    samples are picked by `SampleSelector` within
+    `ARTIFACT_GENERATION["SAMPLES"]`; the selection is kept in `self.samples`.
+
+    With `candidates` > 1, that many implementations are requested at once
+    with temperatures spread up to `ARTIFACT_GENERATION["MAX_TEMPERATURE"]`,
+    each is run against every test case in its own throwaway process, and the
+    one passing the most cases (then the fastest) is saved. The evaluated
+    candidates are kept in `self.evaluated`.
+    """
 
     logger = logging.getLogger(f"llm_translator.{__name__}")
 
+    def __init__(
+        self,
+        spec: TranslationSpec,
+        candidates: Optional[int] = None,
+        generation_key: Optional[str] = None,
+    ):
+        super().__init__(spec)
+        self.generation_key = generation_key
+        config = getattr(settings, "ARTIFACT_GENERATION", {})
+        self.candidates = max(1, candidates or config.get("CANDIDATES", 1))
+        self.max_temperature = config.get("MAX_TEMPERATURE", 1.0)
+        self.candidate_timeout = config.get("CANDIDATE_TIMEOUT", 30)
+        self.start_method = config.get("START_METHOD", "spawn")
+        self.evaluated: list[ArtifactCandidate] = []
+        samples = config.get("SAMPLES", {})
+        self.sample_selector = SampleSelector(
+            token_budget=samples.get("TOKEN_BUDGET", 4000),
+            max_body_tokens=samples.get("MAX_BODY_TOKENS", 1000),
+            max_samples=samples.get("MAX_SAMPLES"),
+        )
+
     def generate(self) -> TranslationArtifact:
 
         try:
@@ -29,42 +153,85 @@ class TranslationArtifactGenerator(AbstractArtifactGenerator):
             self.spec_definition = TranslationSpecDefinitionSchema(
                 **self.spec.definition
             )
+            definitions = [
+                SpecTestCaseDefinitionSchema(**tc.definition) for tc in self.test_cases
+            ]
 
-            # Build input_samples string
-            input_samples = ""
-            for tc in self.test_cases:
-                tc_def = SpecTestCaseDefinitionSchema(**tc.definition)
-                input_samples += f"""
-[INPUT]
-{tc_def.input.body}
-
-[EXPECTED]
-{tc_def.expectation.body}
-\n\n
-"""
-
-            # Use DSPy ArtifactGenerationPromptModule
-            prompt_module = ArtifactGenerationPromptModule()
-            llm_response = prompt_module.forward(
+            # Only a budgeted, diverse subset goes into the prompt; candidates
+            # and the final test run still check every case
+            self.samples = self.sample_selector.select(definitions)
+            inputs = dict(
                 input_type=self.spec_definition.input_rule.content_type,
                 output_type=self.spec_definition.output_rule.content_type,
-                input_samples=input_samples,
+                input_samples=self.samples.input_samples,
                 extra_instructions=self.spec_definition.extra_context,
             )
 
-            sanitized_response = re.sub(r"(```python.*|.*```)", "", llm_response)
-
-            artifact = TranslationArtifact.objects.filter(spec=self.spec).first()
-            if not artifact:
-                artifact = TranslationArtifact.objects.create(
-                    spec=self.spec,
-                    implementation=sanitized_response.encode("utf-8"),
-                )
+            if self.candidates == 1:
+                implementation = self.__generate(inputs)
             else:
-                artifact.implementation = sanitized_response.encode("utf-8")
-                artifact.save()
-            return artifact
+                implementation = self.__best_candidate(inputs, definitions).implementation
+
+            return save_artifact(self.spec, implementation, self.generation_key)
         except Exception as e:
             raise ArtifcatGenerationException(
                 f"Failed to generate artifact for spec {self.spec.name}: {e}"
             ) from e
+
+    def __generate(self, inputs: dict, config: Optional[dict] = None) -> str:
+        # Use DSPy ArtifactGenerationPromptModule
+        prompt_module = ArtifactGenerationPromptModule()
+        llm_response = prompt_module.forward(**inputs, config=config)
+        return re.sub(r"(```python.*|.*```)", "", llm_response)
+
+    def __best_candidate(
+        self, inputs: dict, definitions: list[SpecTestCaseDefinitionSchema]
+    ) -> ArtifactCandidate:
+        temperatures = [
+            self.max_temperature * i / (self.candidates - 1) for i in range(self.candidates)
+        ]
+        with ThreadPoolExecutor(max_workers=self.candidates) as pool:
+            self.evaluated = list(
+                pool.map(
+                    lambda args: self.__candidate(*args, inputs, definitions),
+                    enumerate(temperatures),
+                )
+            )
+
+        for index, candidate in enumerate(self.evaluated):
+            self.logger.info(
+                f"Candidate {index} (temperature {candidate.temperature:.2f}): "
+                f"{candidate.passed}/{candidate.total} passed in {candidate.runtime:.4f}s"
+                + (f", error: {candidate.error}" if candidate.error else "")
+            )
+        best = max(self.evaluated, key=lambda c: c.score)
+        if best.implementation is None:
+            raise Exception(f"No candidate could be generated: {best.error}")
+        return best
+
+    def __candidate(
+        self,
+        seed: int,
+        temperature: float,
+        inputs: dict,
+        definitions: list[SpecTestCaseDefinitionSchema],
+    ) -> ArtifactCandidate:
+        candidate = ArtifactCandidate(temperature=temperature, total=len(definitions))
+        try:
+            # The seed also keeps equal-temperature requests out of the LM cache
+            candidate.implementation = self.__generate(
+                inputs, {"temperature": temperature, "seed": seed}
+            )
+            outcomes = evaluate_implementation(
+                candidate.implementation,
+                definitions,
+                timeout=self.candidate_timeout,
+                start_method=self.start_method,
+            )
+        except Exception as e:
+            candidate.error = str(e)
+            return candidate
+
+        candidate.passed = sum(o.passed for o in outcomes)
+        candidate.runtime = sum(o.seconds for o in outcomes)
+        return candidate
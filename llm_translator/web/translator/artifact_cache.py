@@ -0,0 +1,105 @@
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+from django.conf import settings
+from ..models import TranslationArtifact
+from ..excpetions import TranslationException
+from ..metrics import artifact_compile_seconds
+
+
+@dataclass
+class CompiledArtifact:
+    key: tuple
+    translate: Callable[[bytes], bytes]
+    size: int
+
+
+class CompiledArtifactCache:
+    """
+    Process-wide LRU cache of compiled `translate` callables.
+
+    Entries are keyed by artifact uuid + `updated_at`, so a saved artifact is
+    never served stale, and are evicted by entry count and by total source size.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, CompiledArtifact]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(artifact: TranslationArtifact) -> tuple:
+        return (str(artifact.uuid), artifact.updated_at.isoformat())
+
+    def get(self, artifact: TranslationArtifact) -> Callable[[bytes], bytes]:
+        key = self.key_for(artifact)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+                return entry.translate
+
+        compiled = self.compile(artifact)
+        self.__store(compiled)
+        return compiled.translate
+
+    def compile(self, artifact: TranslationArtifact) -> CompiledArtifact:
+        source = artifact.implementation_str
+        self.logger.info(f"Compiling artifact {artifact.uuid} ({len(source)} bytes)")
+        with artifact_compile_seconds.time():
+            code = compile(source, f"<artifact {artifact.uuid}>", "exec")
+            env = {}
+            exec(code, env)
+        translate = env.get("translate")
+        if not callable(translate):
+            message = f"Invalid compiled artifact: did not find `translate` function"
+            self.logger.error(message)
+            raise TranslationException(message)
+        return CompiledArtifact(
+            key=self.key_for(artifact), translate=translate, size=len(source)
+        )
+
+    def invalidate(self, artifact_uuid) -> None:
+        artifact_uuid = str(artifact_uuid)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == artifact_uuid]:
+                self._size -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __store(self, compiled: CompiledArtifact) -> None:
+        if compiled.size > self.max_bytes:
+            self.logger.warning(
+                f"Artifact {compiled.key[0]} exceeds cache size limit, not caching"
+            )
+            return
+        with self._lock:
+            previous = self._entries.pop(compiled.key, None)
+            if previous:
+                self._size -= previous.size
+            self._entries[compiled.key] = compiled
+            self._size += compiled.size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+
+def _cache_setting(name: str, default: int) -> int:
+    return getattr(settings, "COMPILED_ARTIFACT_CACHE", {}).get(name, default)
+
+
+compiled_artifact_cache = CompiledArtifactCache(
+    max_entries=_cache_setting("MAX_ENTRIES", 256),
+    max_bytes=_cache_setting("MAX_BYTES", 32 * 1024 * 1024),
+)
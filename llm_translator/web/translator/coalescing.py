@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable
+from django.conf import settings
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller runs the
+    function, callers arriving while it is in flight wait for it and share its
+    result (or exception).
+
+    Threads and asyncio tasks are tracked separately, so sync and async callers
+    are only coalesced with callers of the same kind.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._async_flights: dict[tuple[int, str], asyncio.Task] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Returns the result and whether it was shared from another caller."""
+        if not self.enabled:
+            return fn(), False
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            self.logger.debug(f"Waiting on in-flight call {key}")
+            flight.done.wait()
+            if flight.error:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def ado(
+        self, key: str, fn: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """
+        Async counterpart of `do`. The shared call runs as its own task, so it
+        keeps going for the other callers when the one that started it is
+        cancelled (e.g. its client disconnected).
+        """
+        if not self.enabled:
+            return await fn(), False
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        task = self._async_flights.get(flight_key)
+        if task:
+            self.logger.debug(f"Waiting on in-flight call {key}")
+            return await asyncio.shield(task), True
+
+        task = self._async_flights[flight_key] = loop.create_task(fn())
+        task.add_done_callback(lambda done: self.__land(flight_key, done))
+        return await asyncio.shield(task), False
+
+    def __land(self, flight_key: tuple[int, str], task: asyncio.Task) -> None:
+        if self._async_flights.get(flight_key) is task:
+            del self._async_flights[flight_key]
+        if not task.cancelled():
+            # Retrieve the exception so it is not reported when nobody waits
+            task.exception()
+
+
+translation_flights = SingleFlight(
+    enabled=getattr(settings, "TRANSLATION_COALESCE_REQUESTS", True),
+)
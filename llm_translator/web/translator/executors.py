@@ -1,46 +1,142 @@
 import logging
+from dataclasses import replace
+from typing import Callable, Optional
+from asgiref.sync import sync_to_async
 from .models import TranslationContext, TranslatedContext
-from ..constants import TranslationArtifcatImplType, EngineOptions
+from .artifact_cache import compiled_artifact_cache
+from .process_pool import artifact_process_pool
+from .result_cache import translation_result_cache
+from .coalescing import translation_flights
+from ..constants import TranslationArtifcatImplType, EngineOptions, TranslationCacheStatus
 from ..llm.dspy_interfaces import TranslationPromptModule
 from ..models import TranslationSpec, TranslationArtifact
 from ..excpetions import TranslationException
+from ..metrics import record_lm_usage, stage_seconds
 from ..schemas import TranslationSpecDefinitionSchema
 
 class AbstractTranslatorExecutor:
-    def __init__(self, context: TranslationContext, spec: TranslationSpec):
+    def __init__(
+        self,
+        context: TranslationContext,
+        spec: TranslationSpec,
+        spec_definition: Optional[TranslationSpecDefinitionSchema] = None,
+    ):
         self.context = context
         self.spec = spec
+        self.spec_definition = spec_definition or TranslationSpecDefinitionSchema(
+            **spec.definition
+        )
 
     def run(self) -> TranslatedContext:
         raise NotImplementedError("method must be implemented")
 
+    def stage_timer(self, stage: str):
+        return stage_seconds.time(
+            stage=stage,
+            endpoint=self.context.endpoint.key,
+            engine=self.spec_definition.engine,
+        )
+
+    async def arun(self) -> TranslatedContext:
+        # Executors without a native async implementation run on a worker thread
+        return await sync_to_async(self.run, thread_sensitive=False)()
+
 class DynamicTranslatorExecutor(AbstractTranslatorExecutor):
     logger = logging.getLogger(f"llm_translator.{__name__}")
     INVALID_INPUT = "INVALID_INPUT"
 
     def run(self) -> TranslatedContext:
-        self.spec_definition = TranslationSpecDefinitionSchema(**self.spec.definition)
         self.logger.info(
             f"Using TranslationSpecification: `{self.spec.name}` version `{self.spec.version}`"
         )
-        
+
+        key = self.__request_key()
+        if self.__is_cacheable():
+            cached = translation_result_cache.get(key)
+            if cached:
+                cached.cache = TranslationCacheStatus.HIT
+                return cached
+
+        # Identical concurrent requests share a single LLM call
+        translated, shared = translation_flights.do(key, lambda: self.__predict(key))
+        if shared:
+            return replace(translated, cache=TranslationCacheStatus.COALESCED)
+        return translated
+
+    async def arun(self) -> TranslatedContext:
+        self.logger.info(
+            f"Using TranslationSpecification: `{self.spec.name}` version `{self.spec.version}` (async)"
+        )
+
+        key = self.__request_key()
+        if self.__is_cacheable():
+            cached = await translation_result_cache.aget(key)
+            if cached:
+                cached.cache = TranslationCacheStatus.HIT
+                return cached
+
+        translated, shared = await translation_flights.ado(
+            key, lambda: self.__apredict(key)
+        )
+        if shared:
+            return replace(translated, cache=TranslationCacheStatus.COALESCED)
+        return translated
+
+    def __predict(self, key: str) -> TranslatedContext:
         try:
             prompt_module = TranslationPromptModule()
-            translated = prompt_module.forward(
-                input_type=self.spec_definition.input_rule.content_type,
-                output_type=self.spec_definition.output_rule.content_type,
-                input_data=self.context.body,
-                extra_instructions=self.spec_definition.extra_context,
-            )
+            with self.stage_timer("llm_predict"):
+                translated = prompt_module.forward(**self.__prompt_inputs())
+            record_lm_usage(self.context.endpoint.key, prompt_module.last_usage)
             self.logger.info(f"Prompt result: {translated}")
         except Exception as e:
             self.logger.error(f"Error in prompt_module.forward: {e}")
             import traceback
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             raise
-        
-    
 
+        translated = self.__translated_context(translated)
+        if self.__is_cacheable():
+            translation_result_cache.set(
+                key, translated, translation_result_cache.ttl_for(self.spec_definition)
+            )
+        return translated
+
+    async def __apredict(self, key: str) -> TranslatedContext:
+        try:
+            prompt_module = TranslationPromptModule()
+            with self.stage_timer("llm_predict"):
+                translated = await prompt_module.aforward(**self.__prompt_inputs())
+            record_lm_usage(self.context.endpoint.key, prompt_module.last_usage)
+            self.logger.info(f"Prompt result: {translated}")
+        except Exception as e:
+            self.logger.error(f"Error in prompt_module.aforward: {e}", exc_info=True)
+            raise
+
+        translated = self.__translated_context(translated)
+        if self.__is_cacheable():
+            await translation_result_cache.aset(
+                key, translated, translation_result_cache.ttl_for(self.spec_definition)
+            )
+        return translated
+
+    def __request_key(self) -> str:
+        return translation_result_cache.key_for(
+            self.spec, self.context.content_type, self.context.body
+        )
+
+    def __is_cacheable(self) -> bool:
+        return translation_result_cache.is_enabled_for(self.spec_definition)
+
+    def __prompt_inputs(self) -> dict:
+        return dict(
+            input_type=self.spec_definition.input_rule.content_type,
+            output_type=self.spec_definition.output_rule.content_type,
+            input_data=self.context.body,
+            extra_instructions=self.spec_definition.extra_context,
+        )
+
+    def __translated_context(self, translated) -> TranslatedContext:
         body = ""
         provider = None
         message = None
@@ -57,18 +153,52 @@ class DynamicTranslatorExecutor(AbstractTranslatorExecutor):
             content_type=translated_content_type,
             body=body,
             provider=provider,
+            cache=(
+                TranslationCacheStatus.MISS
+                if self.__is_cacheable()
+                else TranslationCacheStatus.BYPASS
+            ),
         )
 
 class CompiledArtifactTranslatorExecutor(AbstractTranslatorExecutor):
     logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(
+        self,
+        context: TranslationContext,
+        spec: TranslationSpec,
+        spec_definition: Optional[TranslationSpecDefinitionSchema] = None,
+        artifact: Optional[TranslationArtifact] = None,
+    ):
+        super().__init__(context, spec, spec_definition)
+        self.artifact = artifact
+
     def run(self) -> TranslatedContext:
-        self.artifact = TranslationArtifact.objects.filter(spec=self.spec).first()
+        with self.stage_timer("artifact_load"):
+            translate = self.load_translate()
+        with self.stage_timer("translate"):
+            translated = translate(self.context.body)
+        return TranslatedContext(
+            content_type=self.spec_definition.output_rule.content_type,
+            body=translated,
+            provider=EngineOptions.COMPILED_ARTIFACT,
+        )
+
+    def load_translate(self) -> Callable[[bytes], bytes]:
+        """Returns the artifact's compiled `translate` callable."""
+        if not self.artifact:
+            # The implementation blob is only loaded when the compiled cache misses
+            self.artifact = (
+                TranslationArtifact.objects.filter(spec=self.spec)
+                .defer("implementation")
+                .first()
+            )
         if not self.artifact:
             message = f"No compiled artifact found for spec {self.spec.name}"
             self.logger.error(message)
             raise TranslationException(message)
         resolvers = {
-            TranslationArtifcatImplType.PYTHON: self.__run_python_artifact,
+            TranslationArtifcatImplType.PYTHON: self.__load_python_artifact,
         }
         resolver = resolvers.get(self.artifact.implementation_type)
         if not resolver:
@@ -77,23 +207,11 @@ class CompiledArtifactTranslatorExecutor(AbstractTranslatorExecutor):
             raise TranslationException(message)
         return resolver()
     
-    def __run_python_artifact(self):
-        env_locals = {}
-        self.logger.info(
-            f"Running python compiled artifact: \n{self.artifact.implementation_str}"
-        )
-        self.logger.info(f"{self.context.body}")
-        exec(self.artifact.implementation_str, {}, env_locals)
-        translate = env_locals.get("translate")
-        if not translate:
-            message = f"Invalid compiled artifact: did not find `translate` function"
-            self.logger.error(message)
-            raise TranslationException(message)
-        
-        self.logger.info(f"Input data: {type(self.context.body)})")
-        translated = translate(self.context.body)
-        return TranslatedContext(
-            content_type=self.spec.definition["output_rule"]["content_type"],
-            body=translated,
-            provider=EngineOptions.COMPILED_ARTIFACT,
-        ) 
\ No newline at end of file
+    def __load_python_artifact(self) -> Callable[[bytes], bytes]:
+        self.logger.debug(f"Running python compiled artifact {self.artifact.uuid}")
+        if artifact_process_pool:
+            # Workers load the artifact once per version and keep it warm; the
+            # source only goes to workers that have not loaded it yet
+            key = (str(self.artifact.uuid), self.artifact.updated_at.isoformat())
+            return artifact_process_pool.translator(key, self.artifact.implementation_str)
+        return compiled_artifact_cache.get(self.artifact)
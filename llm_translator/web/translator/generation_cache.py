@@ -0,0 +1,94 @@
+import json
+import hashlib
+import logging
+from typing import Iterable, Optional
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from ..models import ArtifactGenerationCacheEntry, SpecTestCase
+from ..schemas import SpecTestCaseDefinitionSchema, TranslationSpecDefinitionSchema
+from ..metrics import artifact_generation_cache_requests
+
+# Bump when the generation prompt changes, so older implementations are not reused
+GENERATION_KEY_VERSION = 1
+
+
+def current_model_id() -> str:
+    config = getattr(settings, "LLM_PROVIDER", {})
+    if config.get("BACKEND", "openai") == "stub":
+        return "stub"
+    return config.get("MODEL", "openai/local-model")
+
+
+def generation_key(
+    spec_definition: TranslationSpecDefinitionSchema,
+    test_cases: Iterable[SpecTestCase],
+    model: Optional[str] = None,
+) -> str:
+    """
+    Hash of everything an artifact is generated from: the content types,
+    extra context, test case definitions and model. Test cases are normalized
+    (defaults applied, names and unknown keys dropped, duplicates removed,
+    order ignored), so editing a case without changing it keeps the key.
+    """
+    cases = sorted(
+        {
+            json.dumps(
+                SpecTestCaseDefinitionSchema(**tc.definition).model_dump(mode="json"),
+                sort_keys=True,
+            )
+            for tc in test_cases
+        }
+    )
+    document = {
+        "version": GENERATION_KEY_VERSION,
+        "input_type": spec_definition.input_rule.content_type,
+        "output_type": spec_definition.output_rule.content_type,
+        "extra_context": spec_definition.extra_context or "",
+        "test_cases": cases,
+        "model": model or current_model_id(),
+    }
+    return hashlib.sha256(json.dumps(document, sort_keys=True).encode()).hexdigest()
+
+
+class ArtifactGenerationCache:
+    """
+    Database-backed, content-addressed store of generated implementations,
+    shared by all specs and processes. Only implementations that passed all
+    of their test cases are stored.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        entry = ArtifactGenerationCacheEntry.objects.filter(key=key).first()
+        if entry is None:
+            artifact_generation_cache_requests.inc(outcome="miss")
+            return None
+        ArtifactGenerationCacheEntry.objects.filter(pk=entry.pk).update(
+            hits=F("hits") + 1, last_hit_at=timezone.now()
+        )
+        artifact_generation_cache_requests.inc(outcome="hit")
+        self.logger.info(f"Reusing generated implementation {key} ({entry.model})")
+        return entry.implementation_str
+
+    def put(self, key: str, implementation: str, model: Optional[str] = None) -> None:
+        if not self.enabled:
+            return
+        ArtifactGenerationCacheEntry.objects.update_or_create(
+            key=key,
+            defaults={
+                "implementation": implementation.encode("utf-8"),
+                "model": model or current_model_id(),
+            },
+        )
+
+
+artifact_generation_cache = ArtifactGenerationCache(
+    enabled=getattr(settings, "ARTIFACT_GENERATION", {}).get("CACHE", {}).get("ENABLED", True)
+)
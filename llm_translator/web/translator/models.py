@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 from ..models import TranslationEndpoint, TranslationSpec
 
 @dataclass
@@ -11,4 +12,5 @@ class TranslationContext:
 class TranslatedContext:
     content_type: str
     body: bytes
-    provider: str 
\ No newline at end of file
+    provider: str
+    cache: Optional[str] = None 
\ No newline at end of file
@@ -0,0 +1,253 @@
+import os
+import time
+import atexit
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Callable, Optional, Union
+from django.conf import settings
+
+# This module is imported by the pool's worker processes, so it must not import
+# Django models or anything else that requires an initialized app registry.
+
+_worker_artifacts: "OrderedDict[tuple, Callable[[bytes], bytes]]" = OrderedDict()
+_worker_max_artifacts = 64
+
+
+class ArtifactExecutionError(Exception):
+    """Picklable error raised in a worker while loading or running an artifact."""
+
+
+class ArtifactNotLoaded(Exception):
+    """Raised by a worker asked to run an artifact it has not loaded yet."""
+
+
+def _init_worker(max_artifacts: int) -> None:
+    global _worker_max_artifacts
+    _worker_max_artifacts = max_artifacts
+
+
+def _run_artifact(key: tuple, source: Optional[str], body: bytes) -> bytes:
+    translate = _worker_artifacts.get(key)
+    if translate:
+        _worker_artifacts.move_to_end(key)
+    elif source is None:
+        raise ArtifactNotLoaded(key)
+    else:
+        env = {}
+        try:
+            exec(compile(source, f"<artifact {key[0]}>", "exec"), env)
+        except Exception as e:
+            raise ArtifactExecutionError(f"Failed to load artifact: {type(e).__name__}: {e}")
+        translate = env.get("translate")
+        if not callable(translate):
+            raise ArtifactExecutionError(
+                "Invalid compiled artifact: did not find `translate` function"
+            )
+        _worker_artifacts[key] = translate
+        while len(_worker_artifacts) > _worker_max_artifacts:
+            _worker_artifacts.popitem(last=False)
+
+    try:
+        return translate(body)
+    except Exception as e:
+        # Artifact exceptions are not guaranteed to be picklable
+        raise ArtifactExecutionError(f"{type(e).__name__}: {e}")
+
+
+def _settle(future: Future, outcome: str, value) -> None:
+    # Calls failed by a restart may still be answered by the old pool
+    try:
+        getattr(future, outcome)(value)
+    except InvalidStateError:
+        pass
+
+
+def _run_isolated(source: str, bodies: list[bytes], conn) -> None:
+    results = []
+    try:
+        env = {}
+        exec(compile(source, "<candidate>", "exec"), env)
+        translate = env.get("translate")
+        if not callable(translate):
+            raise ArtifactExecutionError("Invalid compiled artifact: did not find `translate` function")
+    except Exception as e:
+        conn.send(("error", f"Failed to load artifact: {type(e).__name__}: {e}"))
+        return
+    for body in bodies:
+        started = time.perf_counter()
+        try:
+            output = translate(body)
+            results.append((True, bytes(output), time.perf_counter() - started))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}", time.perf_counter() - started))
+    conn.send(("ok", results))
+
+
+def run_isolated(
+    source: str, bodies: list[bytes], timeout: float, start_method: str = "spawn"
+) -> list[tuple[bool, Union[bytes, str], float]]:
+    """
+    Runs an untrusted artifact's `translate` on every body in a throwaway
+    process that is killed after `timeout` seconds. Returns
+    `(ok, output or error message, seconds)` per body.
+    """
+    context = multiprocessing.get_context(start_method)
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_isolated, args=(source, bodies, sender), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            raise ArtifactExecutionError(f"Artifact execution timed out after {timeout} seconds")
+        status, payload = receiver.recv()
+    except EOFError:
+        raise ArtifactExecutionError(f"Artifact process exited with code {process.exitcode}")
+    finally:
+        receiver.close()
+        process.kill()
+        process.join()
+    if status == "error":
+        raise ArtifactExecutionError(payload)
+    return payload
+
+
+class ArtifactProcessPool:
+    """
+    Pre-forked pool of worker processes that run compiled artifacts outside the
+    request thread, so CPU-heavy translators scale across cores instead of
+    serializing on the GIL.
+
+    Each worker keeps the artifacts it has loaded, keyed by artifact version
+    (uuid + `updated_at`), and is recycled after `max_calls_per_worker` calls.
+    Calls only send the key; the source is sent again to a worker that reports
+    it has not loaded that version yet.
+
+    A call that exceeds `timeout` fails and the pool is restarted, since a
+    stuck worker cannot be reclaimed otherwise. The other calls in flight on
+    that pool fail right away instead of waiting for their own timeout.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(
+        self,
+        size: int,
+        timeout: float,
+        max_calls_per_worker: int,
+        start_method: str = "spawn",
+        max_artifacts_per_worker: int = 64,
+    ):
+        self.size = size
+        self.timeout = timeout
+        self.max_calls_per_worker = max_calls_per_worker
+        self.start_method = start_method
+        self.max_artifacts_per_worker = max_artifacts_per_worker
+        self._pool = None
+        self._pid = None
+        self._in_flight: dict[object, set[Future]] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: tuple, source: str, body: bytes, timeout: Optional[float] = None) -> bytes:
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        pool = self.__get_pool()
+        try:
+            try:
+                return self.__call(pool, (key, None, body), deadline)
+            except ArtifactNotLoaded:
+                return self.__call(pool, (key, source, body), deadline)
+        except FutureTimeoutError:
+            self.logger.error(f"Artifact {key[0]} timed out after {timeout}s, restarting pool")
+            self.restart(pool)
+            raise ArtifactExecutionError(f"Artifact execution timed out after {timeout} seconds")
+
+    def translator(self, key: tuple, source: str) -> Callable[[bytes], bytes]:
+        return partial(self.run, key, source)
+
+    def restart(self, pool=None) -> None:
+        with self._lock:
+            # Another caller may already have replaced the pool
+            if pool is not None and pool is not self._pool:
+                return
+            if self._pool is not None:
+                self._pool.terminate()
+                for future in self._in_flight.pop(self._pool, ()):
+                    _settle(
+                        future,
+                        "set_exception",
+                        ArtifactExecutionError(
+                            "Artifact process pool was restarted after another call timed out"
+                        ),
+                    )
+            self._pool = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.close()
+                self._pool.join()
+            self._pool = None
+
+    def __call(self, pool, args: tuple, deadline: float) -> bytes:
+        future = Future()
+        with self._lock:
+            if pool is not self._pool:
+                raise ArtifactExecutionError("Artifact process pool was restarted")
+            self._in_flight.setdefault(pool, set()).add(future)
+        try:
+            pool.apply_async(
+                _run_artifact,
+                args,
+                callback=partial(_settle, future, "set_result"),
+                error_callback=partial(_settle, future, "set_exception"),
+            )
+            return future.result(max(0.0, deadline - time.monotonic()))
+        finally:
+            with self._lock:
+                calls = self._in_flight.get(pool)
+                if calls is not None:
+                    calls.discard(future)
+                    if not calls:
+                        del self._in_flight[pool]
+
+    def __get_pool(self):
+        if self._pool is not None and self._pid == os.getpid():
+            return self._pool
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self.logger.info(
+                    f"Starting artifact process pool with {self.size} workers"
+                )
+                context = multiprocessing.get_context(self.start_method)
+                self._pool = context.Pool(
+                    processes=self.size,
+                    initializer=_init_worker,
+                    initargs=(self.max_artifacts_per_worker,),
+                    maxtasksperchild=self.max_calls_per_worker,
+                )
+                if self._pid != os.getpid():
+                    self._in_flight = {}
+                self._pid = os.getpid()
+            return self._pool
+
+
+def _build_process_pool() -> Optional[ArtifactProcessPool]:
+    config = getattr(settings, "COMPILED_ARTIFACT_EXECUTION", {})
+    if config.get("MODE", "inline") != "process_pool":
+        return None
+    pool = ArtifactProcessPool(
+        size=config.get("POOL_SIZE") or os.cpu_count() or 2,
+        timeout=config.get("TIMEOUT", 10),
+        max_calls_per_worker=config.get("MAX_CALLS_PER_WORKER", 1000),
+        start_method=config.get("START_METHOD", "spawn"),
+        max_artifacts_per_worker=config.get("MAX_ARTIFACTS_PER_WORKER", 64),
+    )
+    atexit.register(pool.close)
+    return pool
+
+
+artifact_process_pool = _build_process_pool()
@@ -0,0 +1,183 @@
+import io
+import csv
+import json
+import codecs
+from typing import IO, Any, Iterator, Optional
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def is_ndjson(content_type: Optional[str]) -> bool:
+    return (content_type or "").split(";")[0].strip().lower() in NDJSON_CONTENT_TYPES
+
+
+def record_to_bytes(record: Any) -> bytes:
+    """
+    Turns a decoded record into the payload handed to a translator. Strings are
+    taken verbatim, so XML/CSV/YAML documents can travel as JSON strings; any
+    other JSON value is re-serialized.
+    """
+    if isinstance(record, str):
+        return record.encode()
+    return json.dumps(record).encode()
+
+
+def parse_batch_items(body: bytes, content_type: Optional[str]) -> list[bytes]:
+    """Splits a batch payload, a JSON array or NDJSON, into one payload per item."""
+    if is_ndjson(content_type):
+        items = []
+        for number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(record_to_bytes(json.loads(line)))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid NDJSON on line {number}: {e}")
+        return items
+
+    try:
+        records = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON payload: {e}")
+    if not isinstance(records, list):
+        raise ValueError("Batch payload must be a JSON array or NDJSON")
+    return [record_to_bytes(record) for record in records]
+
+
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+
+
+def is_csv(content_type: Optional[str]) -> bool:
+    return (content_type or "").split(";")[0].strip().lower() in CSV_CONTENT_TYPES
+
+
+def iter_stream_records(
+    stream: IO[bytes], content_type: Optional[str], chunk_size: int = 64 * 1024
+) -> Iterator[bytes]:
+    """
+    Incrementally splits a record-oriented request stream into payloads:
+    NDJSON lines, CSV rows (each yielded as a one-row CSV document that keeps
+    the header) or the elements of a top-level JSON array. Only the record
+    being parsed is held in memory.
+    """
+    if is_ndjson(content_type):
+        return iter_ndjson_records(stream)
+    if is_csv(content_type):
+        return iter_csv_records(stream)
+    return iter_json_array_records(stream, chunk_size)
+
+
+def iter_ndjson_records(stream: IO[bytes]) -> Iterator[bytes]:
+    for number, line in enumerate(_iter_lines(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid NDJSON on line {number}: {e}")
+        # Non-string values are passed on as written instead of re-serialized
+        yield record.encode() if isinstance(record, str) else line.strip()
+
+
+def iter_csv_records(stream: IO[bytes]) -> Iterator[bytes]:
+    # csv.reader joins quoted fields that span lines on its own
+    rows = csv.reader(line.decode("utf-8") for line in _iter_lines(stream))
+    header = next(rows, None)
+    if header is None:
+        return
+    for row in rows:
+        if not row:
+            continue
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerow(row)
+        yield buffer.getvalue().encode()
+
+
+def iter_json_array_records(
+    stream: IO[bytes], chunk_size: int = 64 * 1024
+) -> Iterator[bytes]:
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    exhausted = False
+
+    def fill() -> bool:
+        nonlocal buffer, position, exhausted
+        if exhausted:
+            return False
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            exhausted = True
+            buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+        return True
+
+    def delimiter_after(index: int) -> Optional[str]:
+        # Scans by index: slicing the rest of the buffer per record would make
+        # splitting quadratic in the records per chunk
+        while index < len(buffer) and buffer[index] in " \t\r\n":
+            index += 1
+        return buffer[index] if index < len(buffer) else None
+
+    def next_token() -> Optional[str]:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return None
+
+    if next_token() != "[":
+        raise ValueError("Stream payload must be a JSON array, NDJSON or CSV")
+    position += 1
+
+    expect_value = True
+    records = 0
+    while True:
+        token = next_token()
+        if token is None:
+            raise ValueError("Unexpected end of JSON array")
+        if token == "]":
+            if expect_value and records:
+                raise ValueError("Unexpected ']' after ',' in JSON array")
+            return
+        if token == ",":
+            if expect_value:
+                raise ValueError("Unexpected ',' in JSON array")
+            position += 1
+            expect_value = True
+            continue
+        if not expect_value:
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {token!r}")
+
+        while True:
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+                # Only accept the value once the following delimiter is buffered,
+                # otherwise a number cut at a chunk boundary would be truncated
+                if exhausted or delimiter_after(end) in (",", "]"):
+                    break
+            except json.JSONDecodeError as e:
+                if exhausted:
+                    raise ValueError(f"Invalid JSON array element: {e}")
+            fill()
+        raw = buffer[position:end]
+        position = end
+        expect_value = False
+        records += 1
+        yield record.encode() if isinstance(record, str) else raw.encode()
+
+
+def _iter_lines(stream: IO[bytes]) -> Iterator[bytes]:
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        yield line
@@ -0,0 +1,187 @@
+import difflib
+import logging
+from dataclasses import dataclass
+from typing import Optional
+from django.conf import settings
+from ..constants import ExpectationResult
+from ..models import TranslationArtifact, TranslationSpec, SpecTestCase
+from ..schemas import TranslationSpecDefinitionSchema, SpecTestCaseDefinitionSchema
+from ..llm.dspy_interfaces import ArtifactRepairPromptModule
+from ..llm.tokens import estimate_tokens
+from .artifact import CaseOutcome, evaluate_implementation
+
+
+@dataclass
+class RepairAttempt:
+    iteration: int
+    failures_sent: int
+    passed: int
+    total: int
+    tokens: int
+    accepted: bool
+    error: Optional[str] = None
+
+
+class ArtifactRepairer:
+    """
+    Fixes a failing artifact by sending the LM its current implementation and
+    the failing cases (input, expected, actual output or error, diff) instead
+    of regenerating it from the samples. Each fix is tested in a throwaway
+    process and kept only when more cases pass; the loop stops when all
+    cases pass, after `max_iterations`, when a fix does not help, or when the
+    next prompt would exceed `token_budget`. Prompts are kept under
+    `max_prompt_tokens` by sending at most `max_failures` cases with bodies
+    cut to `max_body_chars`.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(self, spec: TranslationSpec):
+        self.spec = spec
+        generation = getattr(settings, "ARTIFACT_GENERATION", {})
+        config = generation.get("REPAIR", {})
+        self.max_iterations = config.get("MAX_ITERATIONS", 3)
+        self.token_budget = config.get("TOKEN_BUDGET", 20000)
+        self.max_prompt_tokens = config.get("MAX_PROMPT_TOKENS", 6000)
+        self.max_failures = config.get("MAX_FAILURES", 5)
+        self.max_body_chars = config.get("MAX_BODY_CHARS", 2000)
+        self.timeout = generation.get("CANDIDATE_TIMEOUT", 30)
+        self.start_method = generation.get("START_METHOD", "spawn")
+        self.attempts: list[RepairAttempt] = []
+        self.tokens_used = 0
+
+    def repair(self, artifact: TranslationArtifact) -> bool:
+        """Repairs `artifact` in place; returns whether it was changed."""
+        if self.max_iterations <= 0:
+            return False
+        spec_definition = TranslationSpecDefinitionSchema(**self.spec.definition)
+        definitions = [
+            SpecTestCaseDefinitionSchema(**tc.definition)
+            for tc in SpecTestCase.objects.filter(spec=self.spec)
+        ]
+        implementation = artifact.implementation_str
+        outcomes = self.__evaluate(implementation, definitions)
+        changed = False
+
+        for iteration in range(1, self.max_iterations + 1):
+            failing = [o for o in outcomes if not o.passed]
+            if not failing:
+                break
+            report, sent = self.__failure_report(implementation, failing)
+            prompt_tokens = estimate_tokens(implementation + report)
+            if self.tokens_used + prompt_tokens > self.token_budget:
+                self.logger.info(
+                    f"Stopping repair of {self.spec.name}: {self.tokens_used} of "
+                    f"{self.token_budget} tokens used, next prompt needs ~{prompt_tokens}"
+                )
+                break
+
+            attempt = RepairAttempt(
+                iteration=iteration,
+                failures_sent=sent,
+                passed=0,
+                total=len(definitions),
+                tokens=0,
+                accepted=False,
+            )
+            self.attempts.append(attempt)
+            prompt_module = ArtifactRepairPromptModule()
+            try:
+                fixed = prompt_module.forward(
+                    input_type=spec_definition.input_rule.content_type,
+                    output_type=spec_definition.output_rule.content_type,
+                    implementation=implementation,
+                    failures=report,
+                    extra_instructions=spec_definition.extra_context,
+                )
+            except Exception as e:
+                attempt.error = str(e)
+                self.logger.error(f"Repair call for {self.spec.name} failed: {e}")
+                break
+            # Estimated when the LM reports no usage (e.g. served from its cache)
+            attempt.tokens = sum(
+                usage.get("total_tokens", 0) for usage in prompt_module.last_usage.values()
+            ) or prompt_tokens + estimate_tokens(fixed)
+            self.tokens_used += attempt.tokens
+
+            fixed_outcomes = self.__evaluate(fixed, definitions)
+            attempt.passed = sum(o.passed for o in fixed_outcomes)
+            passed_before = sum(o.passed for o in outcomes)
+            self.logger.info(
+                f"Repair {iteration} of {self.spec.name}: {passed_before} -> "
+                f"{attempt.passed}/{attempt.total} passed, {attempt.tokens} tokens"
+            )
+            if attempt.passed <= passed_before:
+                # The same failures would be sent again, so stop here
+                attempt.error = next((o.error for o in fixed_outcomes if o.error), None)
+                break
+            attempt.accepted = True
+            implementation, outcomes, changed = fixed, fixed_outcomes, True
+
+        if changed:
+            artifact.implementation = implementation.encode("utf-8")
+            artifact.save()
+        return changed
+
+    def __evaluate(
+        self, implementation: str, definitions: list[SpecTestCaseDefinitionSchema]
+    ) -> list[CaseOutcome]:
+        try:
+            return evaluate_implementation(
+                implementation, definitions, self.timeout, self.start_method
+            )
+        except Exception as e:
+            # The artifact does not load: every case fails with the same error
+            return [
+                CaseOutcome(definition=d, passed=False, seconds=0.0, error=str(e))
+                for d in definitions
+            ]
+
+    def __failure_report(
+        self, implementation: str, failing: list[CaseOutcome]
+    ) -> tuple[str, int]:
+        sections = []
+        for outcome in failing[: self.max_failures]:
+            section = self.__failure_section(len(sections) + 1, outcome)
+            tokens = estimate_tokens(implementation + "".join(sections) + section)
+            if sections and tokens > self.max_prompt_tokens:
+                break
+            sections.append(section)
+        sent = len(sections)
+        if len(failing) > sent:
+            sections.append(f"({len(failing) - sent} more failing cases not shown)\n")
+        return "".join(sections), sent
+
+    def __failure_section(self, number: int, outcome: CaseOutcome) -> str:
+        definition = outcome.definition
+        expected = self.__truncate(definition.expectation.body)
+        if definition.expectation.result == ExpectationResult.FAILURE:
+            expected = f"The translation must fail or differ from:\n{expected}"
+        section = f"""
+[CASE {number}]
+[INPUT]
+{self.__truncate(definition.input.body)}
+
+[EXPECTED]
+{expected}
+"""
+        if outcome.error is not None:
+            return section + f"\n[ERROR]\n{self.__truncate(outcome.error)}\n"
+        diff = "\n".join(
+            difflib.unified_diff(
+                definition.expectation.body.splitlines(),
+                (outcome.actual or "").splitlines(),
+                "expected",
+                "actual",
+                lineterm="",
+            )
+        )
+        return section + (
+            f"\n[ACTUAL]\n{self.__truncate(outcome.actual or '')}\n"
+            f"\n[DIFF]\n{self.__truncate(diff)}\n"
+        )
+
+    def __truncate(self, text: str) -> str:
+        if len(text) <= self.max_body_chars:
+            return text
+        return f"{text[: self.max_body_chars]}... [{len(text) - self.max_body_chars} more characters]"
@@ -0,0 +1,173 @@
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Optional
+from django.conf import settings
+from django.core.cache import caches
+from ..models import TranslationSpec
+from ..schemas import TranslationSpecDefinitionSchema
+from .models import TranslatedContext
+
+
+@dataclass
+class _Entry:
+    translated: TranslatedContext
+    size: int
+    expires_at: float
+
+
+class TranslationResultCache:
+    """
+    Cache of dynamic-engine translation results.
+
+    Results are keyed by spec uuid, spec version, a hash of the spec definition,
+    the request content type and the sha256 of the request body. The first tier
+    is an in-process LRU bounded by entry count and bytes; when `backend` names
+    a Django cache alias (e.g. a FileBasedCache or DatabaseCache), it is used as
+    a shared second tier.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(
+        self,
+        enabled: bool,
+        ttl: int,
+        max_entries: int,
+        max_bytes: int,
+        backend: Optional[str] = None,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(
+        spec: TranslationSpec, content_type: Optional[str], body: bytes
+    ) -> str:
+        definition_hash = hashlib.sha256(
+            json.dumps(spec.definition, sort_keys=True).encode()
+        ).hexdigest()
+        body_hash = hashlib.sha256(body).hexdigest()
+        parts = [str(spec.uuid), spec.version, definition_hash, content_type or "", body_hash]
+        return "translation:" + hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    def is_enabled_for(self, spec_definition: TranslationSpecDefinitionSchema) -> bool:
+        return self.enabled and spec_definition.cache_results
+
+    def ttl_for(self, spec_definition: TranslationSpecDefinitionSchema) -> int:
+        return spec_definition.cache_ttl or self.ttl
+
+    def get(self, key: str) -> Optional[TranslatedContext]:
+        translated = self.__get_local(key)
+        if translated or not self.backend:
+            return translated
+
+        stored = caches[self.backend].get(key)
+        if stored:
+            translated, expires_at = self.__from_backend(stored)
+            self.__set_local(key, translated, expires_at)
+        return translated
+
+    async def aget(self, key: str) -> Optional[TranslatedContext]:
+        translated = self.__get_local(key)
+        if translated or not self.backend:
+            return translated
+
+        stored = await caches[self.backend].aget(key)
+        if stored:
+            translated, expires_at = self.__from_backend(stored)
+            self.__set_local(key, translated, expires_at)
+        return translated
+
+    def set(self, key: str, translated: TranslatedContext, ttl: int) -> None:
+        self.__set_local(key, translated, time.time() + ttl)
+        if self.backend:
+            caches[self.backend].set(key, self.__to_backend(translated, ttl), ttl)
+
+    async def aset(self, key: str, translated: TranslatedContext, ttl: int) -> None:
+        self.__set_local(key, translated, time.time() + ttl)
+        if self.backend:
+            await caches[self.backend].aset(
+                key, self.__to_backend(translated, ttl), ttl
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __get_local(self, key: str) -> Optional[TranslatedContext]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if entry.expires_at <= time.time():
+                self._size -= self._entries.pop(key).size
+                return None
+            self._entries.move_to_end(key)
+            return replace(entry.translated)
+
+    def __set_local(
+        self, key: str, translated: TranslatedContext, expires_at: float
+    ) -> None:
+        body = translated.body or b""
+        # Bodies may be str; the byte budget counts their encoded size
+        size = len(body.encode() if isinstance(body, str) else body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self._size -= previous.size
+            self._entries[key] = _Entry(
+                translated=replace(translated, cache=None),
+                size=size,
+                expires_at=expires_at,
+            )
+            self._size += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    @staticmethod
+    def __to_backend(translated: TranslatedContext, ttl: int) -> dict:
+        return {
+            "content_type": translated.content_type,
+            "body": translated.body,
+            "provider": translated.provider,
+            "expires_at": time.time() + ttl,
+        }
+
+    @staticmethod
+    def __from_backend(stored: dict) -> tuple[TranslatedContext, float]:
+        translated = TranslatedContext(
+            content_type=stored["content_type"],
+            body=stored["body"],
+            provider=stored["provider"],
+        )
+        return translated, stored["expires_at"]
+
+
+def _cache_setting(name: str, default):
+    return getattr(settings, "TRANSLATION_RESULT_CACHE", {}).get(name, default)
+
+
+translation_result_cache = TranslationResultCache(
+    enabled=_cache_setting("ENABLED", True),
+    ttl=_cache_setting("TTL", 3600),
+    max_entries=_cache_setting("MAX_ENTRIES", 10000),
+    max_bytes=_cache_setting("MAX_BYTES", 64 * 1024 * 1024),
+    backend=_cache_setting("BACKEND", None),
+)
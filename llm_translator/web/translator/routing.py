@@ -0,0 +1,162 @@
+import time
+import uuid
+import logging
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from ..constants import EngineOptions
+from ..models import TranslationEndpoint, TranslationSpec, TranslationArtifact
+from ..excpetions import MultipleActiveSpecs, TranslationException
+from ..schemas import TranslationSpecDefinitionSchema
+from ..payloads import PayloadCapturePolicy
+
+
+@dataclass
+class ResolvedRoute:
+    endpoint: TranslationEndpoint
+    active_specs: list[TranslationSpec]
+    artifact: Optional[TranslationArtifact] = None
+    expires_at: float = field(default=0.0, compare=False)
+
+    @property
+    def spec(self) -> TranslationSpec:
+        if len(self.active_specs) > 1:
+            raise MultipleActiveSpecs(
+                f"Multiple active TranslationSpecifications found for endpoint {self.endpoint.uuid}"
+            )
+        if not self.active_specs:
+            raise TranslationException(
+                f"No active TranslationSpecifications found for endpoint {self.endpoint.uuid}"
+            )
+        return self.active_specs[0]
+
+    @cached_property
+    def spec_definition(self) -> TranslationSpecDefinitionSchema:
+        return TranslationSpecDefinitionSchema(**self.spec.definition)
+
+    @cached_property
+    def payload_capture(self) -> PayloadCapturePolicy:
+        return PayloadCapturePolicy.for_endpoint(self.endpoint)
+
+
+class TranslationRoutingTable:
+    """
+    In-memory endpoint -> active spec -> artifact resolution for the translate
+    hot path.
+
+    Routes are looked up by endpoint uuid or key and invalidated through model
+    signals (see `web.signals`). Signals only reach the current process, so
+    entries also expire after `TRANSLATION_ROUTING_CACHE["TTL"]` seconds to bound
+    staleness across workers.
+    """
+
+    logger = logging.getLogger(f"llm_translator.{__name__}")
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._routes: dict[str, ResolvedRoute] = {}
+        self._aliases: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, endpoint_id: str) -> Optional[ResolvedRoute]:
+        route = self.__cached(endpoint_id)
+        if route:
+            return route
+
+        route = self.__load(endpoint_id)
+        if not route:
+            return None
+
+        endpoint_uuid = str(route.endpoint.uuid)
+        with self._lock:
+            self._routes[endpoint_uuid] = route
+            self._aliases[endpoint_uuid] = endpoint_uuid
+            self._aliases[route.endpoint.key] = endpoint_uuid
+        return route
+
+    async def aresolve(self, endpoint_id: str) -> Optional[ResolvedRoute]:
+        route = self.__cached(endpoint_id)
+        if route:
+            return route
+        return await sync_to_async(self.resolve)(endpoint_id)
+
+    def invalidate_endpoint(self, endpoint_uuid) -> None:
+        endpoint_uuid = str(endpoint_uuid)
+        with self._lock:
+            self._routes.pop(endpoint_uuid, None)
+            for alias in [a for a, u in self._aliases.items() if u == endpoint_uuid]:
+                del self._aliases[alias]
+
+    def invalidate_spec(self, spec_uuid) -> None:
+        spec_uuid = str(spec_uuid)
+        with self._lock:
+            endpoint_uuids = [
+                endpoint_uuid
+                for endpoint_uuid, route in self._routes.items()
+                if any(str(s.uuid) == spec_uuid for s in route.active_specs)
+            ]
+        for endpoint_uuid in endpoint_uuids:
+            self.invalidate_endpoint(endpoint_uuid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._aliases.clear()
+
+    def __cached(self, endpoint_id: str) -> Optional[ResolvedRoute]:
+        with self._lock:
+            endpoint_uuid = self._aliases.get(endpoint_id)
+            route = self._routes.get(endpoint_uuid) if endpoint_uuid else None
+        if route and route.expires_at > time.monotonic():
+            return route
+        return None
+
+    def __load(self, endpoint_id: str) -> Optional[ResolvedRoute]:
+        self.logger.debug(f"Resolving route for endpoint {endpoint_id}")
+        lookup = Q(key=endpoint_id)
+        try:
+            lookup |= Q(uuid=uuid.UUID(endpoint_id))
+        except ValueError:
+            pass
+
+        endpoints = list(TranslationEndpoint.objects.filter(lookup)[:2])
+        if not endpoints:
+            return None
+        # An exact uuid match wins over a key match, as in the original lookup
+        endpoint = next(
+            (e for e in endpoints if str(e.uuid) == endpoint_id), endpoints[0]
+        )
+
+        active_specs = list(
+            TranslationSpec.objects.filter(endpoint=endpoint, is_active=True)[:2]
+        )
+        for spec in active_specs:
+            spec.endpoint = endpoint
+
+        artifact = None
+        if (
+            len(active_specs) == 1
+            and active_specs[0].definition.get("engine")
+            == EngineOptions.COMPILED_ARTIFACT
+        ):
+            artifact = (
+                TranslationArtifact.objects.filter(spec=active_specs[0])
+                .defer("implementation")
+                .first()
+            )
+
+        return ResolvedRoute(
+            endpoint=endpoint,
+            active_specs=active_specs,
+            artifact=artifact,
+            expires_at=time.monotonic() + self.ttl,
+        )
+
+
+routing_table = TranslationRoutingTable(
+    ttl=getattr(settings, "TRANSLATION_ROUTING_CACHE", {}).get("TTL", 30),
+)
@@ -0,0 +1,161 @@
+import re
+import json
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Optional
+from ..constants import ExpectationResult
+from ..schemas import SpecTestCaseDefinitionSchema
+from ..llm.tokens import estimate_tokens
+
+logger = logging.getLogger(f"llm_translator.{__name__}")
+
+
+def body_shape(body: str) -> frozenset[str]:
+    """
+    Structural features of a body: `path:type` of every JSON value, tag and
+    attribute paths of XML, or the distinct words of anything else. Values
+    are ignored, so bodies differing only in data have the same shape.
+    """
+    try:
+        features = set()
+        _json_shape(json.loads(body), "$", features)
+        return frozenset(features)
+    except ValueError:
+        pass
+    try:
+        features = set()
+        _xml_shape(ET.fromstring(body), "", features)
+        return frozenset(features)
+    except ET.ParseError:
+        pass
+    return frozenset(re.findall(r"[A-Za-z_][A-Za-z0-9_]*", body))
+
+
+def _json_shape(value, path: str, features: set) -> None:
+    features.add(f"{path}:{type(value).__name__}")
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _json_shape(item, f"{path}.{key}", features)
+    elif isinstance(value, list):
+        for item in value:
+            _json_shape(item, f"{path}[]", features)
+
+
+def _xml_shape(element: ET.Element, path: str, features: set) -> None:
+    path = f"{path}/{element.tag}"
+    features.add(path)
+    features.update(f"{path}@{name}" for name in element.attrib)
+    for child in element:
+        _xml_shape(child, path, features)
+
+
+def truncate_body(body: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    if len(body) <= max_chars:
+        return body
+    return f"{body[:max_chars]}\n... [truncated {len(body) - max_chars} characters]"
+
+
+@dataclass
+class Sample:
+    definition: SpecTestCaseDefinitionSchema
+    features: frozenset[str]
+    text: str
+    tokens: int
+
+
+@dataclass
+class SampleSelection:
+    selected: list[Sample] = field(default_factory=list)
+    # Duplicates by shape and cases left out by the budget; they are still
+    # run when candidates are evaluated and when the artifact is tested
+    held_out: list[SpecTestCaseDefinitionSchema] = field(default_factory=list)
+
+    @property
+    def input_samples(self) -> str:
+        return "".join(sample.text for sample in self.selected)
+
+    @property
+    def tokens(self) -> int:
+        return sum(sample.tokens for sample in self.selected)
+
+
+class SampleSelector:
+    """
+    Picks the test cases shown to the LM when generating an artifact. Cases
+    with the same input and expected output shape (see `body_shape`) and the
+    same expected result are deduplicated, keeping the smallest. The rest are
+    added greedily by the number of shape features they cover that the
+    selection does not yet cover (per token), then by size, while they fit in
+    `token_budget` and `max_samples`. Bodies over `max_body_tokens` are
+    truncated. At least one case is always selected.
+    """
+
+    def __init__(self, token_budget: int, max_body_tokens: int, max_samples: Optional[int] = None):
+        self.token_budget = token_budget
+        self.max_body_tokens = max_body_tokens
+        self.max_samples = max_samples
+
+    def select(self, definitions: list[SpecTestCaseDefinitionSchema]) -> SampleSelection:
+        selection = SampleSelection()
+        unique: dict[tuple, Sample] = {}
+        for definition in definitions:
+            sample = self.__sample(definition)
+            key = (sample.features, definition.expectation.result)
+            kept = unique.get(key)
+            if kept is None or sample.tokens < kept.tokens:
+                if kept is not None:
+                    selection.held_out.append(kept.definition)
+                unique[key] = sample
+            else:
+                selection.held_out.append(definition)
+
+        remaining = list(unique.values())
+        covered: set[str] = set()
+        tokens = 0
+        while remaining and (self.max_samples is None or len(selection.selected) < self.max_samples):
+            fitting = [
+                s
+                for s in remaining
+                if tokens + s.tokens <= self.token_budget or not selection.selected
+            ]
+            if not fitting:
+                break
+            best = max(
+                fitting,
+                key=lambda s: (len(s.features - covered) / max(s.tokens, 1), -s.tokens),
+            )
+            remaining.remove(best)
+            selection.selected.append(best)
+            covered |= best.features
+            tokens += best.tokens
+        selection.held_out.extend(s.definition for s in remaining)
+
+        logger.info(
+            f"Selected {len(selection.selected)} of {len(definitions)} test cases as samples "
+            f"(~{selection.tokens} tokens, {len(unique)} distinct shapes)"
+        )
+        return selection
+
+    def __sample(self, definition: SpecTestCaseDefinitionSchema) -> Sample:
+        input_body = definition.input.body
+        expected_body = definition.expectation.body
+        features = frozenset(
+            [f"in:{f}" for f in body_shape(input_body)]
+            + [f"out:{f}" for f in body_shape(expected_body)]
+        )
+        expected = truncate_body(expected_body, self.max_body_tokens)
+        if definition.expectation.result == ExpectationResult.FAILURE:
+            expected = f"(the translation must fail or differ from)\n{expected}"
+        text = f"""
+[INPUT]
+{truncate_body(input_body, self.max_body_tokens)}
+
+[EXPECTED]
+{expected}
+\n\n
+"""
+        return Sample(
+            definition=definition, features=features, text=text, tokens=estimate_tokens(text)
+        )
@@ -1,7 +1,11 @@
+import time
 import logging
-from ..models import TranslationSpec
-from ..excpetions import MultipleActiveSpecs, TranslationException
+from typing import Optional
+from ..constants import EngineOptions
+from ..excpetions import TranslationException
+from ..metrics import observe_stage, route_labels
 from .models import TranslationContext, TranslatedContext
+from .routing import ResolvedRoute, routing_table
 from .executors import (
     DynamicTranslatorExecutor,
     CompiledArtifactTranslatorExecutor,
@@ -9,24 +13,15 @@ from .executors import (
 
 class TranslatorService:
     logger = logging.getLogger(f"llm_translator.{__name__}")
-    def __init__(self, context: TranslationContext):
+    def __init__(self, context: TranslationContext, route: Optional[ResolvedRoute] = None):
         self.context = context
+        self.route = route
     def translate(self) -> TranslatedContext:
         self.logger.info(
             f"Translating content for endpoint {self.context.endpoint.uuid}"
         )
-        specs = TranslationSpec.objects.filter(
-            endpoint=self.context.endpoint, is_active=True
-        )
-        if specs.count() > 1:
-            msg = f"Multiple active TranslationSpecifications found for endpoint {self.context.endpoint.uuid}"
-            self.logger.error(msg)
-            raise MultipleActiveSpecs(msg)
-        if not specs.exists():
-            msg = f"No active TranslationSpecifications found for endpoint {self.context.endpoint.uuid}"
-            self.logger.error(msg)
-            raise TranslationException(msg)
-        self.spec = specs.first()
+        if not self.route:
+            self.route = routing_table.resolve(str(self.context.endpoint.uuid))
         executor = self.__get_executor()
         try:
             return executor.run()
@@ -35,12 +30,39 @@ class TranslatorService:
             traceback.print_exc()
             self.logger.error(f"Error translating content: {e}")
             raise TranslationException(str(e))
+    async def atranslate(self) -> TranslatedContext:
+        self.logger.info(
+            f"Translating content asynchronously for endpoint {self.context.endpoint.uuid}"
+        )
+        if not self.route:
+            self.route = await routing_table.aresolve(str(self.context.endpoint.uuid))
+        executor = self.__get_executor()
+        try:
+            return await executor.arun()
+        except Exception as e:
+            self.logger.error(f"Error translating content: {e}", exc_info=True)
+            raise TranslationException(str(e))
     def __get_executor(self):
-        if self.spec.definition["engine"] == "dynamic":
-            return DynamicTranslatorExecutor(self.context, self.spec)
-        elif self.spec.definition["engine"] == "compiled_artifact":
-            return CompiledArtifactTranslatorExecutor(self.context, self.spec)
+        labels = route_labels(self.route)
+        started = time.perf_counter()
+        try:
+            self.spec = self.route.spec
+        except TranslationException as e:
+            self.logger.error(str(e))
+            raise
+        spec_definition = self.route.spec_definition
+        observe_stage("spec_lookup", started, **labels)
+
+        started = time.perf_counter()
+        if spec_definition.engine == EngineOptions.DYNAMIC:
+            executor = DynamicTranslatorExecutor(self.context, self.spec, spec_definition)
+        elif spec_definition.engine == EngineOptions.COMPILED_ARTIFACT:
+            executor = CompiledArtifactTranslatorExecutor(
+                self.context, self.spec, spec_definition, artifact=self.route.artifact
+            )
         else:
             raise TranslationException(
-                f"Invalid engine `{self.spec.definition['engine']}`"
-            ) 
\ No newline at end of file
+                f"Invalid engine `{spec_definition.engine}`"
+            )
+        observe_stage("executor_select", started, **labels)
+        return executor
@@ -3,14 +3,19 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     api_translate,
+    api_translate_async,
+    api_translate_batch,
+    api_translate_stream,
     api_generate_spec_artifact,
+    api_job_detail,
     get_account_by_endpoint,
     api_run_spec_test_cases,
     api_activate_spec,
     TranslationEndpointViewSet,
     TranslationSpecViewSet,
     SpecTestCaseViewSet,
-    SpecArtifactViewSet
+    SpecArtifactViewSet,
+    metrics_view,
 )
 from rest_framework.authtoken.views import obtain_auth_token
 
@@ -45,6 +50,21 @@ urlpatterns = [
         api_translate,
         name="api_translate",
     ),
+    path(
+        f"{API_BASE_URL}/translate/<str:endpoint_id>/async",
+        api_translate_async,
+        name="api_translate_async",
+    ),
+    path(
+        f"{API_BASE_URL}/translate/<str:endpoint_id>/batch",
+        api_translate_batch,
+        name="api_translate_batch",
+    ),
+    path(
+        f"{API_BASE_URL}/translate/<str:endpoint_id>/stream",
+        api_translate_stream,
+        name="api_translate_stream",
+    ),
     path(
         f"{API_BASE_URL}/accounts/by_endpoint/<str:endpoint_id>",
         get_account_by_endpoint,
@@ -68,7 +88,16 @@ urlpatterns = [
         name="api_activate_spec",
     ),
 
+    path(
+        f"{API_BASE_URL}/jobs/<str:job_id>",
+        api_job_detail,
+        name="api_job_detail",
+    ),
+
+
 
+    # Monitoring
+    path("metrics", metrics_view, name="metrics"),
 
     # UI API
     path(f"{API_BASE_URL}/token", obtain_auth_token, name="api_token"),
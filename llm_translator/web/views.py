@@ -1,6 +1,14 @@
+import json
 import traceback
 import logging
-from rest_framework.decorators import api_view
+from io import BytesIO
+from django.conf import settings
+from django.db.models import JSONField, OuterRef, Prefetch, Subquery
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework.decorators import api_view, authentication_classes
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework import viewsets
@@ -12,6 +20,9 @@ from .models import (
     SpecTestCase,
     TranslationArtifact,
     TranslationEvent,
+    AccountAPIKey,
+    SpecTestCaseExecution,
+    TranslationJob,
 )
 from .serializers import (
     TranslationEndpointListSerializer,
@@ -22,20 +33,27 @@ from .serializers import (
     SpecTestCaseDetailSerializer,
     SpecTestCaseListSerializer,
     TranslationSpecArtifactSerializer,
-    ArtifactGenerationSerializer,
+    TranslationJobSerializer,
 )
 from .manager import (
     TranslationManager,
     TranslationRequest,
-    ArtifactGeneratorManager,
-    ArtifactGenerationRequest,
-    SpecTestCaseExecutor
+    BatchTranslationRequest,
+    StreamTranslationRequest,
 )
+from .constants import JobKind
+from .jobs import enqueue_job
+from .translator.routing import routing_table
+from .translator.records import parse_batch_items, iter_stream_records
+from .traffic import parse_traffic_range, rollups_in_range
+from .auth import CustomTokenAuthentication
+from .metrics import metrics
 
 logger = logging.getLogger(f"{__name__}")
 
 
 @api_view(["POST"])
+@authentication_classes([CustomTokenAuthentication])
 def api_translate(request, endpoint_id):
     content_type = request.headers.get("Content-Type")
     body = request.body
@@ -63,9 +81,164 @@ def api_translate(request, endpoint_id):
     )
 
 
+@api_view(["POST"])
+@authentication_classes([CustomTokenAuthentication])
+def api_translate_batch(request, endpoint_id):
+    """
+    Translates a JSON array or NDJSON stream of payloads in one request. The
+    `content_type` query parameter sets the items' content type, defaulting to
+    the active spec's input content type.
+    """
+    try:
+        items = parse_batch_items(request.body, request.content_type)
+    except ValueError as e:
+        return Response({"success": False, "message": str(e)}, status=400)
+
+    if not items:
+        return Response({"success": False, "message": "Batch has no items"}, status=400)
+    max_items = getattr(settings, "TRANSLATION_BATCH", {}).get("MAX_ITEMS", 10000)
+    if len(items) > max_items:
+        return Response(
+            {
+                "success": False,
+                "message": f"Batch has {len(items)} items, the limit is {max_items}",
+            },
+            status=400,
+        )
+
+    b_request = BatchTranslationRequest(
+        endpoint_id=endpoint_id,
+        content_type=request.query_params.get("content_type"),
+        items=items,
+    )
+    b_response = TranslationManager().handle_batch(b_request)
+
+    if not b_response.results:
+        return Response(
+            {"success": False, "message": b_response.message, "results": []},
+            status=400 if not b_response.success else 200,
+        )
+
+    return Response(
+        {
+            "success": b_response.success,
+            "message": b_response.message,
+            "duration": b_response.duration,
+            "results": [
+                {
+                    "success": r.success,
+                    "message": r.message,
+                    "duration": r.duration,
+                    "content_type": r.content_type,
+                    "body": r.body,
+                }
+                for r in b_response.results
+            ],
+        },
+        status=200,
+    )
+
+
+@api_view(["POST"])
+@authentication_classes([CustomTokenAuthentication])
+def api_translate_stream(request, endpoint_id):
+    """
+    Streams record-oriented payloads (NDJSON, CSV or a JSON array) through the
+    active spec's compiled artifact. The request body is parsed incrementally
+    and results are streamed back as NDJSON, one line per input record.
+    """
+    content_type = request.content_type
+    records = iter_stream_records(request.stream or BytesIO(), content_type)
+    s_request = StreamTranslationRequest(
+        endpoint_id=endpoint_id, content_type=content_type, records=records
+    )
+    s_response = TranslationManager().handle_stream(s_request)
+    if not s_response.success:
+        return Response(
+            {"success": False, "message": s_response.message}, status=400
+        )
+
+    def lines():
+        for index, r in enumerate(s_response.results):
+            body = r.body.decode() if isinstance(r.body, bytes) else r.body
+            yield json.dumps(
+                {
+                    "index": index,
+                    "success": r.success,
+                    "message": r.message,
+                    "content_type": r.content_type,
+                    "body": body,
+                }
+            ) + "\n"
+
+    return StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+
+
+@csrf_exempt
+@require_POST
+async def api_translate_async(request, endpoint_id):
+    """
+    Async variant of `api_translate` for ASGI deployments: dynamic translations
+    await the LM instead of pinning a worker thread for the whole call.
+    """
+    try:
+        user_auth = await CustomTokenAuthentication().aauthenticate(request)
+    except AuthenticationFailed as e:
+        return JsonResponse({"detail": str(e.detail)}, status=401)
+    if not user_auth:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+
+    t_request = TranslationRequest(
+        endpoint_id=endpoint_id,
+        content_type=request.headers.get("Content-Type"),
+        body=request.body,
+    )
+    t_response = await TranslationManager().ahandle(t_request)
+
+    status = 200 if t_response.success else 400
+
+    return JsonResponse(
+        {
+            "success": t_response.success,
+            "message": t_response.message,
+            "duration": t_response.duration,
+            "content_type": t_response.content_type,
+            "body": (
+                t_response.body.decode()
+                if isinstance(t_response.body, bytes)
+                else t_response.body
+            ),
+        },
+        status=status,
+    )
+
+
+@require_GET
+def metrics_view(request):
+    """Prometheus scrape target with this process's translation metrics."""
+    if not metrics.enabled:
+        raise Http404("Metrics are disabled")
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @api_view(["GET"])
 def get_account_by_endpoint(request, endpoint_id):
-    account = TranslationEndpoint.objects.filter(uuid=endpoint_id).first()
+    account = (
+        TranslationEndpoint.objects.select_related("owner")
+        .prefetch_related(
+            Prefetch(
+                "owner__accountapikey_set",
+                queryset=AccountAPIKey.objects.filter(is_active=True),
+                to_attr="active_api_keys",
+            )
+        )
+        .filter(uuid=endpoint_id)
+        .first()
+    )
     if not account:
         return Response(
             {"error": "No active Account has been found for the given endpoint"},
@@ -77,37 +250,40 @@ def get_account_by_endpoint(request, endpoint_id):
 
 @api_view(["POST"])
 def api_generate_spec_artifact(request, spec_id):
-    try:
-        request = ArtifactGenerationRequest(spec_id=spec_id)
-        response = ArtifactGeneratorManager().handle(request)
-
-        generation_response = {
-            "success": response.success,
-            "it_generated_artifact": response.it_generated_artifact,
-            "it_passed_all_tests": response.it_passed_all_test_cases,
-            "message": response.message,
-            "stacktrace": response.stacktrace,
-            "failed_test_cases": SpecTestCaseListSerializer(
-                response.failed_test_cases, many=True
-            ).data,
-            "artifact": TranslationSpecArtifactSerializer(response.artifact).data,
-        }
-
-        logger.info(
-            f"Artifact generation response: {generation_response} for spec_id: {spec_id}"
+    """
+    Queues the generation of the spec's artifact (when missing or outdated)
+    followed by a test run, and returns the job to poll on /api/jobs/<job_id>.
+    `candidates` (body or query parameter) sets how many implementations are
+    generated and tested to pick the best one.
+    """
+    if not isinstance(request.data, dict):
+        return Response(
+            {"success": False, "message": "Request body must be a JSON object"}, status=400
         )
-
-        serialized_response = ArtifactGenerationSerializer(
-            generation_response
-        ).data
-
-        if not response.success:
-            return Response(serialized_response, status=400)
-        else:
+    candidates = request.data.get("candidates", request.query_params.get("candidates"))
+    max_candidates = getattr(settings, "ARTIFACT_GENERATION", {}).get("MAX_CANDIDATES", 8)
+    if candidates is not None:
+        try:
+            candidates = int(candidates)
+        except (TypeError, ValueError):
+            candidates = 0
+        if not 1 <= candidates <= max_candidates:
             return Response(
-                serialized_response,
-                status=201,
+                {
+                    "success": False,
+                    "message": f"candidates must be between 1 and {max_candidates}",
+                },
+                status=400,
             )
+
+    try:
+        spec = TranslationSpec.objects.filter(uuid=spec_id).first()
+        if not spec:
+            return Response({"success": False, "error": "Spec not found"}, status=404)
+        job, created = enqueue_job(
+            JobKind.GENERATE_ARTIFACT, spec, {"candidates": candidates}
+        )
+        return _job_response(job, created)
     except Exception as e:
         logger.error(traceback.format_exc())
         return Response({"success": False, "error": str(e)}, status=500)
@@ -115,17 +291,39 @@ def api_generate_spec_artifact(request, spec_id):
 
 @api_view(["POST"])
 def api_run_spec_test_cases(request, spec_id):
+    """Queues a run of the spec's test cases and returns the job to poll."""
     try:
         spec = TranslationSpec.objects.filter(uuid=spec_id).first()
-        response = SpecTestCaseExecutor(spec).run_all()
-        return Response({
-            "success": response.success,
-        }, status=200)
+        if not spec:
+            return Response({"success": False, "error": "Spec not found"}, status=404)
+        job, created = enqueue_job(JobKind.RUN_TEST_CASES, spec)
+        return _job_response(job, created)
+    except Exception as e:
+        logger.error(traceback.format_exc())
+        return Response({"success": False, "error": str(e)}, status=500)
+
+
+@api_view(["GET"])
+def api_job_detail(request, job_id):
+    """Status, progress and, once finished, result of a queued job."""
+    try:
+        job = TranslationJob.objects.filter(uuid=job_id).first()
+        if not job:
+            return Response({"success": False, "error": "Job not found"}, status=404)
+        return Response(TranslationJobSerializer(job).data, status=200)
     except Exception as e:
         logger.error(traceback.format_exc())
         return Response({"success": False, "error": str(e)}, status=500)
 
 
+def _job_response(job: TranslationJob, created: bool) -> Response:
+    # A job already queued or running for the spec is returned instead of a new one
+    return Response(
+        {"success": True, "created": created, "job": TranslationJobSerializer(job).data},
+        status=202,
+    )
+
+
 @api_view(["POST"])
 def api_activate_spec(request, spec_id):
     try:
@@ -134,6 +332,8 @@ def api_activate_spec(request, spec_id):
             return Response({"success": False, "error": "Spec not found"}, status=404)
         # Deactivate all other specs for the same endpoint
         TranslationSpec.objects.filter(endpoint=spec.endpoint).update(is_active=False)
+        # Bulk update() bypasses signals, so drop the cached route explicitly
+        routing_table.invalidate_endpoint(spec.endpoint_id)
         # Activate the selected spec
         spec.is_active = True
         spec.save()
@@ -162,7 +362,23 @@ class TranslationEndpointViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         account = self.__get_account_for_user(self.request)
-        return TranslationEndpoint.objects.filter(owner=account)
+        try:
+            since, until = parse_traffic_range(self.request.query_params)
+        except ValueError as e:
+            raise ValidationError({str(e): "Must be an ISO 8601 datetime"})
+        return (
+            TranslationEndpoint.objects.filter(owner=account)
+            .order_by("created_at")
+            .prefetch_related(
+                Prefetch(
+                    "translationtrafficrollup_set",
+                    queryset=rollups_in_range(since, until).only(
+                        "endpoint", "status", "minute", "count"
+                    ),
+                    to_attr="traffic_rollups",
+                )
+            )
+        )
 
     def create(self, request, *args, **kwargs):
         TranslationEndpointDetailSerializer(data=request.data).is_valid(
@@ -175,7 +391,12 @@ class TranslationEndpointViewSet(viewsets.ModelViewSet):
         return Response(created, status=201)
 
     def __get_account_for_user(self, request):
-        account = Account.objects.filter(user=request.user, is_active=True).first()
+        # Looked up once per request, get_queryset and create both need it
+        if not hasattr(request, "account"):
+            request.account = Account.objects.filter(
+                user=request.user, is_active=True
+            ).first()
+        account = request.account
         if not account:
             return Response(
                 {"error": "No active Account has been found for your user"}, status=400
@@ -191,7 +412,9 @@ class TranslationSpecViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         endpoint_id = self.kwargs["endpoint_id"]
-        return TranslationSpec.objects.filter(endpoint_id=endpoint_id)
+        return TranslationSpec.objects.filter(endpoint_id=endpoint_id).order_by(
+            "created_at"
+        )
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -218,7 +441,19 @@ class SpecTestCaseViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         spec_id = self.kwargs["spec_id"]
-        return SpecTestCase.objects.filter(spec_id=spec_id)
+        queryset = SpecTestCase.objects.filter(spec_id=spec_id).order_by("created_at")
+        if self.action == "list":
+            return queryset
+        last_execution = SpecTestCaseExecution.objects.filter(
+            test_case=OuterRef("pk")
+        ).order_by("-created_at")
+        return queryset.annotate(
+            last_execution_executed_at=Subquery(last_execution.values("executed_at")[:1]),
+            last_execution_status=Subquery(last_execution.values("status")[:1]),
+            last_execution_result=Subquery(
+                last_execution.values("result")[:1], output_field=JSONField()
+            ),
+        )
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -241,7 +476,9 @@ class SpecArtifactViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         spec_id = self.kwargs["spec_id"]
-        return TranslationArtifact.objects.filter(spec_id=spec_id)
+        return TranslationArtifact.objects.filter(spec_id=spec_id).order_by(
+            "created_at"
+        )
 
     def get_serializer_class(self):
         return TranslationSpecArtifactSerializer